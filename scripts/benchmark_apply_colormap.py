@@ -0,0 +1,54 @@
+"""Benchmark apply_colormap against Matplotlib's Colormap.__call__ path."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from time import perf_counter
+
+import matplotlib.colors as mpc
+import numpy as np
+
+from drcutils.brand.colormaps import apply_colormap, drc_diverging
+
+
+def _best_of(repeats: int, func) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = perf_counter()
+        func()
+        timings.append(perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    """Time both colormap paths on a random field and print JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=8192, help="Edge length of the square field.")
+    parser.add_argument("--dtype", default="float32", help="Field dtype.")
+    parser.add_argument("--repeats", type=int, default=3, help="Timing repeats; best is kept.")
+    parser.add_argument("--jobs", type=int, default=None, help="Threads for apply_colormap.")
+    args = parser.parse_args()
+
+    field = np.random.default_rng(0).normal(size=(args.size, args.size)).astype(args.dtype)
+    out = np.empty(field.shape + (4,), dtype=np.uint8)
+    norm = mpc.Normalize(-3.0, 3.0)
+
+    results = {
+        "shape": list(field.shape),
+        "dtype": args.dtype,
+        "matplotlib_float_seconds": _best_of(args.repeats, lambda: drc_diverging(norm(field))),
+        "matplotlib_bytes_seconds": _best_of(
+            args.repeats, lambda: drc_diverging(norm(field), bytes=True)
+        ),
+        "apply_colormap_seconds": _best_of(
+            args.repeats,
+            lambda: apply_colormap(field, drc_diverging, -3.0, 3.0, out=out, jobs=args.jobs),
+        ),
+    }
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,39 @@
+"""Build the packaged brand colormap lookup table from its segment definitions."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from drcutils.brand.colormaps import _build_table
+
+TABLE_NPY = Path(__file__).resolve().parents[1] / "src" / "drcutils" / "data" / "colormaps.npy"
+
+
+def main() -> int:
+    """Write the colormap table, or verify it is up to date with ``--check``."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit with status 1 if the packaged table is stale instead of writing it.",
+    )
+    args = parser.parse_args()
+
+    table = _build_table()
+    if args.check:
+        current = np.load(TABLE_NPY) if TABLE_NPY.is_file() else None
+        if current is None or not np.array_equal(current, table):
+            print(f"{TABLE_NPY} is stale; run scripts/build_colormap_tables.py")
+            return 1
+        print(f"{TABLE_NPY} is up to date")
+        return 0
+    np.save(TABLE_NPY, table)
+    print(f"Wrote {TABLE_NPY} ({TABLE_NPY.stat().st_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
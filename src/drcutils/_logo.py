@@ -0,0 +1,66 @@
+"""Logo placement helpers shared by the watermarking and animation code."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from PIL import Image as _Image
+
+_RESAMPLING = getattr(_Image, "Resampling", _Image)
+
+
+def parse_watermark_box(
+    box: Sequence[float | None] | None,
+) -> tuple[float, float, float | None, float | None]:
+    """Validate a ``[x, y, width_ratio, height_ratio]`` logo box, filling defaults."""
+    raw = [0.0, 0.0, 0.10, None] if box is None else list(box)
+    if len(raw) != 4:
+        raise ValueError("box must be a 4-item sequence: [x, y, width_ratio, height_ratio].")
+
+    x_raw, y_raw, width_raw, height_raw = raw
+    if x_raw is None or y_raw is None:
+        raise ValueError("box x and y positions must be numeric values in [0, 1].")
+
+    x = float(x_raw)
+    y = float(y_raw)
+    if not (0.0 <= x <= 1.0) or not (0.0 <= y <= 1.0):
+        raise ValueError("box x and y must be in [0, 1].")
+
+    width_ratio: float | None = None
+    height_ratio: float | None = None
+    if width_raw is not None:
+        width_ratio = float(width_raw)
+        if not (0.0 < width_ratio <= 1.0):
+            raise ValueError("box width_ratio must be in (0, 1].")
+    if height_raw is not None:
+        height_ratio = float(height_raw)
+        if not (0.0 < height_ratio <= 1.0):
+            raise ValueError("box height_ratio must be in (0, 1].")
+
+    return x, y, width_ratio, height_ratio
+
+
+def resize_logo(
+    source_size: tuple[int, int],
+    logo_image: _Image.Image,
+    width_ratio: float | None,
+    height_ratio: float | None,
+) -> _Image.Image:
+    """Scale a logo relative to the image it is placed on, keeping its aspect if one ratio is None."""
+    source_width, source_height = source_size
+    logo_width, logo_height = logo_image.size
+
+    if width_ratio is None:
+        if height_ratio is None:
+            return logo_image.copy()
+        target_height = max(1, int(round(source_height * height_ratio)))
+        target_width = max(1, int(round(logo_width * target_height / logo_height)))
+        return logo_image.resize((target_width, target_height), _RESAMPLING.LANCZOS)
+    if height_ratio is None:
+        target_width = max(1, int(round(source_width * width_ratio)))
+        target_height = max(1, int(round(logo_height * target_width / logo_width)))
+        return logo_image.resize((target_width, target_height), _RESAMPLING.LANCZOS)
+
+    target_width = max(1, int(round(source_width * width_ratio)))
+    target_height = max(1, int(round(source_height * height_ratio)))
+    return logo_image.resize((target_width, target_height), _RESAMPLING.LANCZOS)
@@ -0,0 +1,91 @@
+"""Byte colormap lookup tables shared by the brand and visualization helpers."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import matplotlib.colors as _mpc
+import numpy as _np
+
+from .runtime.executor import map_tasks as _map_tasks
+
+
+def byte_lut(cmap: _mpc.Colormap) -> _np.ndarray:
+    """Return the ``(N + 3, 4)`` uint8 table: N colors, over, bad, then under.
+
+    Under sits last so that index ``-1`` selects it.
+    """
+    rows = [
+        cmap(_np.arange(cmap.N + 1), bytes=True),
+        cmap(_np.array([_np.nan]), bytes=True),
+        cmap(_np.array([-1]), bytes=True),
+    ]
+    return _np.ascontiguousarray(_np.concatenate(rows), dtype=_np.uint8)
+
+
+def _colormap_chunk(
+    values: _np.ndarray,
+    bad: _np.ndarray | None,
+    out: _np.ndarray,
+    lut: _np.ndarray,
+    vmin: float,
+    vmax: float,
+) -> None:
+    """Quantize one flat chunk into LUT rows, following ``Colormap.__call__`` rounding."""
+    n_colors = len(lut) - 3
+    work: _np.ndarray[Any, _np.dtype[_np.floating[Any]]] = values.astype(
+        _np.float32 if values.dtype == _np.float32 else _np.float64
+    )
+    if vmax > vmin:
+        work -= vmin
+        work /= vmax - vmin
+    else:
+        # Matplotlib maps every value, NaN included, to the first color here.
+        work.fill(0.0)
+    work *= n_colors
+    # A value exactly at vmax belongs to the last color, not the over color.
+    work[work == n_colors] = n_colors - 1
+    # Under floors to -1 and over to N; both select their own LUT rows.
+    _np.clip(work, -1, n_colors, out=work)
+    _np.floor(work, out=work)
+    nan = _np.isnan(work)
+    if bad is not None:
+        nan |= bad
+    work[nan] = n_colors + 1
+    index = work.astype(_np.intp)
+    if out.shape[1] == 4 and out.flags.c_contiguous:
+        # Gather whole RGBA pixels as single 32-bit words.
+        packed = _np.ascontiguousarray(lut).view(_np.uint32).ravel()
+        _np.take(packed, index, out=out.view(_np.uint32).ravel())
+    else:
+        _np.take(lut[:, : out.shape[1]], index, axis=0, out=out)
+
+
+def map_through_lut(
+    values: _np.ndarray,
+    bad: _np.ndarray | None,
+    lut: _np.ndarray,
+    vmin: float,
+    vmax: float,
+    out: _np.ndarray,
+    *,
+    jobs: int | None = None,
+    chunk_size: int = 1 << 16,
+) -> None:
+    """Fill ``out`` with ``lut`` rows for ``values`` in chunks across threads.
+
+    ``lut`` follows the :func:`byte_lut` row layout but may hold any number of
+    channels per row, e.g. a single column of palette indices.
+    """
+    flat_values = values.reshape(-1)
+    flat_bad = None if bad is None else bad.reshape(-1)
+    flat_out = out.reshape(-1, out.shape[-1])
+    starts = range(0, flat_values.size, chunk_size)
+
+    def run(start: int) -> None:
+        stop = start + chunk_size
+        chunk_bad = None if flat_bad is None else flat_bad[start:stop]
+        _colormap_chunk(flat_values[start:stop], chunk_bad, flat_out[start:stop], lut, vmin, vmax)
+
+    for _ in _map_tasks(run, starts, jobs=jobs):
+        pass
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
+from functools import cache as _cache
 from importlib import import_module as _import_module
 from importlib.resources import files as _resource_files
 from os import PathLike
@@ -12,6 +13,11 @@ import matplotlib.colors as _mpc
 import numpy as _np
 from PIL import Image as _Image
 
+from .._logo import parse_watermark_box as _parse_watermark_box
+from .._logo import resize_logo as _resize_logo
+from ..runtime.trace import span as _span
+from ..runtime.trace import traced as _traced
+
 LogoLayout = Literal["horizontal", "stacked", "symbol"]
 PatternVariant = Literal["full", "grey", "white"]
 ScribbleWeight = Literal["thin", "thick"]
@@ -45,6 +51,24 @@ _DATA_DIR = _resource_files("drcutils") / "data"
 _BRAND_ASSETS_DIR = _DATA_DIR / "brand_assets"
 _RESAMPLING = getattr(_Image, "Resampling", _Image)
 
+_DITHER_METHODS = ("none", "ordered", "floyd_steinberg")
+_CUBE_BITS = 6
+# Linear sRGB to OKLab (Ottosson, 2020).
+_OKLAB_LMS = _np.array(
+    [
+        [0.4122214708, 0.5363325363, 0.0514459929],
+        [0.2119034982, 0.6806995451, 0.1073969566],
+        [0.0883024619, 0.2817188376, 0.6299787005],
+    ]
+)
+_OKLAB_LAB = _np.array(
+    [
+        [0.2104542553, 0.7936177850, -0.0040720468],
+        [1.9779984951, -2.4285922050, 0.4505937099],
+        [0.0259040371, 0.7827717662, -0.8086757660],
+    ]
+)
+
 _LOGO_VARIANTS = {
     "horizontal": {
         "full": "full.png",
@@ -222,61 +246,6 @@ def _parse_flag_size(size: Sequence[object] | None) -> tuple[list[int], int]:
     return parsed_widths, height
 
 
-def _parse_watermark_box(
-    box: Sequence[float | None] | None,
-) -> tuple[float, float, float | None, float | None]:
-    raw = [0.0, 0.0, 0.10, None] if box is None else list(box)
-    if len(raw) != 4:
-        raise ValueError("box must be a 4-item sequence: [x, y, width_ratio, height_ratio].")
-
-    x_raw, y_raw, width_raw, height_raw = raw
-    if x_raw is None or y_raw is None:
-        raise ValueError("box x and y positions must be numeric values in [0, 1].")
-
-    x = float(x_raw)
-    y = float(y_raw)
-    if not (0.0 <= x <= 1.0) or not (0.0 <= y <= 1.0):
-        raise ValueError("box x and y must be in [0, 1].")
-
-    width_ratio: float | None = None
-    height_ratio: float | None = None
-    if width_raw is not None:
-        width_ratio = float(width_raw)
-        if not (0.0 < width_ratio <= 1.0):
-            raise ValueError("box width_ratio must be in (0, 1].")
-    if height_raw is not None:
-        height_ratio = float(height_raw)
-        if not (0.0 < height_ratio <= 1.0):
-            raise ValueError("box height_ratio must be in (0, 1].")
-
-    return x, y, width_ratio, height_ratio
-
-
-def _resize_logo(
-    source_size: tuple[int, int],
-    logo_image: _Image.Image,
-    width_ratio: float | None,
-    height_ratio: float | None,
-) -> _Image.Image:
-    source_width, source_height = source_size
-    logo_width, logo_height = logo_image.size
-
-    if width_ratio is None and height_ratio is None:
-        return logo_image.copy()
-    if width_ratio is None and height_ratio is not None:
-        target_height = max(1, int(round(source_height * height_ratio)))
-        target_width = max(1, int(round(logo_width * target_height / logo_height)))
-        return logo_image.resize((target_width, target_height), _RESAMPLING.LANCZOS)
-    if width_ratio is not None and height_ratio is None:
-        target_width = max(1, int(round(source_width * width_ratio)))
-        target_height = max(1, int(round(logo_height * target_width / logo_width)))
-        return logo_image.resize((target_width, target_height), _RESAMPLING.LANCZOS)
-
-    target_width = max(1, int(round(source_width * float(width_ratio))))
-    target_height = max(1, int(round(source_height * float(height_ratio))))
-    return logo_image.resize((target_width, target_height), _RESAMPLING.LANCZOS)
-
-
 def _is_dark_region(
     source_rgba: _Image.Image,
     x_position: int,
@@ -303,6 +272,7 @@ def _is_dark_region(
     return float(luminance.mean()) < 110.0
 
 
+@_traced("flag")
 def flag(
     output_filepath: str | bytes | PathLike | None = None,
     size: Sequence[object] | None = None,
@@ -311,20 +281,23 @@ def flag(
     color_widths, height = _parse_flag_size(size)
     rgb_colors = [_np.array(_mpc.to_rgb(c)) for c in COLORS]
 
-    color_row: list[_np.ndarray] = []
-    for idx, color_width in enumerate(color_widths):
-        color_row.extend([rgb_colors[idx]] * color_width)
+    with _span("flag.render"):
+        color_row: list[_np.ndarray] = []
+        for idx, color_width in enumerate(color_widths):
+            color_row.extend([rgb_colors[idx]] * color_width)
 
-    pixel_data = _np.uint8(_np.array([color_row] * height) * 255)
-    flag_image = _Image.fromarray(pixel_data, mode="RGB")
+        pixel_data = _np.uint8(_np.array([color_row] * height) * 255)
+        flag_image = _Image.fromarray(pixel_data, mode="RGB")
 
     if output_filepath is None:
         return flag_image
 
-    flag_image.save(output_filepath)
+    with _span("flag.encode"):
+        flag_image.save(output_filepath)
     return None
 
 
+@_traced("watermark")
 def watermark(
     filepath: str | bytes | PathLike,
     output_filepath: str | bytes | PathLike | None = None,
@@ -337,57 +310,261 @@ def watermark(
 ) -> None:
     """Watermark an image using packaged DRC assets or a custom watermark file."""
     x, y, width_ratio, height_ratio = _parse_watermark_box(box)
-    source_image = _Image.open(filepath)
-    source_rgba = source_image.convert("RGBA")
+    with _span("watermark.decode"):
+        source_image = _Image.open(filepath)
+        source_rgba = source_image.convert("RGBA")
 
     x_position = int(round(source_rgba.size[0] * x))
     y_position = int(round(source_rgba.size[1] * y))
 
-    if watermark_filepath is not None:
-        logo_image = _Image.open(watermark_filepath).convert("RGBA")
-    else:
-        variant_key = _normalize_color_key(logo_variant)
-        if variant_key == "auto":
-            variant_key = "full"
-
-        if on_black == "auto":
-            probe_logo = _Image.open(
-                get_logo_path(logo_layout, variant_key, on_black=False)
-            ).convert("RGBA")
-            probe_resized = _resize_logo(source_rgba.size, probe_logo, width_ratio, height_ratio)
-            use_on_black = _is_dark_region(
-                source_rgba,
-                x_position,
-                y_position,
-                probe_resized.size[0],
-                probe_resized.size[1],
-            )
-        elif isinstance(on_black, bool):
-            use_on_black = on_black
+    with _span("watermark.logo"):
+        if watermark_filepath is not None:
+            logo_image = _Image.open(watermark_filepath).convert("RGBA")
         else:
-            raise ValueError("on_black must be True, False, or 'auto'.")
-
-        logo_path = get_logo_path(logo_layout, variant_key, on_black=use_on_black)
-        logo_image = _Image.open(logo_path).convert("RGBA")
+            variant_key = _normalize_color_key(logo_variant)
+            if variant_key == "auto":
+                variant_key = "full"
+
+            if on_black == "auto":
+                probe_logo = _Image.open(
+                    get_logo_path(logo_layout, variant_key, on_black=False)
+                ).convert("RGBA")
+                probe_resized = _resize_logo(
+                    source_rgba.size, probe_logo, width_ratio, height_ratio
+                )
+                use_on_black = _is_dark_region(
+                    source_rgba,
+                    x_position,
+                    y_position,
+                    probe_resized.size[0],
+                    probe_resized.size[1],
+                )
+            elif isinstance(on_black, bool):
+                use_on_black = on_black
+            else:
+                raise ValueError("on_black must be True, False, or 'auto'.")
+
+            logo_path = get_logo_path(logo_layout, variant_key, on_black=use_on_black)
+            logo_image = _Image.open(logo_path).convert("RGBA")
+
+    with _span("watermark.resize"):
+        resized_logo = _resize_logo(source_rgba.size, logo_image, width_ratio, height_ratio)
+
+    with _span("watermark.composite"):
+        overlay = _Image.new("RGBA", source_rgba.size, (0, 0, 0, 0))
+        overlay.paste(resized_logo, (x_position, y_position), resized_logo)
+        composited = _Image.alpha_composite(source_rgba, overlay)
+
+        if source_image.mode == "RGBA":
+            output_image = composited
+        else:
+            output_image = composited.convert(source_image.mode)
 
-    resized_logo = _resize_logo(source_rgba.size, logo_image, width_ratio, height_ratio)
+    target_path = filepath if output_filepath is None else output_filepath
+    with _span("watermark.encode"):
+        output_image.save(target_path)
+
+
+def _srgb_to_linear(rgb: _np.ndarray) -> _np.ndarray:
+    """Undo the sRGB transfer curve for values in ``[0, 1]``."""
+    return _np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def _srgb_to_oklab(rgb: _np.ndarray) -> _np.ndarray:
+    """Convert ``(..., 3)`` sRGB values in ``[0, 1]`` to OKLab."""
+    lms = _np.cbrt(_srgb_to_linear(rgb) @ _OKLAB_LMS.T)
+    return lms @ _OKLAB_LAB.T
+
+
+def _palette_rgb(palette: Sequence[object] | Mapping[str, object]) -> _np.ndarray:
+    colors = list(palette.values()) if isinstance(palette, Mapping) else list(palette)
+    if not 1 <= len(colors) <= 256:
+        raise ValueError(f"palette must contain 1 to 256 colors; received {len(colors)}.")
+    try:
+        rgb = [_mpc.to_rgb(color) for color in colors]  # type: ignore[arg-type]
+    except ValueError as exc:
+        raise ValueError(f"Invalid palette color: {exc}") from exc
+    return _np.rint(_np.array(rgb) * 255.0).astype(_np.uint8)
+
+
+@_cache
+def _palette_cube(palette: bytes) -> _np.ndarray:
+    """Map every cell of a quantized RGB cube to its nearest palette index in OKLab."""
+    palette_lab = _srgb_to_oklab(_np.frombuffer(palette, dtype=_np.uint8).reshape(-1, 3) / 255.0)
+    step = 256 >> _CUBE_BITS
+    centers = (_np.arange(1 << _CUBE_BITS) * step + (step - 1) / 2.0) / 255.0
+    grid = _np.stack(_np.meshgrid(centers, centers, centers, indexing="ij"), axis=-1)
+    cells_lab = _srgb_to_oklab(grid.reshape(-1, 3))
+    nearest = _np.empty(len(cells_lab), dtype=_np.uint8)
+    best = _np.full(len(cells_lab), _np.inf)
+    for index, color in enumerate(palette_lab):
+        distance = ((cells_lab - color) ** 2).sum(axis=1)
+        closer = distance < best
+        best[closer] = distance[closer]
+        nearest[closer] = index
+    nearest.flags.writeable = False
+    return nearest
+
+
+def _cube_lookup(cube: _np.ndarray, rgb: _np.ndarray) -> _np.ndarray:
+    """Return palette indices for ``(..., 3)`` uint8 RGB values."""
+    shift = 8 - _CUBE_BITS
+    r, g, b = (rgb[..., channel].astype(_np.intp) >> shift for channel in range(3))
+    return cube[(r << (2 * _CUBE_BITS)) | (g << _CUBE_BITS) | b]
+
+
+def _bayer_matrix(size: int) -> _np.ndarray:
+    """Return a ``size`` x ``size`` Bayer threshold matrix with values in ``(-0.5, 0.5)``."""
+    matrix = _np.zeros((1, 1))
+    while len(matrix) < size:
+        matrix = _np.block([[4 * matrix, 4 * matrix + 2], [4 * matrix + 3, 4 * matrix + 1]])
+    return (matrix + 0.5) / matrix.size - 0.5
+
+
+_BAYER_8 = _bayer_matrix(8)
+
+
+def _dither_ordered(pixels: _np.ndarray, palette: _np.ndarray, cube: _np.ndarray) -> _np.ndarray:
+    if len(palette) > 1:
+        # Spread thresholds over the typical gap between neighbouring palette colors.
+        gaps = _np.linalg.norm(palette[:, None, :].astype(float) - palette[None, :, :], axis=-1)
+        _np.fill_diagonal(gaps, _np.inf)
+        spread = float(_np.median(gaps.min(axis=1))) / _np.sqrt(3.0)
+    else:
+        spread = 0.0
+    height, width = pixels.shape[:2]
+    size = len(_BAYER_8)
+    threshold = _np.tile(_BAYER_8, (-(-height // size), -(-width // size)))[:height, :width]
+    shifted = pixels + (threshold * spread)[..., None].astype(_np.float32)
+    return _cube_lookup(cube, _np.clip(_np.rint(shifted), 0, 255).astype(_np.uint8))
+
+
+def _dither_floyd_steinberg(
+    pixels: _np.ndarray, palette: _np.ndarray, cube: _np.ndarray
+) -> _np.ndarray:
+    """Diffuse quantization error along a wavefront of rows.
+
+    Pixel ``(y, x)`` only depends on pixels processed at ``x + 2 * y`` minus one
+    to three, so every row advances together two pixels behind the row above it.
+    Each step is vectorized across rows and the result matches sequential
+    raster-order Floyd-Steinberg exactly.
+    """
+    height, width = pixels.shape[:2]
+    work = pixels.astype(_np.float32)
+    colors = palette.astype(_np.float32)
+    indices = _np.empty((height, width), dtype=_np.uint8)
+    rows = _np.arange(height)
+    for step in range(width + 2 * (height - 1)):
+        ys = rows[max(0, (step - width + 2) // 2) : min(height - 1, step // 2) + 1]
+        xs = step - 2 * ys
+        old = _np.clip(work[ys, xs], 0.0, 255.0)
+        chosen = _cube_lookup(cube, _np.rint(old).astype(_np.uint8))
+        indices[ys, xs] = chosen
+        error = old - colors[chosen]
+        # Spread to the row below first so sums match raster order bit for bit.
+        below = ys + 1 < height
+        by, bx, berr = ys[below] + 1, xs[below], error[below]
+        left = bx > 0
+        work[by[left], bx[left] - 1] += berr[left] * (3 / 16)
+        work[by, bx] += berr * (5 / 16)
+        right = bx + 1 < width
+        work[by[right], bx[right] + 1] += berr[right] * (1 / 16)
+        ahead = xs + 1 < width
+        work[ys[ahead], xs[ahead] + 1] += error[ahead] * (7 / 16)
+    return indices
+
+
+def _load_rgb_pixels(
+    image: _Image.Image | _np.ndarray | str | bytes | PathLike,
+) -> tuple[_np.ndarray, _np.ndarray | None]:
+    """Return ``(H, W, 3)`` uint8 pixels and a mask of fully transparent pixels."""
+    if isinstance(image, _np.ndarray):
+        array = image
+        if array.dtype.kind == "f":
+            array = _np.rint(_np.clip(array, 0.0, 1.0) * 255.0)
+        array = array.astype(_np.uint8, copy=False)
+        if array.ndim == 2:
+            array = _np.repeat(array[..., None], 3, axis=-1)
+        if array.ndim != 3 or array.shape[-1] not in (3, 4):
+            raise ValueError("image arrays must have shape (H, W), (H, W, 3), or (H, W, 4).")
+        transparent = array[..., 3] == 0 if array.shape[-1] == 4 else None
+        return _np.ascontiguousarray(array[..., :3]), transparent
+
+    source = image if isinstance(image, _Image.Image) else _Image.open(image)
+    if "A" in source.getbands() or "transparency" in source.info:
+        rgba = _np.asarray(source.convert("RGBA"))
+        return _np.ascontiguousarray(rgba[..., :3]), rgba[..., 3] == 0
+    return _np.asarray(source.convert("RGB")), None
+
+
+def quantize_to_palette(
+    image: _Image.Image | _np.ndarray | str | bytes | PathLike,
+    palette: Sequence[object] | Mapping[str, object] = COLORS,
+    *,
+    dither: str = "none",
+    output_filepath: str | bytes | PathLike | None = None,
+) -> _Image.Image | None:
+    """Snap an image to the nearest brand colors as a palette (``P`` mode) image.
+
+    Nearest colors are chosen by perceptual (OKLab) distance through a lookup
+    cube of 64 levels per channel that is built once per palette, so the cost
+    per pixel is a single table lookup. Fully transparent pixels map to an
+    extra transparent palette entry.
+
+    Args:
+        image: PIL image, image path, or array of shape ``(H, W)``,
+            ``(H, W, 3)``, or ``(H, W, 4)``; float arrays are read as ``[0, 1]``.
+        palette: Colors to snap to, as Matplotlib color specs or a mapping such
+            as :data:`BRAND_COLORS` whose values are used.
+        dither: ``"none"``, ``"ordered"`` (8x8 Bayer thresholds), or
+            ``"floyd_steinberg"`` (error diffusion in sRGB).
+        output_filepath: Optional path to save the result to; PNG output uses
+            the smallest bit depth that holds the palette.
+
+    Returns:
+        The palette image, or ``None`` when ``output_filepath`` is given.
+
+    Raises:
+        ValueError: If ``dither`` is unknown, the palette is empty, too large,
+            or contains an invalid color, or the image array has an
+            unsupported shape.
+    """
+    if dither not in _DITHER_METHODS:
+        raise ValueError(
+            f"Unsupported dither '{dither}'. Choose from: {', '.join(_DITHER_METHODS)}."
+        )
+    palette_rgb = _palette_rgb(palette)
+    pixels, transparent = _load_rgb_pixels(image)
+    if transparent is not None and len(palette_rgb) == 256:
+        raise ValueError("palette must contain at most 255 colors for images with transparency.")
+    cube = _palette_cube(palette_rgb.tobytes())
+
+    if dither == "ordered":
+        indices = _dither_ordered(pixels, palette_rgb, cube)
+    elif dither == "floyd_steinberg":
+        indices = _dither_floyd_steinberg(pixels, palette_rgb, cube)
+    else:
+        indices = _cube_lookup(cube, pixels)
 
-    overlay = _Image.new("RGBA", source_rgba.size, (0, 0, 0, 0))
-    overlay.paste(resized_logo, (x_position, y_position), resized_logo)
-    composited = _Image.alpha_composite(source_rgba, overlay)
+    entries = palette_rgb
+    if transparent is not None:
+        indices[transparent] = len(palette_rgb)
+        entries = _np.vstack([palette_rgb, _np.zeros((1, 3), dtype=_np.uint8)])
+    quantized = _Image.fromarray(indices, mode="P")
+    quantized.putpalette(entries.tobytes())
+    if transparent is not None:
+        quantized.info["transparency"] = len(palette_rgb)
 
-    if source_image.mode == "RGBA":
-        output_image = composited
-    else:
-        output_image = composited.convert(source_image.mode)
+    if output_filepath is None:
+        return quantized
 
-    target_path = filepath if output_filepath is None else output_filepath
-    output_image.save(target_path)
+    quantized.save(output_filepath)
+    return None
 
 
 def __getattr__(name: str) -> object:
-    if name == "colormaps":
-        return _import_module(".colormaps", __name__)
+    if name in ("colormaps", "contrast"):
+        return _import_module(f".{name}", __name__)
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
@@ -416,6 +593,7 @@ __all__ = [
     "TEAL",
     "WHITE_PATTERN_PNG",
     "colormaps",
+    "contrast",
     "flag",
     "get_circle_graphic_path",
     "get_gradient_paths",
@@ -423,5 +601,6 @@ __all__ = [
     "get_matplotlib_font_fallbacks",
     "get_pattern_path",
     "get_scribble_path",
+    "quantize_to_palette",
     "watermark",
 ]
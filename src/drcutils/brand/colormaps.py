@@ -1,22 +1,69 @@
-"""Matplotlib colormaps derived from DRC brand colors."""
+"""Matplotlib colormaps derived from DRC brand colors.
+
+Gradient lookup tables are precomputed by ``scripts/build_colormap_tables.py``
+into ``drcutils/data/colormaps.npy``; each colormap is built from that table
+the first time it is accessed.
+"""
 
 from __future__ import annotations
 
 from collections.abc import Sequence
-from typing import Literal
+from functools import cache
+from importlib.resources import files as _resource_files
+from typing import Any, Literal
 
+import matplotlib as _mpl
 import matplotlib.colors as _mpc
+import numpy as _np
 
+from .._lut import byte_lut as _byte_lut
+from .._lut import map_through_lut as _map_through_lut
 from . import BLACK, BLUE, COLORS, DARK_TEAL, ORANGE, RED, TEAL
 
-_BLACK_RGB, _DARK_TEAL_RGB, _TEAL_RGB, _BLUE_RGB, _ORANGE_RGB, _RED_RGB = [
-    _mpc.to_rgb(c) for c in COLORS
-]
-_WHITE_RGB = (1.0, 1.0, 1.0)
+_WHITE = "#FFFFFF"
+_TABLE_PATH = _resource_files("drcutils") / "data" / "colormaps.npy"
+_TABLE_SIZE = 256
 
 type _ChannelStops = Sequence[tuple[float, ...]]
 type _SegmentData = dict[Literal["red", "green", "blue", "alpha"], _ChannelStops]
 
+# Gradient definitions as ``(colors, fractions)``, in packaged table order.
+_GRADIENTS: dict[str, tuple[tuple[str, ...], tuple[float, ...]]] = {
+    "drc_diverging": (
+        (DARK_TEAL, TEAL, BLUE, _WHITE, ORANGE, RED),
+        (0.00, 0.17, 0.33, 0.50, 0.75, 1.00),
+    ),
+    "drc_dark_diverging": (
+        (BLUE, TEAL, DARK_TEAL, BLACK, RED, ORANGE),
+        (0.00, 0.17, 0.33, 0.50, 0.75, 1.00),
+    ),
+    "drc_cool": ((_WHITE, BLUE, TEAL, DARK_TEAL, BLACK), (0.00, 0.25, 0.50, 0.75, 1.00)),
+    "drc_warm": ((_WHITE, ORANGE, RED, BLACK), (0.00, 0.33, 0.67, 1.00)),
+}
+_NAMES = tuple(name for base in ("drc_palette", *_GRADIENTS) for name in (base, f"{base}_r"))
+
+# Declared but unbound: the module ``__getattr__`` constructs each on first access.
+
+#: Listed colormap in canonical DRC palette order.
+drc_palette: _mpc.ListedColormap
+drc_palette_r: _mpc.ListedColormap
+
+#: Diverging colormap with white center.
+drc_diverging: _mpc.LinearSegmentedColormap
+drc_diverging_r: _mpc.LinearSegmentedColormap
+
+#: Diverging colormap with a dark center.
+drc_dark_diverging: _mpc.LinearSegmentedColormap
+drc_dark_diverging_r: _mpc.LinearSegmentedColormap
+
+#: Cool gradient from white to black through blue/teal tones.
+drc_cool: _mpc.LinearSegmentedColormap
+drc_cool_r: _mpc.LinearSegmentedColormap
+
+#: Warm gradient from white to black through orange/red tones.
+drc_warm: _mpc.LinearSegmentedColormap
+drc_warm_r: _mpc.LinearSegmentedColormap
+
 
 def _make_segment_data(
     colors: Sequence[Sequence[float]],
@@ -30,57 +77,196 @@ def _make_segment_data(
     }
 
 
-#: Listed colormap in canonical DRC palette order.
-drc_palette = _mpc.ListedColormap(COLORS, name="drc_palette")
-drc_palette_r = drc_palette.reversed()
-drc_palette_r.name = "drc_palette_r"
+def _segmented_colormap(name: str) -> _mpc.LinearSegmentedColormap:
+    """Build a gradient from its segment definition; the source of the packaged table."""
+    colors, fractions = _GRADIENTS[name]
+    return _mpc.LinearSegmentedColormap(
+        name,
+        segmentdata=_make_segment_data([_mpc.to_rgb(c) for c in colors], fractions),
+        N=_TABLE_SIZE,
+    )
 
-#: Diverging colormap with white center.
-drc_diverging = _mpc.LinearSegmentedColormap(
-    "drc_diverging",
-    segmentdata=_make_segment_data(
-        [_DARK_TEAL_RGB, _TEAL_RGB, _BLUE_RGB, _WHITE_RGB, _ORANGE_RGB, _RED_RGB],
-        [0.00, 0.17, 0.33, 0.50, 0.75, 1.00],
-    ),
-    N=256,
-)
-drc_diverging_r = drc_diverging.reversed()
-drc_diverging_r.name = "drc_diverging_r"
 
-#: Diverging colormap with a dark center.
-drc_dark_diverging = _mpc.LinearSegmentedColormap(
-    "drc_dark_diverging",
-    segmentdata=_make_segment_data(
-        [_BLUE_RGB, _TEAL_RGB, _DARK_TEAL_RGB, _BLACK_RGB, _RED_RGB, _ORANGE_RGB],
-        [0.00, 0.17, 0.33, 0.50, 0.75, 1.00],
-    ),
-    N=256,
-)
-drc_dark_diverging_r = drc_dark_diverging.reversed()
-drc_dark_diverging_r.name = "drc_dark_diverging_r"
+def _build_table() -> _np.ndarray:
+    """Sample every gradient into a ``(n_gradients, 256, 3)`` uint8 RGB table.
 
-#: Cool gradient from white to black through blue/teal tones.
-drc_cool = _mpc.LinearSegmentedColormap(
-    "drc_cool",
-    segmentdata=_make_segment_data(
-        [_WHITE_RGB, _BLUE_RGB, _TEAL_RGB, _DARK_TEAL_RGB, _BLACK_RGB],
-        [0.00, 0.25, 0.50, 0.75, 1.00],
-    ),
-    N=256,
-)
-drc_cool_r = drc_cool.reversed()
-drc_cool_r.name = "drc_cool_r"
+    Channels are truncated the way ``Colormap(..., bytes=True)`` does it, so
+    byte colors from the packaged maps match the segment definitions exactly.
+    """
+    samples = _np.arange(_TABLE_SIZE)
+    table = _np.stack([_segmented_colormap(name)(samples)[:, :3] for name in _GRADIENTS])
+    return (table * 255).astype(_np.uint8)
+
+
+@cache
+def _load_table() -> _np.ndarray:
+    with _TABLE_PATH.open("rb") as handle:
+        table = _np.load(handle)
+    table.flags.writeable = False
+    return table
+
+
+def _brand_colormap(name: str) -> _mpc.Colormap:
+    """Return a brand colormap by name, constructing and caching it on first use."""
+    cmap = globals().get(name)
+    if isinstance(cmap, _mpc.Colormap):
+        return cmap
+    base = name.removesuffix("_r")
+    if base == "drc_palette":
+        cmap = _mpc.ListedColormap(COLORS[::-1] if name != base else COLORS, name=name)
+    else:
+        colors = _load_table()[list(_GRADIENTS).index(base)] / 255.0
+        # Interpolating between the samples keeps ``resampled(n)`` continuous.
+        cmap = _mpc.LinearSegmentedColormap.from_list(
+            name, colors[::-1] if name != base else colors, N=_TABLE_SIZE
+        )
+    globals()[name] = cmap
+    return cmap
+
+
+def register_colormaps(*names: str) -> list[str]:
+    """Register brand colormaps with ``matplotlib.colormaps``.
+
+    Only the requested colormaps are constructed, after which they can be
+    referred to by name anywhere Matplotlib accepts a colormap, e.g.
+    ``plt.imshow(data, cmap="drc_cool")``. Names that are already registered
+    are left untouched, so repeated calls are cheap.
+
+    Args:
+        *names: Brand colormap names to register. Registers all of them when
+            omitted.
+
+    Returns:
+        The requested colormap names.
+
+    Raises:
+        ValueError: If a name is not a brand colormap.
+    """
+    requested = names or _NAMES
+    for name in requested:
+        if name not in _NAMES:
+            raise ValueError(f"Unknown brand colormap '{name}'. Choose from: {', '.join(_NAMES)}.")
+    for name in requested:
+        if name not in _mpl.colormaps:
+            _mpl.colormaps.register(_brand_colormap(name), name=name)
+    return list(requested)
+
+
+def resolve_colormap(cmap: str | _mpc.Colormap) -> _mpc.Colormap:
+    """Return a colormap instance for a brand name, Matplotlib name, or colormap.
+
+    Args:
+        cmap: Brand colormap name, registered Matplotlib colormap name, or a
+            colormap instance, which is returned unchanged.
+
+    Returns:
+        The colormap.
+
+    Raises:
+        ValueError: If ``cmap`` is not a known colormap name.
+    """
+    if isinstance(cmap, _mpc.Colormap):
+        return cmap
+    if cmap in _NAMES:
+        return _brand_colormap(cmap)
+    try:
+        return _mpl.colormaps[cmap]
+    except KeyError as exc:
+        raise ValueError(f"Unknown colormap '{cmap}'.") from exc
+
+
+def apply_colormap(
+    array: Any,
+    cmap: str | _mpc.Colormap,
+    vmin: float | None = None,
+    vmax: float | None = None,
+    out: _np.ndarray | None = None,
+    *,
+    alpha: bool = True,
+    jobs: int | None = None,
+    chunk_size: int = 1 << 16,
+) -> _np.ndarray:
+    """Map scalar data to ``uint8`` colors through a precomputed lookup table.
+
+    Values are normalized linearly and quantized to integer indices into a
+    ``uint8`` table built once from ``cmap``, so no float RGBA intermediate is
+    created. Results match ``cmap(Normalize(vmin, vmax)(array), bytes=True)``,
+    including under, over, and bad colors; NaN is treated as bad even inside
+    masked arrays, and default limits ignore NaN. Large inputs are processed in
+    chunks across threads; NumPy releases the GIL for each step.
+
+    Args:
+        array: Scalar data of any shape; masked arrays mark bad values.
+        cmap: Brand colormap name, registered Matplotlib colormap name, or a
+            colormap instance.
+        vmin: Value mapped to the first color. Defaults to the data minimum.
+        vmax: Value mapped to the last color. Defaults to the data maximum.
+        out: Optional C-contiguous ``uint8`` buffer of shape
+            ``array.shape + (4,)`` for RGBA or ``array.shape + (3,)`` for RGB.
+        alpha: Whether to allocate RGBA rather than RGB when ``out`` is omitted.
+        jobs: Number of worker threads. ``None`` uses the shared concurrency
+            budget from :mod:`drcutils.runtime.executor`, one per usable core
+            by default.
+        chunk_size: Number of values processed per chunk. The default keeps
+            each chunk's intermediates in cache.
+
+    Returns:
+        The ``uint8`` color array (``out`` when provided).
+
+    Raises:
+        ValueError: If the colormap name is unknown, ``vmin`` is greater than
+            ``vmax``, ``vmin`` equals ``vmax`` for non-constant data, ``out``
+            has the wrong shape, dtype, or layout, or ``chunk_size`` is not
+            positive.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+    lut = _byte_lut(resolve_colormap(cmap))
+    values = _np.ma.getdata(array)
+    values = _np.asarray(values)
+    bad = _np.ma.getmask(array)
+    bad_flat = None if bad is _np.ma.nomask else _np.asarray(bad).reshape(-1)
+    finite = None
+    if vmin is None or vmax is None:
+        finite = _np.ma.masked_invalid(_np.ma.array(values, mask=bad))
+        vmin = float(finite.min()) if vmin is None else vmin
+        vmax = float(finite.max()) if vmax is None else vmax
+    if vmin > vmax:
+        raise ValueError(f"vmin ({vmin}) must not be greater than vmax ({vmax}).")
+    if vmin == vmax:
+        if finite is None:
+            finite = _np.ma.masked_invalid(_np.ma.array(values, mask=bad))
+        if finite.count() and finite.min() != finite.max():
+            raise ValueError(
+                f"vmin and vmax are both {vmin}, but the data are not constant; "
+                "widen the limits so the data can be told apart."
+            )
+
+    if out is None:
+        out = _np.empty(values.shape + (4 if alpha else 3,), dtype=_np.uint8)
+    elif (
+        out.dtype != _np.uint8
+        or out.shape[:-1] != values.shape
+        or out.shape[-1] not in (3, 4)
+        or not out.flags.c_contiguous
+    ):
+        raise ValueError(
+            "out must be a C-contiguous uint8 array of shape array.shape + (3,) or (4,)."
+        )
+
+    _map_through_lut(values, bad_flat, lut, vmin, vmax, out, jobs=jobs, chunk_size=chunk_size)
+    return out
+
+
+def __getattr__(name: str) -> object:
+    if name in _NAMES:
+        return _brand_colormap(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_NAMES))
 
-#: Warm gradient from white to black through orange/red tones.
-drc_warm = _mpc.LinearSegmentedColormap(
-    "drc_warm",
-    segmentdata=_make_segment_data(
-        [_WHITE_RGB, _ORANGE_RGB, _RED_RGB, _BLACK_RGB], [0.00, 0.33, 0.67, 1.00]
-    ),
-    N=256,
-)
-drc_warm_r = drc_warm.reversed()
-drc_warm_r.name = "drc_warm_r"
 
 __all__ = [
     "BLACK",
@@ -89,6 +275,7 @@ __all__ = [
     "ORANGE",
     "RED",
     "TEAL",
+    "apply_colormap",
     "drc_cool",
     "drc_cool_r",
     "drc_dark_diverging",
@@ -99,4 +286,6 @@ __all__ = [
     "drc_palette_r",
     "drc_warm",
     "drc_warm_r",
+    "register_colormaps",
+    "resolve_colormap",
 ]
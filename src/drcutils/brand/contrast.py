@@ -0,0 +1,252 @@
+"""Vectorized contrast and color-difference matrices for palettes and colormaps."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import matplotlib.colors as _mpc
+import numpy as _np
+
+from . import _srgb_to_linear
+
+_CVD_TYPES = ("protanopia", "deuteranopia", "tritanopia")
+# Machado, Oliveira & Fernandes (2009), severity 1.0, applied to linear RGB.
+_CVD_MATRICES = {
+    "protanopia": _np.array(
+        [
+            [0.152286, 1.052583, -0.204868],
+            [0.114503, 0.786281, 0.099216],
+            [-0.003882, -0.048116, 1.051998],
+        ]
+    ),
+    "deuteranopia": _np.array(
+        [
+            [0.367322, 0.860646, -0.227968],
+            [0.280085, 0.672501, 0.047413],
+            [-0.011820, 0.042940, 0.968881],
+        ]
+    ),
+    "tritanopia": _np.array(
+        [
+            [1.255528, -0.076749, -0.178779],
+            [-0.078411, 0.930809, 0.147602],
+            [0.004733, 0.691367, 0.303900],
+        ]
+    ),
+}
+# Linear sRGB to CIE XYZ, D65 white.
+_XYZ_FROM_LINEAR = _np.array(
+    [
+        [0.4124564, 0.3575761, 0.1804375],
+        [0.2126729, 0.7151522, 0.0721750],
+        [0.0193339, 0.1191920, 0.9503041],
+    ]
+)
+_D65_WHITE = _XYZ_FROM_LINEAR.sum(axis=1)
+
+
+def _as_rgb(colors: Any) -> _np.ndarray:
+    """Return colors as an ``(N, 3)`` float sRGB array.
+
+    Colormaps contribute their full lookup table; mappings contribute their
+    values; arrays are read as ``(N, 3)`` or ``(N, 4)`` floats in ``[0, 1]``.
+    """
+    if isinstance(colors, _mpc.Colormap):
+        return colors(_np.arange(colors.N))[:, :3]
+    if isinstance(colors, _np.ndarray) and colors.dtype.kind == "f":
+        array = colors
+    else:
+        if isinstance(colors, str):
+            colors = [colors]
+        elif isinstance(colors, Mapping):
+            colors = list(colors.values())
+        try:
+            array = _mpc.to_rgba_array(colors)
+        except ValueError as exc:
+            raise ValueError(f"Invalid color: {exc}") from exc
+    if array.ndim != 2 or array.shape[1] not in (3, 4):
+        raise ValueError("Color arrays must have shape (N, 3) or (N, 4).")
+    return _np.asarray(array[:, :3], dtype=float)
+
+
+def _srgb_to_lab(rgb: _np.ndarray) -> _np.ndarray:
+    """Convert ``(..., 3)`` sRGB values in ``[0, 1]`` to CIELAB (D65)."""
+    xyz = (_srgb_to_linear(rgb) @ _XYZ_FROM_LINEAR.T) / _D65_WHITE
+    f = _np.where(xyz > (6 / 29) ** 3, _np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return _np.stack(
+        [116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])],
+        axis=-1,
+    )
+
+
+def _ciede2000(lab1: _np.ndarray, lab2: _np.ndarray) -> _np.ndarray:
+    """CIEDE2000 difference between broadcastable ``(..., 3)`` Lab arrays (Sharma et al., 2005)."""
+    L1, a1, b1 = _np.moveaxis(lab1, -1, 0)
+    L2, a2, b2 = _np.moveaxis(lab2, -1, 0)
+    c_bar7 = ((_np.hypot(a1, b1) + _np.hypot(a2, b2)) / 2) ** 7
+    g = 0.5 * (1 - _np.sqrt(c_bar7 / (c_bar7 + 25.0**7)))
+    a1p, a2p = (1 + g) * a1, (1 + g) * a2
+    c1p, c2p = _np.hypot(a1p, b1), _np.hypot(a2p, b2)
+    h1p = _np.degrees(_np.arctan2(b1, a1p)) % 360
+    h2p = _np.degrees(_np.arctan2(b2, a2p)) % 360
+    chroma_product = c1p * c2p
+    achromatic = chroma_product == 0
+
+    dh = h2p - h1p
+    dh = _np.where(dh > 180, dh - 360, _np.where(dh < -180, dh + 360, dh))
+    dh = _np.where(achromatic, 0.0, dh)
+    dL = L2 - L1
+    dC = c2p - c1p
+    dH = 2 * _np.sqrt(chroma_product) * _np.sin(_np.radians(dh / 2))
+
+    L_bar = (L1 + L2) / 2
+    c_bar_p = (c1p + c2p) / 2
+    h_sum = h1p + h2p
+    h_bar = _np.where(
+        _np.abs(h1p - h2p) <= 180, h_sum / 2, _np.where(h_sum < 360, h_sum + 360, h_sum - 360) / 2
+    )
+    h_bar = _np.where(achromatic, h_sum, h_bar)
+
+    t = (
+        1
+        - 0.17 * _np.cos(_np.radians(h_bar - 30))
+        + 0.24 * _np.cos(_np.radians(2 * h_bar))
+        + 0.32 * _np.cos(_np.radians(3 * h_bar + 6))
+        - 0.20 * _np.cos(_np.radians(4 * h_bar - 63))
+    )
+    c_bar_p7 = c_bar_p**7
+    r_t = (
+        -2
+        * _np.sqrt(c_bar_p7 / (c_bar_p7 + 25.0**7))
+        * _np.sin(_np.radians(60 * _np.exp(-(((h_bar - 275) / 25) ** 2))))
+    )
+    s_l = 1 + 0.015 * (L_bar - 50) ** 2 / _np.sqrt(20 + (L_bar - 50) ** 2)
+    s_c = 1 + 0.045 * c_bar_p
+    s_h = 1 + 0.015 * c_bar_p * t
+    dC_term, dH_term = dC / s_c, dH / s_h
+    return _np.sqrt((dL / s_l) ** 2 + dC_term**2 + dH_term**2 + r_t * dC_term * dH_term)
+
+
+def relative_luminance(colors: Any) -> _np.ndarray:
+    """Return the WCAG relative luminance of each color.
+
+    Args:
+        colors: Color specs, a mapping such as ``BRAND_COLORS``, an ``(N, 3)``
+            or ``(N, 4)`` float array, or a colormap (its full lookup table).
+
+    Returns:
+        A length ``N`` array of luminances in ``[0, 1]``.
+
+    Raises:
+        ValueError: If a color cannot be parsed or an array has the wrong shape.
+    """
+    return _srgb_to_linear(_as_rgb(colors)) @ _XYZ_FROM_LINEAR[1]
+
+
+def contrast_matrix(foreground: Any, background: Any = None) -> _np.ndarray:
+    """Return WCAG 2 contrast ratios between every pair of colors.
+
+    Ratios run from 1 (identical luminance) to 21 (black on white). WCAG asks
+    for at least 4.5 for body text and 3 for large text and graphics.
+
+    Args:
+        foreground: Colors in any form accepted by :func:`relative_luminance`.
+        background: Colors to compare against. Defaults to ``foreground``.
+
+    Returns:
+        An ``(N, M)`` array of contrast ratios.
+
+    Raises:
+        ValueError: If a color cannot be parsed or an array has the wrong shape.
+    """
+    fg = relative_luminance(foreground)[:, None] + 0.05
+    bg = fg.T if background is None else relative_luminance(background)[None, :] + 0.05
+    return _np.maximum(fg, bg) / _np.minimum(fg, bg)
+
+
+def delta_e_matrix(colors: Any, others: Any = None) -> _np.ndarray:
+    """Return CIEDE2000 color differences between every pair of colors.
+
+    A difference around 1 is just noticeable; differences below about 10 are
+    easy to confuse in small marks such as lines and markers.
+
+    Args:
+        colors: Colors in any form accepted by :func:`relative_luminance`.
+        others: Colors to compare against. Defaults to ``colors``.
+
+    Returns:
+        An ``(N, M)`` array of CIEDE2000 differences.
+
+    Raises:
+        ValueError: If a color cannot be parsed or an array has the wrong shape.
+    """
+    lab = _srgb_to_lab(_as_rgb(colors))
+    other_lab = lab if others is None else _srgb_to_lab(_as_rgb(others))
+    return _ciede2000(lab[:, None, :], other_lab[None, :, :])
+
+
+def simulate_cvd(
+    colors: Any, deficiency: str = "deuteranopia", severity: float = 1.0
+) -> _np.ndarray:
+    """Simulate how colors appear with a color-vision deficiency.
+
+    Uses the Machado et al. (2009) model in linear RGB. Partial ``severity``
+    blends linearly between normal vision and the full deficiency.
+
+    Args:
+        colors: Colors in any form accepted by :func:`relative_luminance`.
+        deficiency: ``"protanopia"``, ``"deuteranopia"``, or ``"tritanopia"``.
+        severity: Strength of the deficiency from 0 to 1.
+
+    Returns:
+        An ``(N, 3)`` array of simulated sRGB colors in ``[0, 1]``.
+
+    Raises:
+        ValueError: If ``deficiency`` is unknown, ``severity`` is outside
+            ``[0, 1]``, or a color cannot be parsed.
+    """
+    if deficiency not in _CVD_MATRICES:
+        raise ValueError(
+            f"Unsupported deficiency '{deficiency}'. Choose from: {', '.join(_CVD_TYPES)}."
+        )
+    if not 0.0 <= severity <= 1.0:
+        raise ValueError("severity must be in [0, 1].")
+    matrix = (1 - severity) * _np.eye(3) + severity * _CVD_MATRICES[deficiency]
+    linear = _np.clip(_srgb_to_linear(_as_rgb(colors)) @ matrix.T, 0.0, 1.0)
+    return _np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+
+
+def cvd_delta_e_matrix(
+    colors: Any,
+    others: Any = None,
+    deficiency: str = "deuteranopia",
+    severity: float = 1.0,
+) -> _np.ndarray:
+    """Return CIEDE2000 differences between colors as seen with a color-vision deficiency.
+
+    Args:
+        colors: Colors in any form accepted by :func:`relative_luminance`.
+        others: Colors to compare against. Defaults to ``colors``.
+        deficiency: ``"protanopia"``, ``"deuteranopia"``, or ``"tritanopia"``.
+        severity: Strength of the deficiency from 0 to 1.
+
+    Returns:
+        An ``(N, M)`` array of CIEDE2000 differences between simulated colors.
+
+    Raises:
+        ValueError: If ``deficiency`` or ``severity`` is invalid, or a color
+            cannot be parsed.
+    """
+    simulated = simulate_cvd(colors, deficiency, severity)
+    other = simulated if others is None else simulate_cvd(others, deficiency, severity)
+    return delta_e_matrix(simulated, other)
+
+
+__all__ = [
+    "contrast_matrix",
+    "cvd_delta_e_matrix",
+    "delta_e_matrix",
+    "relative_luminance",
+    "simulate_cvd",
+]
@@ -0,0 +1,145 @@
+"""Command-line entrypoint for incremental batch figure exports."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from importlib import import_module
+from pathlib import Path
+from typing import Any
+
+from ._common import (
+    build_parser,
+    ensure_directory,
+    parse_comma_list,
+    print_error,
+    print_json,
+)
+
+_PICKLE_SUFFIXES = {".pkl", ".pickle"}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = build_parser(
+        prog="drc-export-figures",
+        description=(
+            "Export many figures with publication presets, skipping outputs whose "
+            "content hash is unchanged since the last build."
+        ),
+    )
+    parser.add_argument(
+        "figures",
+        nargs="+",
+        help=(
+            "Pickled figure files (.pkl/.pickle) or 'module:function' factories that "
+            "return a Matplotlib figure."
+        ),
+    )
+    parser.add_argument("--out-dir", required=True, help="Directory for exported figures.")
+    parser.add_argument(
+        "--targets", default="one_col", help="Comma-separated preset targets to render."
+    )
+    parser.add_argument(
+        "--formats", default="pdf,png", help="Comma-separated output formats to render."
+    )
+    parser.add_argument("--dpi", type=int, default=300, help="Raster resolution in dpi.")
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Number of worker processes (0 uses all cores)."
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Re-export every figure and ignore the cache."
+    )
+    parser.add_argument(
+        "--manifest", default=None, help="Build manifest path (default: <out-dir>/manifest.json)."
+    )
+    parser.add_argument(
+        "--app-dir",
+        default=".",
+        help="Directory searched first for 'module:function' factories (default: current directory).",
+    )
+    return parser
+
+
+@contextmanager
+def _import_path(directory: Path) -> Iterator[None]:
+    """Put ``directory`` first on ``sys.path`` for the block, then restore it.
+
+    Console scripts do not put the working directory on ``sys.path``.
+    """
+    saved = list(sys.path)
+    sys.path.insert(0, str(directory.resolve()))
+    try:
+        yield
+    finally:
+        sys.path[:] = saved
+
+
+def _resolve_source(spec: str) -> tuple[str, Any]:
+    """Map a CLI figure spec to an output name and a figure source."""
+    path = Path(spec)
+    if path.suffix.lower() in _PICKLE_SUFFIXES:
+        if not path.is_file():
+            raise ValueError(f"Pickled figure not found: {path}")
+        return path.stem, path
+
+    module_name, sep, attr = spec.partition(":")
+    if not sep or not module_name or not attr:
+        raise ValueError(f"Invalid figure source '{spec}'. Use a .pkl file or 'module:function'.")
+    try:
+        factory = getattr(import_module(module_name), attr)
+    except (ImportError, AttributeError) as exc:
+        raise ValueError(f"Failed to import figure factory '{spec}': {exc}") from exc
+    if not callable(factory):
+        raise ValueError(f"Figure factory '{spec}' is not callable.")
+    return attr, factory
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the batch figure export CLI."""
+    from ..viz.paper_figures import export_figures
+
+    args = _build_parser().parse_args(argv)
+    try:
+        # Factories may import sibling modules when called, so the app directory
+        # stays importable until the export finishes.
+        with _import_path(Path(args.app_dir)):
+            sources: dict[str, Any] = {}
+            for spec in args.figures:
+                name, source = _resolve_source(spec)
+                if name in sources:
+                    raise ValueError(f"Duplicate figure name '{name}' from '{spec}'.")
+                sources[name] = source
+
+            out_dir = Path(args.out_dir)
+            ensure_directory(out_dir)
+            manifest = export_figures(
+                sources,
+                out_dir,
+                targets=parse_comma_list(args.targets),
+                formats=parse_comma_list(args.formats),
+                dpi=args.dpi,
+                jobs=None if args.jobs == 0 else args.jobs,
+                force=args.force,
+                manifest_path=args.manifest,
+            )
+    except (ValueError, OSError) as exc:
+        return print_error(str(exc))
+
+    print_json(
+        {
+            name: {
+                "cached": entry["cached"],
+                "rendered": entry["rendered"],
+                "seconds": round(entry["seconds"], 3),
+                "warnings": entry["warnings"],
+            }
+            for name, entry in manifest["figures"].items()
+        }
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
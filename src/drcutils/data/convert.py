@@ -10,6 +10,9 @@ import pandas as _pandas
 from PIL.Image import Image as _Image
 from PIL.Image import open as _open
 
+from ..runtime.trace import span as _span
+from ..runtime.trace import traced as _traced
+
 
 def _get_data_extensions() -> tuple[dict[str, Any], dict[str, Any]]:
     from_extensions = {
@@ -69,6 +72,7 @@ def _convertible(from_ext: str, to_ext: str) -> bool:
     return False
 
 
+@_traced("convert")
 def convert(
     thing_to_convert_from: str | bytes | PathLike,
     thing_to_convert_to: str | bytes | PathLike,
@@ -110,8 +114,7 @@ def convert(
             f"Files with extension {from_ext} cannot be converted to extension {to_ext}."
         )
 
-    to_extensions[to_ext](
-        from_extensions[from_ext](thing_to_convert_from, **from_kwargs),
-        thing_to_convert_to,
-        **to_kwargs,
-    )
+    with _span("convert.read", format=from_ext):
+        data = from_extensions[from_ext](thing_to_convert_from, **from_kwargs)
+    with _span("convert.write", format=to_ext):
+        to_extensions[to_ext](data, thing_to_convert_to, **to_kwargs)
@@ -1,5 +1,6 @@
 """Runtime environment helpers."""
 
 from .env import is_google_colab, is_notebook
+from .resources import profile
 
-__all__ = ["is_google_colab", "is_notebook"]
+__all__ = ["is_google_colab", "is_notebook", "profile"]
@@ -1,5 +1,6 @@
 """Environment detection helpers for notebook and Colab runtimes."""
 
+from functools import cache as _cache
 from sys import modules as _modules
 
 from IPython import get_ipython as _get_ipython
@@ -14,9 +15,13 @@ def is_google_colab() -> bool:
     return "google.colab" in _modules
 
 
+@_cache
 def is_notebook() -> bool:
     """Determine whether or not the environment is in a notebook.
 
+    The answer cannot change within a process, so it is computed once and
+    cached; ``is_notebook.cache_clear()`` forces a fresh lookup.
+
     Returns:
         ``True`` when running in a notebook runtime.
     """
@@ -0,0 +1,388 @@
+"""Shared thread and process pools under one process-wide concurrency budget."""
+
+from __future__ import annotations
+
+import multiprocessing as _multiprocessing
+import multiprocessing.context as _mp_context
+import os as _os
+import threading as _threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import wait as _wait
+from contextlib import contextmanager, nullcontext
+from typing import Any
+
+from .resources import _PROCESS_WORKER_BYTES, _THREAD_VARIABLES, _probe, _worker_count
+
+_START_METHODS = tuple(
+    method
+    for method in ("forkserver", "spawn")
+    if method in _multiprocessing.get_all_start_methods()
+)
+
+# Modules imported once in the fork server instead of in every worker.
+_PRELOAD = ["__main__", "drcutils"]
+
+_LOCK = _threading.Lock()
+_ENV_LOCK = _threading.Lock()
+_budget: int | None = None
+_start_method: str | None = None
+_active = 0
+_in_worker = False
+_thread_pool: ThreadPoolExecutor | None = None
+_process_pools: dict[str, _PinnedProcessPool] = {}
+
+
+def _check_start_method(start_method: str | None) -> str:
+    method = start_method or _start_method or _START_METHODS[0]
+    if method not in _START_METHODS:
+        raise ValueError(
+            f"Unsupported start method '{method}'. Choose from: {', '.join(_START_METHODS)}."
+        )
+    return method
+
+
+@contextmanager
+def _pinned_environment() -> Iterator[None]:
+    """Set BLAS and OpenMP thread variables to 1 while worker processes start.
+
+    Spawned and forkserver workers copy the environment when they start, before
+    NumPy is imported, which is the only point where these variables take effect.
+    """
+    with _ENV_LOCK:
+        saved = {name: _os.environ.get(name) for name in _THREAD_VARIABLES}
+        _os.environ.update(dict.fromkeys(_THREAD_VARIABLES, "1"))
+        try:
+            yield
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    _os.environ.pop(name, None)
+                else:
+                    _os.environ[name] = value
+
+
+def _init_worker() -> None:
+    """Run nested parallel work inline inside a worker process."""
+    global _budget, _in_worker
+    _os.environ.update(dict.fromkeys(_THREAD_VARIABLES, "1"))
+    _budget = 1
+    _in_worker = True
+
+
+if "forkserver" in _START_METHODS:
+    import multiprocessing.forkserver as _forkserver
+
+    class _ForkServerContext(_mp_context.ForkServerContext):
+        """Private forkserver context that keeps its own preload list.
+
+        The stock context writes the preload list into the process-wide fork
+        server, so every other user of forkserver would inherit it. This one
+        only records the list; :meth:`preloaded` applies it while drcutils
+        workers start and restores the previous list afterwards.
+        """
+
+        def __init__(self) -> None:
+            self._preload: list[str] = []
+
+        def set_forkserver_preload(self, module_names: list[str]) -> None:
+            """Record the modules to import in the fork server for this context."""
+            self._preload = list(module_names)
+
+        @contextmanager
+        def preloaded(self) -> Iterator[None]:
+            """Apply this context's preload list while worker processes start."""
+            server = _forkserver._forkserver
+            saved = list(getattr(server, "_preload_modules", ["__main__"]))
+            server.set_forkserver_preload(self._preload)
+            try:
+                yield
+            finally:
+                server.set_forkserver_preload(saved)
+
+
+def _new_context(method: str) -> _mp_context.BaseContext:
+    """Return a private context for ``method`` with drcutils preloaded for forkserver."""
+    if method == "forkserver":
+        context = _ForkServerContext()
+        context.set_forkserver_preload(_PRELOAD)
+        return context
+    return _multiprocessing.get_context(method)
+
+
+class _PinnedProcessPool(ProcessPoolExecutor):
+    """Process pool whose workers start with one BLAS/OpenMP thread each."""
+
+    _max_workers: int
+    _mp_context: _mp_context.BaseContext
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future[Any]:
+        """Submit a task, starting any new worker under the pinned environment."""
+        preload = getattr(self._mp_context, "preloaded", nullcontext)
+        with _pinned_environment(), preload():
+            return super().submit(fn, *args, **kwargs)
+
+
+def get_budget() -> int:
+    """Return the number of workers all shared pools may use together.
+
+    Defaults to the usable CPUs reported by :func:`drcutils.runtime.profile`.
+    Inside a worker process the budget is 1, so nested parallel work runs inline.
+    """
+    return _budget if _budget is not None else _probe()["cpus"]
+
+
+def set_budget(workers: int | None) -> None:
+    """Set the process-wide concurrency budget.
+
+    Args:
+        workers: Maximum workers across all shared pools, or ``None`` to use
+            one per usable CPU.
+
+    Raises:
+        ValueError: If ``workers`` is less than 1.
+    """
+    global _budget
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1.")
+    _budget = workers
+
+
+@contextmanager
+def budget(workers: int | None = None, start_method: str | None = None) -> Iterator[int]:
+    """Scope the concurrency budget and process start method for one pipeline.
+
+    The previous settings are restored on exit. The budget is process-wide, so
+    it also applies to work started from other threads while the block runs.
+
+    Args:
+        workers: Maximum workers across all shared pools. ``None`` keeps the
+            current budget.
+        start_method: ``"forkserver"`` or ``"spawn"`` for process pools created
+            inside the block. ``None`` keeps the current default.
+
+    Yields:
+        The budget in effect inside the block.
+
+    Raises:
+        ValueError: If ``workers`` is less than 1 or ``start_method`` is unsupported.
+
+    Examples:
+        >>> with budget(2) as workers:
+        ...     workers
+        2
+    """
+    global _start_method
+    if start_method is not None:
+        _check_start_method(start_method)
+    previous = (_budget, _start_method)
+    if workers is not None:
+        set_budget(workers)
+    if start_method is not None:
+        _start_method = start_method
+    try:
+        yield get_budget()
+    finally:
+        set_budget(previous[0])
+        _start_method = previous[1]
+
+
+def thread_pool() -> ThreadPoolExecutor:
+    """Return the shared thread pool, creating it on first use.
+
+    The pool has at least as many threads as the budget. Submitting to it
+    directly bypasses the budget; :func:`map_tasks` respects it.
+    """
+    global _thread_pool
+    size = get_budget()
+    with _LOCK:
+        if _thread_pool is None or _thread_pool._max_workers < size:
+            if _thread_pool is not None:
+                _thread_pool.shutdown(wait=False)
+            _thread_pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix="drcutils")
+        return _thread_pool
+
+
+def process_pool(start_method: str | None = None) -> ProcessPoolExecutor:
+    """Return the shared process pool for a start method, creating it on first use.
+
+    Workers start with ``OMP_NUM_THREADS``, ``OPENBLAS_NUM_THREADS``, and the
+    other BLAS thread variables set to 1, so a pool of N processes runs N
+    threads rather than N times the core count. With ``"forkserver"``,
+    drcutils is imported once in the fork server rather than in every worker.
+    Workers keep the environment they started with, so pass per-call settings
+    as task arguments rather than environment variables. If another library
+    already started the fork server, its environment and preloaded modules are
+    used instead. The preload list is only applied while drcutils starts its
+    own workers, so other forkserver users in the process are unaffected.
+
+    Args:
+        start_method: ``"forkserver"`` (the default where available) or
+            ``"spawn"``. ``None`` uses the method set by :func:`budget`.
+
+    Returns:
+        A pool with at least as many workers as the budget. Workers are
+        started on demand and kept for later calls.
+
+    Raises:
+        ValueError: If ``start_method`` is unsupported on this platform.
+    """
+    method = _check_start_method(start_method)
+    size = get_budget()
+    with _LOCK:
+        pool = _process_pools.get(method)
+        if pool is None or pool._max_workers < size or getattr(pool, "_broken", False):
+            if pool is not None:
+                pool.shutdown(wait=False)
+            pool = _PinnedProcessPool(
+                max_workers=size, mp_context=_new_context(method), initializer=_init_worker
+            )
+            _process_pools[method] = pool
+        return pool
+
+
+def shutdown(wait: bool = True) -> None:
+    """Shut down the shared pools; later calls create new ones.
+
+    Args:
+        wait: Block until running tasks finish.
+    """
+    global _thread_pool
+    with _LOCK:
+        pools: list[ThreadPoolExecutor | ProcessPoolExecutor] = list(_process_pools.values())
+        if _thread_pool is not None:
+            pools.append(_thread_pool)
+        _thread_pool = None
+        _process_pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait)
+
+
+def plan_workers(jobs: int | None, tasks: int, processes: bool = False) -> int:
+    """Resolve a ``jobs`` argument to a worker count within the budget.
+
+    Callers use this to choose between running inline and using a pool before
+    preparing task arguments.
+
+    Args:
+        jobs: Requested workers. ``None`` (or ``0``) means the whole budget,
+            capped for processes so each worker has about 256 MB of usable
+            memory.
+        tasks: Number of tasks to run.
+        processes: Whether the work will run on the process pool.
+
+    Returns:
+        The worker count :func:`map_tasks` would request, at least 1.
+    """
+    workers = min(_worker_count(jobs or get_budget(), tasks), get_budget())
+    usable = _probe()["memory_usable"]
+    if not jobs and processes and usable is not None:
+        workers = max(1, min(workers, usable // _PROCESS_WORKER_BYTES))
+    return workers
+
+
+@contextmanager
+def _reserve(requested: int) -> Iterator[int]:
+    """Claim up to ``requested`` workers from the budget, releasing them on exit.
+
+    Yields the number granted; 1 or fewer means the caller should run inline.
+    """
+    global _active
+    with _LOCK:
+        granted = 1 if _in_worker else min(requested, get_budget() - _active)
+        if granted > 1:
+            _active += granted
+    try:
+        yield granted
+    finally:
+        if granted > 1:
+            with _LOCK:
+                _active -= granted
+
+
+def _windowed(
+    pool: ThreadPoolExecutor | ProcessPoolExecutor,
+    func: Callable[..., Any],
+    tasks: list[tuple[Any, ...]],
+    workers: int,
+) -> Iterator[Any]:
+    """Yield results in order with at most ``workers`` tasks in flight."""
+    running: dict[Future[Any], int] = {}
+    finished: dict[int, Future[Any]] = {}
+    submitted = emitted = 0
+    try:
+        while emitted < len(tasks):
+            while len(running) < workers and submitted < len(tasks):
+                running[pool.submit(func, *tasks[submitted])] = submitted
+                submitted += 1
+            if emitted not in finished:
+                done, _ = _wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished[running.pop(future)] = future
+            while emitted in finished:
+                yield finished.pop(emitted).result()
+                emitted += 1
+    finally:
+        for future in running:
+            future.cancel()
+
+
+def map_tasks(
+    func: Callable[..., Any],
+    *iterables: Iterable[Any],
+    jobs: int | None = None,
+    processes: bool = False,
+    start_method: str | None = None,
+) -> Iterator[Any]:
+    """Map ``func`` over ``iterables`` on a shared pool within the budget, in order.
+
+    Workers are claimed from the budget for as long as the iterator is open.
+    When the budget is used up, for example by the caller's own pool, the
+    work runs inline in the calling thread instead of oversubscribing cores.
+
+    Args:
+        func: Callable applied to one item from each iterable. It must be
+            picklable when ``processes`` is true.
+        *iterables: Argument iterables, consumed up front.
+        jobs: Maximum workers. ``None`` uses the whole budget, capped so each
+            process has about 256 MB of usable memory. Always capped by the
+            budget and the number of tasks.
+        processes: Use the shared process pool instead of the thread pool.
+        start_method: Process start method; see :func:`process_pool`.
+
+    Yields:
+        ``func`` results in input order. The first exception raised by a task
+        is re-raised when its result is reached.
+
+    Raises:
+        ValueError: If the iterables differ in length or ``start_method`` is
+            unsupported on this platform.
+
+    Examples:
+        >>> list(map_tasks(pow, [2, 3], [2, 2], jobs=2))
+        [4, 9]
+    """
+    if processes:
+        _check_start_method(start_method)
+    columns = [list(iterable) for iterable in iterables]
+    if len({len(column) for column in columns}) > 1:
+        lengths = ", ".join(str(len(column)) for column in columns)
+        raise ValueError(f"map_tasks iterables must have the same length, got {lengths}.")
+    tasks = list(zip(*columns, strict=True))
+    return _run(func, tasks, plan_workers(jobs, len(tasks), processes), processes, start_method)
+
+
+def _run(
+    func: Callable[..., Any],
+    tasks: list[tuple[Any, ...]],
+    requested: int,
+    processes: bool,
+    start_method: str | None,
+) -> Iterator[Any]:
+    with _reserve(requested) as workers:
+        if workers <= 1:
+            for task in tasks:
+                yield func(*task)
+            return
+        pool = process_pool(start_method) if processes else thread_pool()
+        yield from _windowed(pool, func, tasks, workers)
@@ -0,0 +1,246 @@
+"""Cached runtime capability profile used to size parallel and chunked work."""
+
+from __future__ import annotations
+
+import copy as _copy
+import math as _math
+import os as _os
+from functools import cache as _cache
+from pathlib import Path
+from typing import Any
+
+from .env import is_google_colab, is_notebook
+
+_CGROUP_ROOT = Path("/sys/fs/cgroup")
+_PROC_CGROUP = Path("/proc/self/cgroup")
+_PROC_MEMINFO = Path("/proc/meminfo")
+# cgroup v1 reports "no limit" as a page-rounded 2**63 - 1.
+_UNLIMITED = 1 << 60
+_THREAD_VARIABLES = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+# Smallest chunk worth splitting work into, whatever the memory budget.
+_MIN_CHUNK = 1 << 10
+# Rough footprint of a worker process with NumPy and Matplotlib loaded.
+_PROCESS_WORKER_BYTES = 256 << 20
+
+
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def _cgroup_dirs(v1_controller: str) -> list[Path]:
+    """Return this process's cgroup directories, innermost first.
+
+    Both the unified (v2) hierarchy and the named v1 controller are listed.
+    Parent directories are included because an enclosing group's limit also
+    applies, and paths missing from a container's view are skipped.
+    """
+    text = _read(_PROC_CGROUP)
+    if text is None:
+        return []
+    dirs: list[Path] = []
+    for line in text.splitlines():
+        _, controllers, relative = line.split(":", 2)
+        if controllers == "":
+            base = _CGROUP_ROOT
+        elif v1_controller in controllers.split(","):
+            base = _CGROUP_ROOT / controllers
+            if not base.is_dir():
+                base = _CGROUP_ROOT / v1_controller
+        else:
+            continue
+        current = base / relative.lstrip("/")
+        while True:
+            if current.is_dir() and current not in dirs:
+                dirs.append(current)
+            if current == base:
+                break
+            current = current.parent
+    return dirs
+
+
+def _cgroup_memory() -> tuple[int | None, int | None]:
+    """Return the tightest cgroup memory limit and the headroom left under it."""
+    limit = headroom = None
+    for directory in _cgroup_dirs("memory"):
+        for limit_file, usage_file in (
+            ("memory.max", "memory.current"),
+            ("memory.limit_in_bytes", "memory.usage_in_bytes"),
+        ):
+            value = _read(directory / limit_file)
+            if value is None or not value.isdigit() or int(value) >= _UNLIMITED:
+                continue
+            usage = _read(directory / usage_file)
+            left = int(value) - int(usage) if usage and usage.isdigit() else int(value)
+            limit = int(value) if limit is None else min(limit, int(value))
+            headroom = max(left, 0) if headroom is None else min(headroom, max(left, 0))
+    return limit, headroom
+
+
+def _cgroup_cpu_quota() -> float | None:
+    """Return the tightest cgroup CPU quota in CPUs, or ``None`` when unlimited."""
+    quota: float | None = None
+    for directory in _cgroup_dirs("cpu"):
+        value = _read(directory / "cpu.max")
+        if value is not None:
+            limit, _, period = value.partition(" ")
+            if limit == "max" or not period:
+                continue
+            cpus = int(limit) / int(period)
+        else:
+            limit = _read(directory / "cpu.cfs_quota_us") or "-1"
+            period = _read(directory / "cpu.cfs_period_us") or "0"
+            if limit.startswith("-") or not period.isdigit() or int(period) == 0:
+                continue
+            cpus = int(limit) / int(period)
+        quota = cpus if quota is None else min(quota, cpus)
+    return quota
+
+
+def _meminfo() -> dict[str, int]:
+    text = _read(_PROC_MEMINFO) or ""
+    info = {}
+    for line in text.splitlines():
+        name, _, value = line.partition(":")
+        fields = value.split()
+        if fields and fields[0].isdigit():
+            info[name] = int(fields[0]) * 1024
+    return info
+
+
+def _physical_memory() -> int | None:
+    try:
+        return _os.sysconf("SC_PHYS_PAGES") * _os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _blas_name() -> str | None:
+    try:
+        import numpy as _np
+
+        return _np.__config__.CONFIG["Build Dependencies"]["blas"]["name"]
+    except (ImportError, AttributeError, KeyError, TypeError):
+        return None
+
+
+def _matplotlib_backend() -> str | None:
+    """Return the selected backend without forcing Matplotlib to pick one."""
+    import matplotlib as _mpl
+
+    try:
+        return _mpl.get_backend(auto_select=False)
+    except TypeError:  # Matplotlib < 3.10 has no auto_select.
+        return _mpl.get_backend()
+
+
+@_cache
+def _probe() -> dict[str, Any]:
+    cpu_count = _os.cpu_count() or 1
+    try:
+        affinity = len(_os.sched_getaffinity(0))
+    except AttributeError:
+        affinity = cpu_count
+    quota = _cgroup_cpu_quota()
+    cpus = affinity if quota is None else max(1, min(affinity, _math.floor(quota)))
+
+    meminfo = _meminfo()
+    total = meminfo.get("MemTotal", _physical_memory())
+    available = meminfo.get("MemAvailable")
+    limit, headroom = _cgroup_memory()
+    known = [value for value in (available, headroom) if value is not None]
+    usable = min(known) if known else (limit if limit is not None else total)
+
+    return {
+        "cpu_count": cpu_count,
+        "cpu_affinity": affinity,
+        "cpu_quota": quota,
+        "cpus": cpus,
+        "memory_total": total,
+        "memory_available": available,
+        "memory_limit": limit,
+        "memory_usable": usable,
+        "blas": _blas_name(),
+        "thread_limits": {
+            name: _os.environ[name] for name in _THREAD_VARIABLES if name in _os.environ
+        },
+        "notebook": is_notebook(),
+        "colab": is_google_colab(),
+    }
+
+
+def profile(refresh: bool = False) -> dict[str, Any]:
+    """Describe the CPU, memory, and threading resources available to this process.
+
+    The probe reads ``/proc`` and cgroup (v1 and v2) files once and is cached;
+    pass ``refresh=True`` to probe again, for example after memory use has
+    changed a lot. Off Linux, values that cannot be read are ``None``.
+
+    Args:
+        refresh: Discard the cached probe first.
+
+    Returns:
+        A dict with ``cpu_count`` (logical CPUs), ``cpu_affinity`` (CPUs this
+        process may run on), ``cpu_quota`` (cgroup CPU limit, possibly
+        fractional, or ``None``), ``cpus`` (usable whole CPUs, the default
+        worker count), ``memory_total``, ``memory_available``,
+        ``memory_limit`` (cgroup limit or ``None``), ``memory_usable``
+        (bytes that can be allocated before hitting RAM or the cgroup
+        limit), ``blas`` (NumPy's BLAS library), ``thread_limits`` (BLAS and
+        OpenMP thread variables that are set), ``notebook``, ``colab``, and
+        ``matplotlib_backend`` (``None`` until a backend has been selected;
+        always read live).
+
+    Examples:
+        >>> profile()["cpus"] >= 1
+        True
+    """
+    if refresh:
+        _probe.cache_clear()
+    result = _copy.deepcopy(_probe())
+    result["matplotlib_backend"] = _matplotlib_backend()
+    return result
+
+
+def _worker_count(jobs: int | None, tasks: int | None = None, worker_bytes: int = 0) -> int:
+    """Resolve a ``jobs`` argument to a worker count.
+
+    ``None`` (or ``0``) means one worker per usable CPU, further capped so that
+    ``worker_bytes`` per worker fits in usable memory. Explicit counts are
+    honoured. Either way there are never more workers than ``tasks``.
+    """
+    if jobs:
+        workers = jobs
+    else:
+        resources = _probe()
+        workers = resources["cpus"]
+        if worker_bytes and resources["memory_usable"] is not None:
+            workers = max(1, min(workers, resources["memory_usable"] // worker_bytes))
+    if tasks is not None:
+        workers = min(workers, max(tasks, 1))
+    return workers
+
+
+def chunk_length(item_bytes: int, default: int, budget: float = 1 / 16) -> int:
+    """Cap ``default`` items per chunk so one chunk uses at most ``budget`` of usable memory.
+
+    Args:
+        item_bytes: Memory one item needs while a chunk is processed.
+        default: Preferred chunk length.
+        budget: Largest fraction of usable memory one chunk may take.
+
+    Returns:
+        ``default``, or a smaller length (at least 1,024) when memory is tight.
+    """
+    usable = _probe()["memory_usable"]
+    if usable is None:
+        return default
+    return max(_MIN_CHUNK, min(default, int(usable * budget) // item_bytes))
@@ -0,0 +1,271 @@
+"""Opt-in tracing spans with wall time, CPU time, and memory peaks."""
+
+from __future__ import annotations
+
+import atexit as _atexit
+import json as _json
+import os as _os
+import sys as _sys
+import threading as _threading
+import tracemalloc as _tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from functools import wraps as _wraps
+from os import PathLike
+from pathlib import Path
+from time import perf_counter_ns as _perf_counter_ns
+from time import thread_time_ns as _thread_time_ns
+from typing import Any, ParamSpec, TypeVar
+
+_ENV_VAR = "DRCUTILS_TRACE"
+_ENV_MEMORY = "DRCUTILS_TRACE_MEMORY"
+# Set by the process that owns an environment-driven trace, so worker
+# processes that inherit DRCUTILS_TRACE do not record or overwrite it.
+_ENV_OWNER = "_DRCUTILS_TRACE_OWNER"
+_NULL = nullcontext()
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+
+class _Recorder:
+    """Collects Chrome trace events for the spans closed while it is active."""
+
+    def __init__(self, memory: bool) -> None:
+        """Start the clock, and tracemalloc when ``memory`` is set and it is off."""
+        self.events: list[dict[str, Any]] = []
+        self.threads: dict[int, str] = {}
+        self.memory = memory
+        self.owns_tracemalloc = memory and not _tracemalloc.is_tracing()
+        if self.owns_tracemalloc:
+            _tracemalloc.start()
+        self.origin = _perf_counter_ns()
+        self.pid = _os.getpid()
+        self.local = _threading.local()
+
+    def close(self) -> None:
+        if self.owns_tracemalloc:
+            _tracemalloc.stop()
+
+    @contextmanager
+    def span(self, name: str, args: dict[str, Any]) -> Iterator[None]:
+        # Each open span keeps [start bytes, highest peak seen]; tracemalloc's
+        # peak is reset on entry and folded back into the parent on exit.
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        if self.memory:
+            current, peak = _tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            _tracemalloc.reset_peak()
+            stack.append([current, current])
+        cpu = _thread_time_ns()
+        start = _perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = _perf_counter_ns()
+            cpu = _thread_time_ns() - cpu
+            event_args = {"cpu_ms": cpu / 1e6, **args}
+            if self.memory:
+                base, highest = stack.pop()
+                highest = max(highest, _tracemalloc.get_traced_memory()[1])
+                if stack:
+                    stack[-1][1] = max(stack[-1][1], highest)
+                event_args["peak_bytes"] = highest - base
+            thread = _threading.current_thread()
+            self.threads.setdefault(thread.ident or 0, thread.name)
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": name.partition(".")[0],
+                    "ph": "X",
+                    "ts": (start - self.origin) / 1e3,
+                    "dur": (end - start) / 1e3,
+                    "pid": self.pid,
+                    "tid": thread.ident or 0,
+                    "args": event_args,
+                }
+            )
+
+
+_recorder: _Recorder | None = None
+
+
+def span(name: str, **args: Any) -> AbstractContextManager[None]:
+    """Time a block as one span while :func:`tracing` is active.
+
+    Outside :func:`tracing` this returns a shared no-op context manager, so
+    instrumented code costs one global lookup.
+
+    Args:
+        name: Span name. The part before the first ``.`` is its category.
+        **args: JSON-serializable values shown with the span in trace viewers.
+
+    Returns:
+        A context manager that records the span on exit.
+
+    Examples:
+        >>> with tracing() as events, span("load", rows=3):
+        ...     pass
+        >>> events[0]["name"], events[0]["args"]["rows"]
+        ('load', 3)
+    """
+    recorder = _recorder
+    if recorder is None:
+        return _NULL
+    return recorder.span(name, args)
+
+
+def traced(name: str) -> Callable[[Callable[_P, _R]], Callable[_P, _R]]:
+    """Decorate a function so each call is recorded as a span named ``name``."""
+
+    def decorate(func: Callable[_P, _R]) -> Callable[_P, _R]:
+        @_wraps(func)
+        def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+            recorder = _recorder
+            if recorder is None:
+                return func(*args, **kwargs)
+            with recorder.span(name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+@contextmanager
+def tracing(
+    path: str | bytes | PathLike | None = None, *, memory: bool = False
+) -> Iterator[list[dict[str, Any]]]:
+    """Record spans from drcutils stages and :func:`span` blocks.
+
+    Instrumented stages include image decode, logo resize, compositing, and
+    encode in ``watermark`` and ``flag``; read and write in ``convert``; load,
+    weld, and figure building in ``visualize_stl``; and layout, audit, and
+    each save in ``export_figure``. Work done in process-pool workers is
+    recorded as one span in the parent.
+
+    Setting the ``DRCUTILS_TRACE`` environment variable to a file path traces
+    a whole run. The Chrome trace is written there at exit and a summary is
+    printed to stderr; ``DRCUTILS_TRACE_MEMORY=1`` adds memory peaks.
+
+    Args:
+        path: Optional file for the Chrome trace, written on exit. Open it in
+            ``chrome://tracing`` or https://ui.perfetto.dev.
+        memory: Also record each span's peak memory growth with
+            ``tracemalloc``. Python and NumPy allocations are counted;
+            Pillow image buffers are not. This slows allocation-heavy Python
+            code, and overlapping spans in other threads share one peak
+            counter.
+
+    Yields:
+        The list of recorded events, filled as spans close. Each is a Chrome
+        trace complete event whose ``args`` hold ``cpu_ms`` (CPU time of the
+        recording thread) and, with ``memory``, ``peak_bytes``.
+
+    Examples:
+        >>> with tracing() as events:
+        ...     with span("stage"):
+        ...         pass
+        >>> [event["name"] for event in events]
+        ['stage']
+    """
+    global _recorder
+    outer = _recorder
+    recorder = _Recorder(memory)
+    _recorder = recorder
+    try:
+        yield recorder.events
+    finally:
+        _recorder = outer
+        recorder.close()
+        if outer is not None:
+            outer.events.extend(recorder.events)
+            outer.threads.update(recorder.threads)
+        if path is not None:
+            write_chrome_trace(recorder.events, path, recorder.threads)
+
+
+def write_chrome_trace(
+    events: list[dict[str, Any]],
+    path: str | bytes | PathLike,
+    thread_names: dict[int, str] | None = None,
+) -> Path:
+    """Write events as Chrome trace JSON.
+
+    Args:
+        events: Events from :func:`tracing`.
+        path: Output file path.
+        thread_names: Optional thread id to name mapping shown in viewers.
+
+    Returns:
+        The written path.
+    """
+    out_path = Path(_os.fsdecode(path))
+    metadata = [
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+        for pid in sorted({event["pid"] for event in events})
+        for tid, name in (thread_names or {}).items()
+    ]
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(
+        _json.dumps({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, default=str),
+        "utf-8",
+    )
+    return out_path
+
+
+def summary(events: list[dict[str, Any]]) -> str:
+    """Return a table of calls, wall time, CPU time, and peak memory per span name.
+
+    Rows are sorted by total wall time. Nested spans are counted in their
+    parents too, so the totals do not add up to the run time.
+
+    Args:
+        events: Events from :func:`tracing`.
+
+    Returns:
+        A fixed-width text table.
+    """
+    totals: dict[str, list[float]] = {}
+    peaks: dict[str, int] = {}
+    for event in events:
+        row = totals.setdefault(event["name"], [0, 0.0, 0.0])
+        row[0] += 1
+        row[1] += event["dur"] / 1e3
+        row[2] += event["args"]["cpu_ms"]
+        if "peak_bytes" in event["args"]:
+            peaks[event["name"]] = max(peaks.get(event["name"], 0), event["args"]["peak_bytes"])
+    width = max([len("span"), *map(len, totals)])
+    lines = [
+        f"{'span':<{width}}  {'calls':>6}  {'wall ms':>10}  {'mean ms':>9}  "
+        f"{'cpu ms':>10}  {'peak MB':>8}"
+    ]
+    for name, (calls, wall, cpu) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        peak = f"{peaks[name] / 2**20:8.1f}" if name in peaks else f"{'-':>8}"
+        lines.append(
+            f"{name:<{width}}  {int(calls):>6}  {wall:>10.1f}  {wall / calls:>9.2f}  "
+            f"{cpu:>10.1f}  {peak}"
+        )
+    return "\n".join(lines)
+
+
+def _trace_from_environment() -> None:
+    """Trace the whole run when ``DRCUTILS_TRACE`` names an output file."""
+    global _recorder
+    path = _os.environ.get(_ENV_VAR)
+    if not path or _os.environ.get(_ENV_OWNER, str(_os.getpid())) != str(_os.getpid()):
+        return
+    _os.environ[_ENV_OWNER] = str(_os.getpid())
+    recorder = _recorder = _Recorder(_os.environ.get(_ENV_MEMORY, "") not in ("", "0"))
+
+    def finish() -> None:
+        write_chrome_trace(recorder.events, path, recorder.threads)
+        print(summary(recorder.events), file=_sys.stderr)
+
+    _atexit.register(finish)
+
+
+_trace_from_environment()
@@ -1,7 +1,18 @@
 """Visualization utilities for publication-grade figures."""
 
-from .cad import visualize_stl
+from .animation import export_animation
+from .cad import visualize_assembly, visualize_stl
+from .density import density_grid, density_plot
 from .ml import visualize_network
 from .paper_figures import export_figure, get_figure_preset
 
-__all__ = ["export_figure", "get_figure_preset", "visualize_network", "visualize_stl"]
+__all__ = [
+    "density_grid",
+    "density_plot",
+    "export_animation",
+    "export_figure",
+    "get_figure_preset",
+    "visualize_assembly",
+    "visualize_network",
+    "visualize_stl",
+]
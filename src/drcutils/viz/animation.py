@@ -0,0 +1,361 @@
+"""Streaming colormapped animations from stacks of 2D simulation frames."""
+
+from __future__ import annotations
+
+import io as _io
+import struct as _struct
+import zlib as _zlib
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import chain
+from os import PathLike
+from pathlib import Path
+from typing import IO, Any
+
+import numpy as _np
+from matplotlib.colors import Colormap
+from PIL import GifImagePlugin as _GifImagePlugin
+from PIL import Image as _Image
+
+from .._logo import parse_watermark_box as _parse_watermark_box
+from .._logo import resize_logo as _resize_logo
+from .._lut import byte_lut as _byte_lut
+from .._lut import map_through_lut as _map_through_lut
+from ..brand import COLORS, get_logo_path
+from ..brand.colormaps import resolve_colormap as _resolve_colormap
+
+_FORMATS = {".apng": "apng", ".gif": "gif", ".png": "apng", ".webp": "webp"}
+# Brand colors reserved in GIF palettes so a stamped logo keeps its colors.
+_LOGO_COLORS = _np.array(
+    [[int(color[idx : idx + 2], 16) for idx in (1, 3, 5)] for color in (*COLORS, "#FFFFFF")],
+    dtype=_np.uint8,
+)
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+type _Overlay = tuple[tuple[slice, slice], _np.ndarray, _np.ndarray]
+
+
+def _iter_frames(frames: Any) -> Iterator[_np.ndarray]:
+    if isinstance(frames, _np.ndarray):
+        if frames.ndim != 3:
+            raise ValueError("Frame arrays must have shape (T, H, W).")
+        # Index lazily so memory-mapped stacks are read one frame at a time.
+        return (frames[idx] for idx in range(len(frames)))
+    return iter(frames)
+
+
+def _stack_limits(frames: _np.ndarray) -> tuple[float, float]:
+    """Return the finite data range of a frame stack, reading one frame at a time."""
+    lo, hi = _np.inf, -_np.inf
+    for frame in _iter_frames(frames):
+        finite = _np.ma.masked_invalid(frame)
+        if finite.count():
+            lo = min(lo, float(finite.min()))
+            hi = max(hi, float(finite.max()))
+    if lo > hi:
+        raise ValueError("No finite values to set the color limits from.")
+    return lo, hi
+
+
+def _logo_overlay(
+    size: tuple[int, int],
+    box: Sequence[float | None] | None,
+    logo_layout: str,
+    logo_variant: str,
+    on_black: bool,
+) -> _Overlay | None:
+    """Resize and place the logo once; return its frame slices, alpha, and premultiplied RGB."""
+    x, y, width_ratio, height_ratio = _parse_watermark_box(box)
+    with _Image.open(get_logo_path(logo_layout, logo_variant, on_black=on_black)) as source:
+        logo = _resize_logo(size, source.convert("RGBA"), width_ratio, height_ratio)
+    width, height = size
+    x0, y0 = int(round(width * x)), int(round(height * y))
+    x1, y1 = min(width, x0 + logo.size[0]), min(height, y0 + logo.size[1])
+    if x1 <= x0 or y1 <= y0:
+        return None
+    pixels = _np.asarray(logo, dtype=_np.float32)[: y1 - y0, : x1 - x0] / 255.0
+    alpha = pixels[..., 3:]
+    return (slice(y0, y1), slice(x0, x1)), alpha, pixels[..., :3] * alpha * 255.0
+
+
+def _blend(region: _np.ndarray, overlay: _Overlay) -> _np.ndarray:
+    _, alpha, premultiplied = overlay
+    blended = region * (1.0 - alpha) + premultiplied
+    return _np.rint(blended).astype(_np.uint8)
+
+
+def _gif_palette(colormap: Colormap, reserved: _np.ndarray) -> tuple[_np.ndarray, _np.ndarray]:
+    """Return a <=256 color GIF palette and the matching palette-index LUT."""
+    colors, index = _np.unique(_byte_lut(colormap)[:, :3], axis=0, return_inverse=True)
+    if len(colors) + len(reserved) > 256:
+        resampled = colormap.resampled(256 - len(reserved) - 3)
+        colors, index = _np.unique(_byte_lut(resampled)[:, :3], axis=0, return_inverse=True)
+    palette = _np.concatenate([colors, reserved]).astype(_np.uint8)
+    return palette, index.astype(_np.uint8).reshape(-1, 1)
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return _struct.pack(">I", len(data)) + tag + data + _struct.pack(">I", _zlib.crc32(tag + data))
+
+
+def _riff_chunk(tag: bytes, data: bytes) -> bytes:
+    return tag + _struct.pack("<I", len(data)) + data + b"\0" * (len(data) & 1)
+
+
+def _u24(value: int) -> bytes:
+    return value.to_bytes(3, "little")
+
+
+class _GifWriter:
+    """Write GIF frames as they arrive against one global palette."""
+
+    def __init__(
+        self, fp: IO[bytes], size: tuple[int, int], palette: _np.ndarray, duration: int, loop: int
+    ) -> None:
+        self._fp = fp
+        self._duration = duration
+        bits = max(1, int(_np.ceil(_np.log2(len(palette)))))
+        table = _np.zeros((1 << bits, 3), dtype=_np.uint8)
+        table[: len(palette)] = palette
+        fp.write(b"GIF89a" + _struct.pack("<HHBBB", *size, 0xF0 | (bits - 1), 0, 0))
+        fp.write(table.tobytes())
+        fp.write(b"!\xff\x0bNETSCAPE2.0\x03\x01" + _struct.pack("<H", loop) + b"\0")
+
+    def write(self, indices: _np.ndarray) -> None:
+        frame = _Image.fromarray(indices, mode="P")
+        chunks = _GifImagePlugin.getdata(frame, duration=self._duration, interlace=False)
+        self._fp.writelines(chunks)
+        # The list lives on a per-call class that only the cyclic GC frees; empty it now.
+        chunks.clear()
+
+    def close(self) -> None:
+        self._fp.write(b";")
+
+
+class _ApngWriter:
+    """Write APNG frames as they arrive; the frame count is patched in on close."""
+
+    def __init__(self, fp: IO[bytes], size: tuple[int, int], duration: int, loop: int) -> None:
+        self._fp = fp
+        self._size = size
+        self._duration = duration
+        self._loop = loop
+        self._frames = 0
+        self._sequence = 0
+        width, height = size
+        # Every row uses the PNG "Up" filter, which suits smooth fields.
+        self._filtered = _np.empty((height, 1 + 3 * width), dtype=_np.uint8)
+        self._filtered[:, 0] = 2
+        fp.write(
+            _PNG_SIGNATURE + _png_chunk(b"IHDR", _struct.pack(">IIBBBBB", *size, 8, 2, 0, 0, 0))
+        )
+        self._actl_offset = fp.tell()
+        fp.write(_png_chunk(b"acTL", _struct.pack(">II", 0, loop)))
+
+    def write(self, rgb: _np.ndarray) -> None:
+        rows = rgb.reshape(len(rgb), -1)
+        self._filtered[0, 1:] = rows[0]
+        _np.subtract(rows[1:], rows[:-1], out=self._filtered[1:, 1:])
+        data = _zlib.compress(self._filtered.tobytes())
+        self._fp.write(
+            _png_chunk(
+                b"fcTL",
+                _struct.pack(
+                    ">IIIIIHHBB", self._sequence, *self._size, 0, 0, self._duration, 1000, 0, 0
+                ),
+            )
+        )
+        self._sequence += 1
+        if self._frames == 0:
+            self._fp.write(_png_chunk(b"IDAT", data))
+        else:
+            self._fp.write(_png_chunk(b"fdAT", _struct.pack(">I", self._sequence) + data))
+            self._sequence += 1
+        self._frames += 1
+
+    def close(self) -> None:
+        self._fp.write(_png_chunk(b"IEND", b""))
+        self._fp.seek(self._actl_offset)
+        self._fp.write(_png_chunk(b"acTL", _struct.pack(">II", self._frames, self._loop)))
+        self._fp.seek(0, _io.SEEK_END)
+
+
+class _WebpWriter:
+    """Wrap Pillow's single-frame WebP encoder output into animation frames as they arrive."""
+
+    def __init__(
+        self, fp: IO[bytes], size: tuple[int, int], duration: int, loop: int, quality: int
+    ) -> None:
+        self._fp = fp
+        self._size = size
+        self._duration = duration
+        self._quality = quality
+        width, height = size
+        fp.write(b"RIFF\0\0\0\0WEBP")
+        fp.write(_riff_chunk(b"VP8X", b"\x02\0\0\0" + _u24(width - 1) + _u24(height - 1)))
+        fp.write(_riff_chunk(b"ANIM", _struct.pack("<IH", 0, loop)))
+
+    def write(self, rgb: _np.ndarray) -> None:
+        buffer = _io.BytesIO()
+        _Image.fromarray(rgb).save(buffer, "WEBP", quality=self._quality)
+        encoded = buffer.getvalue()
+        bitstream = b""
+        offset = 12
+        while offset < len(encoded):
+            tag = encoded[offset : offset + 4]
+            (length,) = _struct.unpack("<I", encoded[offset + 4 : offset + 8])
+            if tag in (b"ALPH", b"VP8 ", b"VP8L"):
+                bitstream += _riff_chunk(tag, encoded[offset + 8 : offset + 8 + length])
+            offset += 8 + length + (length & 1)
+        width, height = self._size
+        header = _u24(0) + _u24(0) + _u24(width - 1) + _u24(height - 1) + _u24(self._duration)
+        # Flags: replace the canvas rather than alpha-blending over the previous frame.
+        self._fp.write(_riff_chunk(b"ANMF", header + b"\x02" + bitstream))
+
+    def close(self) -> None:
+        end = self._fp.tell()
+        self._fp.seek(4)
+        self._fp.write(_struct.pack("<I", end - 8))
+        self._fp.seek(end)
+
+
+def export_animation(
+    frames: _np.ndarray | Iterable[Any],
+    path: str | PathLike,
+    *,
+    cmap: str | Colormap = "drc_diverging",
+    vmin: float | None = None,
+    vmax: float | None = None,
+    fps: float = 20.0,
+    loop: int = 0,
+    quality: int = 90,
+    jobs: int | None = None,
+    watermark: bool = False,
+    watermark_box: Sequence[float | None] | None = None,
+    logo_layout: str = "stacked",
+    logo_variant: str = "full",
+    on_black: bool = False,
+) -> dict[str, Any]:
+    """Stream 2D scalar frames through a colormap into an animated GIF, APNG, or WebP.
+
+    Each frame is mapped through one precomputed lookup table into a reused
+    output buffer and written to the file before the next frame is read, so
+    only one frame is held in memory. A ``(T, H, W)`` array, including a
+    ``numpy.memmap``, is read one frame at a time.
+
+    GIF frames store colormap palette indices directly, so colors are exact for
+    colormaps of up to 256 entries (larger colormaps are resampled to fit).
+    APNG output is lossless RGB; WebP output is lossy at ``quality``.
+
+    Args:
+        frames: A ``(T, H, W)`` array or an iterable of equally shaped 2D
+            arrays; masked values and NaN use the colormap's bad color.
+        path: Output path; the suffix selects the format (``.gif``, ``.png``
+            or ``.apng``, ``.webp``).
+        cmap: Brand colormap name, registered Matplotlib colormap name, or a
+            colormap instance.
+        vmin: Value mapped to the first color. Defaults to the stack minimum.
+        vmax: Value mapped to the last color. Defaults to the stack maximum.
+        fps: Frames per second.
+        loop: Number of loops; ``0`` repeats forever.
+        quality: WebP quality from 0 to 100.
+        jobs: Threads used to colormap each frame. ``None`` uses the shared
+            concurrency budget, one per usable core by default.
+        watermark: Whether to stamp the DRC logo on every frame.
+        watermark_box: Logo placement as in :func:`drcutils.brand.watermark`.
+        logo_layout: Logo layout for the watermark.
+        logo_variant: Logo color variant for the watermark.
+        on_black: Whether to use the logo variant designed for dark backgrounds.
+
+    Returns:
+        A dictionary with the output ``file``, ``format``, number of
+        ``frames``, frame ``width`` and ``height``, and output ``bytes``.
+
+    Raises:
+        ValueError: If the format, ``fps``, or colormap name is unsupported,
+            limits are missing for an iterator, there are no frames, or frame
+            shapes differ.
+    """
+    out_path = Path(path)
+    fmt = _FORMATS.get(out_path.suffix.lower())
+    if fmt is None:
+        raise ValueError(
+            f"Unsupported animation format '{out_path.suffix}'. "
+            f"Choose from: {', '.join(sorted(_FORMATS))}."
+        )
+    if fps <= 0:
+        raise ValueError("fps must be positive.")
+    if vmin is None or vmax is None:
+        if not isinstance(frames, _np.ndarray):
+            raise ValueError("vmin and vmax are required when frames come from an iterator.")
+        lo, hi = _stack_limits(frames)
+        vmin = lo if vmin is None else vmin
+        vmax = hi if vmax is None else vmax
+
+    iterator = _iter_frames(frames)
+    first = next(iterator, None)
+    if first is None:
+        raise ValueError("No frames to write.")
+    height, width = _np.shape(first)
+    size = (width, height)
+    colormap = _resolve_colormap(cmap)
+    overlay = (
+        _logo_overlay(size, watermark_box, logo_layout, logo_variant, on_black)
+        if watermark
+        else None
+    )
+    duration = max(1, round(1000 / fps))
+
+    if fmt == "gif":
+        reserved = _LOGO_COLORS if overlay is not None else _LOGO_COLORS[:0]
+        palette, lut = _gif_palette(colormap, reserved)
+        buffer = _np.empty((height, width), dtype=_np.uint8)
+    else:
+        lut = _byte_lut(colormap)
+        buffer = _np.empty((height, width, 3), dtype=_np.uint8)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with out_path.open("wb") as fp:
+        writer: _GifWriter | _ApngWriter | _WebpWriter
+        if fmt == "gif":
+            writer = _GifWriter(fp, size, palette, duration, loop)
+        elif fmt == "apng":
+            writer = _ApngWriter(fp, size, duration, loop)
+        else:
+            writer = _WebpWriter(fp, size, duration, loop, quality)
+
+        for frame in chain([first], iterator):
+            if _np.shape(frame) != (height, width):
+                raise ValueError(
+                    f"Frame {count} has shape {_np.shape(frame)}; expected {(height, width)}."
+                )
+            mask = _np.ma.getmask(frame)
+            _map_through_lut(
+                _np.asarray(_np.ma.getdata(frame)),
+                None if mask is _np.ma.nomask else _np.asarray(mask),
+                lut,
+                vmin,
+                vmax,
+                buffer.reshape(height, width, -1),
+                jobs=jobs,
+            )
+            if overlay is not None:
+                region = buffer[overlay[0]]
+                if fmt == "gif":
+                    blended = _blend(palette[region], overlay).astype(_np.int32)
+                    distance = ((blended[..., None, :] - palette.astype(_np.int32)) ** 2).sum(-1)
+                    region[...] = distance.argmin(axis=-1)
+                else:
+                    region[...] = _blend(region, overlay)
+            writer.write(buffer)
+            count += 1
+        writer.close()
+
+    return {
+        "file": str(out_path),
+        "format": fmt,
+        "frames": count,
+        "width": width,
+        "height": height,
+        "bytes": out_path.stat().st_size,
+    }
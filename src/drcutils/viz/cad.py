@@ -1,71 +1,947 @@
-"""CAD helpers for STL visualization."""
+"""CAD helpers for STL visualization, rendering, and batch analytics."""
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from os import PathLike
+from os import fsdecode as _fsdecode
+from os.path import splitext as _splitext
+from pathlib import Path
+from time import perf_counter as _perf_counter
+from typing import Any
 
 import numpy as _np
+import pandas as _pd
+from matplotlib.colors import Colormap
 from stl.mesh import Mesh as _Mesh
 
+from ..brand.colormaps import resolve_colormap as _resolve_colormap
+from ..runtime.executor import map_tasks as _map_tasks
+from ..runtime.trace import span as _span
+from ..runtime.trace import traced as _traced
 
-def visualize_stl(filepath: str | bytes | PathLike, color: str = "#ffffff"):
-    """Visualize an STL mesh as a Plotly figure.
+# DataFrame writers for mesh statistics tables, keyed by file extension.
+_TABLE_WRITERS = {
+    ".csv": "to_csv",
+    ".json": "to_json",
+    ".xml": "to_xml",
+    ".parquet": "to_parquet",
+    ".xlsx": "to_excel",
+    ".feather": "to_feather",
+    ".dta": "to_stata",
+    ".pkl": "to_pickle",
+}
 
-    Args:
-        filepath: Path to the STL file.
-        color: Hex color used for mesh shading.
 
-    Returns:
-        A Plotly figure containing a single ``Mesh3d`` trace.
+def _load_vectors(filepath: str | bytes | PathLike) -> _np.ndarray:
+    """Load STL triangles as a ``(n, 3, 3)`` float array."""
+    return _np.asarray(_Mesh.from_file(_fsdecode(filepath)).vectors, dtype=float)
 
-    Raises:
-        ImportError: If Plotly is not installed.
+
+def _index_vertices(vectors: _np.ndarray) -> tuple[_np.ndarray, _np.ndarray]:
+    """Weld identical corners into shared vertices and ``(n, 3)`` face indices."""
+    vertices, inverse = _np.unique(vectors.reshape(-1, 3), return_inverse=True, axis=0)
+    return vertices, inverse.reshape(-1, 3)
+
+
+def _index_dtype(n_vertices: int) -> type[_np.unsignedinteger]:
+    """Return the smallest unsigned dtype that can address ``n_vertices``."""
+    for dtype in (_np.uint8, _np.uint16, _np.uint32):
+        if n_vertices - 1 <= _np.iinfo(dtype).max:
+            return dtype
+    return _np.uint64
+
+
+def _compact_mesh_arrays(
+    vertices: _np.ndarray,
+    faces: _np.ndarray,
+    quantize_bits: int | None,
+    frame: tuple[_np.ndarray, float] | None = None,
+) -> tuple[_np.ndarray, _np.ndarray, dict[str, Any]]:
+    """Shrink vertex and index arrays for compact Plotly serialization.
+
+    Positions are snapped to a uniform ``2**quantize_bits`` grid spanning the
+    largest bounding-box extent so proportions survive ``aspectmode="data"``.
+    The grid origin and step are returned so real coordinates can be recovered
+    as ``offset + step * value``. Pass ``frame=(offset, extent)`` to share one
+    grid across several traces.
     """
+    faces = faces.astype(_index_dtype(len(vertices)))
+    if quantize_bits is None:
+        return vertices.astype(_np.float32), faces, {}
+    if not 1 <= quantize_bits <= 16:
+        raise ValueError("quantize_bits must be between 1 and 16.")
+
+    if frame is None:
+        offset = vertices.min(axis=0) if len(vertices) else _np.zeros(3)
+        extent = float((vertices - offset).max()) if len(vertices) else 0.0
+    else:
+        offset, extent = frame
+    levels = (1 << quantize_bits) - 1
+    step = extent / levels if extent > 0 else 1.0
+    dtype = _np.uint8 if quantize_bits <= 8 else _np.uint16
+    grid = _np.rint((vertices - offset) / step).astype(dtype)
+    return grid, faces, {"offset": _np.asarray(offset).tolist(), "step": step}
+
+
+def _plotly_graph_objects() -> Any:
     try:
-        from plotly.graph_objects import Figure as _Figure
-        from plotly.graph_objects import Layout as _Layout
-        from plotly.graph_objects import Mesh3d as _Mesh3d
+        import plotly.graph_objects as _go
     except ImportError as exc:
         raise ImportError(
             "Plotly is optional for CAD visualization. Install with `pip install drcutils[plotly]`."
         ) from exc
+    return _go
 
-    stl_mesh = _Mesh.from_file(filepath)
-    p, q, r = stl_mesh.vectors.shape
-    vertices, ixr = _np.unique(stl_mesh.vectors.reshape(p * q, r), return_inverse=True, axis=0)
-    i_idx = _np.take(ixr, [3 * k for k in range(p)])
-    j_idx = _np.take(ixr, [3 * k + 1 for k in range(p)])
-    k_idx = _np.take(ixr, [3 * k + 2 for k in range(p)])
-    x_vals, y_vals, z_vals = vertices.T
-    colorscale = [[0, color], [1, color]]
-
-    mesh_3d = _Mesh3d(
-        x=x_vals,
-        y=y_vals,
-        z=z_vals,
-        i=i_idx,
-        j=j_idx,
-        k=k_idx,
-        flatshading=True,
-        colorscale=colorscale,
-        intensity=z_vals,
-        showscale=False,
-    )
-    layout = _Layout(
+
+def _mesh_figure(
+    meshes: Sequence[tuple[_np.ndarray, _np.ndarray, str]],
+    compact: bool,
+    quantize_bits: int | None,
+):
+    """Build a Plotly figure with one flat-shaded ``Mesh3d`` trace per mesh."""
+    _go = _plotly_graph_objects()
+
+    frame: tuple[_np.ndarray, float] | None = None
+    if compact and len(meshes) > 1:
+        stacked = _np.concatenate([vertices for vertices, _, _ in meshes])
+        offset = stacked.min(axis=0)
+        frame = (offset, float((stacked - offset).max()))
+
+    traces = []
+    for vertices, faces, color in meshes:
+        meta: dict[str, Any] = {}
+        if compact:
+            vertices, faces, quantization = _compact_mesh_arrays(
+                vertices, faces, quantize_bits, frame
+            )
+            meta = {"quantization": quantization} if quantization else {}
+        i_idx, j_idx, k_idx = faces.T
+        x_vals, y_vals, z_vals = vertices.T
+        colorscale = [[0, color], [1, color]]
+
+        traces.append(
+            _go.Mesh3d(
+                x=x_vals,
+                y=y_vals,
+                z=z_vals,
+                i=i_idx,
+                j=j_idx,
+                k=k_idx,
+                flatshading=True,
+                colorscale=colorscale,
+                intensity=z_vals,
+                showscale=False,
+                meta=meta or None,
+            )
+        )
+    layout = _go.Layout(
         scene_xaxis_visible=False,
         scene_yaxis_visible=False,
         scene_zaxis_visible=False,
         scene_aspectmode="data",
     )
-    fig = _Figure(data=[mesh_3d], layout=layout)
-    fig.data[0].update(
-        lighting={
-            "ambient": 0.18,
-            "diffuse": 1.0,
-            "fresnel": 0.1,
-            "specular": 1.0,
-            "roughness": 0.1,
-            "facenormalsepsilon": 0,
-        }
-    )
+    fig = _go.Figure(data=traces, layout=layout)
+    for trace in fig.data:
+        trace.update(
+            lighting={
+                "ambient": 0.18,
+                "diffuse": 1.0,
+                "fresnel": 0.1,
+                "specular": 1.0,
+                "roughness": 0.1,
+                "facenormalsepsilon": 0,
+            }
+        )
     return fig
+
+
+@_traced("visualize_stl")
+def visualize_stl(
+    filepath: str | bytes | PathLike,
+    color: str = "#ffffff",
+    *,
+    compact: bool = False,
+    quantize_bits: int | None = 16,
+):
+    """Visualize an STL mesh as a Plotly figure.
+
+    Args:
+        filepath: Path to the STL file.
+        color: Hex color used for mesh shading.
+        compact: Whether to emit compact typed arrays. Face indices use the
+            smallest unsigned integer dtype and vertex positions are quantized
+            (or downcast to ``float32`` when ``quantize_bits`` is ``None``).
+            Plotly 6+ serializes these as base64 typed arrays.
+        quantize_bits: Grid resolution for compact vertex positions. The grid
+            origin and step are stored in the trace ``meta``.
+
+    Returns:
+        A Plotly figure containing a single ``Mesh3d`` trace.
+
+    Raises:
+        ImportError: If Plotly is not installed.
+        ValueError: If ``quantize_bits`` is outside ``1..16``.
+    """
+    _plotly_graph_objects()
+    with _span("visualize_stl.load"):
+        vectors = _load_vectors(filepath)
+    with _span("visualize_stl.weld", triangles=len(vectors)):
+        vertices, faces = _index_vertices(vectors)
+    with _span("visualize_stl.figure"):
+        return _mesh_figure([(vertices, faces, color)], compact, quantize_bits)
+
+
+def _as_transform(transform: Any) -> _np.ndarray:
+    """Coerce ``None``, a 3x3, 3x4, or 4x4 matrix into a 4x4 homogeneous transform."""
+    if transform is None:
+        return _np.eye(4)
+    matrix = _np.asarray(transform, dtype=float)
+    out = _np.eye(4)
+    if matrix.shape == (4, 4):
+        return matrix
+    if matrix.shape == (3, 4):
+        out[:3, :] = matrix
+        return out
+    if matrix.shape == (3, 3):
+        out[:3, :3] = matrix
+        return out
+    raise ValueError(f"Transforms must be 3x3, 3x4, or 4x4 matrices; received {matrix.shape}.")
+
+
+def visualize_assembly(
+    parts: Sequence[Any],
+    *,
+    default_color: str = "#ffffff",
+    compact: bool = False,
+    quantize_bits: int | None = 16,
+    return_report: bool = False,
+):
+    """Visualize an assembly of STL parts with shared geometry as a Plotly figure.
+
+    Each distinct file is parsed and welded once. All placements of a file are
+    transformed together with one batched matrix product, and parts are merged
+    into one ``Mesh3d`` trace per color.
+
+    Args:
+        parts: Entries of ``path``, ``(path, transform)``, or
+            ``(path, transform, color)``. Transforms are 3x3, 3x4, or 4x4
+            matrices applied to column vectors; ``None`` means identity.
+        default_color: Hex color for entries without an explicit color.
+        compact: Whether to emit compact typed arrays, as in
+            :func:`visualize_stl`. All traces share one quantization grid.
+        quantize_bits: Grid resolution for compact vertex positions.
+        return_report: Whether to also return a deduplication report.
+
+    Returns:
+        A Plotly figure, or ``(figure, report)`` when ``return_report`` is set.
+        The report lists ``parts``, ``unique_files``, ``traces``,
+        ``parsed_bytes`` (triangle data actually loaded), ``naive_bytes`` (what
+        loading every entry separately would cost), and ``saved_bytes``.
+
+    Raises:
+        ImportError: If Plotly is not installed.
+        ValueError: If an entry or transform is malformed.
+    """
+    _plotly_graph_objects()
+
+    placements: dict[str, list[tuple[_np.ndarray, str]]] = {}
+    for entry in parts:
+        items = (entry,) if isinstance(entry, (str, bytes, PathLike)) else tuple(entry)
+        if not 1 <= len(items) <= 3:
+            raise ValueError(
+                "Assembly entries must be path, (path, transform), or (path, transform, color)."
+            )
+        path = _fsdecode(items[0])
+        transform = _as_transform(items[1] if len(items) > 1 else None)
+        color = items[2] if len(items) > 2 and items[2] is not None else default_color
+        placements.setdefault(path, []).append((transform, color))
+
+    by_color: dict[str, tuple[list[_np.ndarray], list[_np.ndarray]]] = {}
+    vertex_counts: dict[str, int] = {}
+    parsed_bytes = 0
+    naive_bytes = 0
+    for path, instances in placements.items():
+        vectors = _load_vectors(path)
+        parsed_bytes += vectors.nbytes
+        naive_bytes += vectors.nbytes * len(instances)
+        vertices, faces = _index_vertices(vectors)
+
+        transforms = _np.stack([transform for transform, _ in instances])
+        placed = _np.einsum("kij,vj->kvi", transforms[:, :3, :3], vertices)
+        placed += transforms[:, None, :3, 3]
+
+        for idx, (_, color) in enumerate(instances):
+            all_vertices, all_faces = by_color.setdefault(color, ([], []))
+            all_faces.append(faces + vertex_counts.get(color, 0))
+            all_vertices.append(placed[idx])
+            vertex_counts[color] = vertex_counts.get(color, 0) + len(vertices)
+
+    meshes = [
+        (_np.concatenate(all_vertices), _np.concatenate(all_faces), color)
+        for color, (all_vertices, all_faces) in by_color.items()
+    ]
+    fig = _mesh_figure(meshes, compact, quantize_bits)
+    if not return_report:
+        return fig
+    report = {
+        "parts": sum(len(instances) for instances in placements.values()),
+        "unique_files": len(placements),
+        "traces": len(meshes),
+        "parsed_bytes": parsed_bytes,
+        "naive_bytes": naive_bytes,
+        "saved_bytes": naive_bytes - parsed_bytes,
+    }
+    return fig, report
+
+
+def export_stl_html(
+    filepath: str | bytes | PathLike,
+    output_filepath: str | bytes | PathLike,
+    *,
+    color: str = "#ffffff",
+    quantize_bits: int | None = 16,
+    include_plotlyjs: bool | str = True,
+    compare: bool = False,
+) -> dict[str, Any]:
+    """Write a self-contained HTML viewer for an STL file with compact mesh payloads.
+
+    Args:
+        filepath: Path to the STL file.
+        output_filepath: Destination HTML path.
+        color: Hex color used for mesh shading.
+        quantize_bits: Grid resolution for vertex positions, or ``None`` to keep
+            ``float32`` positions.
+        include_plotlyjs: Passed to ``plotly`` ``write_html``. ``True`` embeds
+            Plotly.js so the file works offline.
+        compare: Whether to also serialize the default (non-compact) figure and
+            report its payload size and encode time for comparison.
+
+    Returns:
+        A dictionary with the output ``path``, its size in ``bytes``, the figure
+        ``payload_bytes`` and ``encode_seconds``, and, when ``compare`` is set,
+        ``baseline_payload_bytes`` and ``baseline_encode_seconds``.
+    """
+    out_path = Path(_fsdecode(output_filepath))
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    fig = visualize_stl(filepath, color, compact=True, quantize_bits=quantize_bits)
+    start = _perf_counter()
+    payload = fig.to_json()
+    report: dict[str, Any] = {
+        "payload_bytes": len(payload.encode("utf-8")),
+        "encode_seconds": _perf_counter() - start,
+    }
+    fig.write_html(out_path, include_plotlyjs=include_plotlyjs, full_html=True)
+    report = {"path": out_path, "bytes": out_path.stat().st_size, **report}
+
+    if compare:
+        baseline = visualize_stl(filepath, color)
+        start = _perf_counter()
+        baseline_payload = baseline.to_json()
+        report["baseline_encode_seconds"] = _perf_counter() - start
+        report["baseline_payload_bytes"] = len(baseline_payload.encode("utf-8"))
+    return report
+
+
+def _view_basis(elev: float, azim: float) -> tuple[_np.ndarray, _np.ndarray, _np.ndarray]:
+    """Return right, up, and forward unit vectors for a camera orbit angle."""
+    el = _np.deg2rad(elev)
+    az = _np.deg2rad(azim)
+    forward = _np.array([_np.cos(el) * _np.cos(az), _np.cos(el) * _np.sin(az), _np.sin(el)])
+    right = _np.cross([0.0, 0.0, 1.0], forward)
+    if _np.linalg.norm(right) < 1e-9:
+        right = _np.array([0.0, 1.0, 0.0])
+    right /= _np.linalg.norm(right)
+    up = _np.cross(forward, right)
+    return right, up, forward
+
+
+def _render_thumbnail(
+    filepath: str | bytes | PathLike,
+    out_path: Path,
+    size: int,
+    cmap: Colormap,
+    elev: float,
+    azim: float,
+    background: str,
+) -> Path:
+    """Rasterize one STL file to a shaded PNG with the Agg backend."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import PolyCollection
+    from matplotlib.figure import Figure
+
+    vectors = _load_vectors(filepath)
+    right, up, forward = _view_basis(elev, azim)
+
+    normals = _np.cross(vectors[:, 1] - vectors[:, 0], vectors[:, 2] - vectors[:, 0])
+    lengths = _np.linalg.norm(normals, axis=1)
+    visible = (normals @ forward > 0) & (lengths > 0)
+    vectors = vectors[visible]
+    normals = normals[visible] / lengths[visible, None]
+
+    screen = _np.stack([vectors @ right, vectors @ up], axis=-1)
+    order = _np.argsort(vectors.mean(axis=1) @ forward, kind="stable")
+    light = forward + 0.5 * up + 0.3 * right
+    light /= _np.linalg.norm(light)
+    lambert = _np.clip(normals @ light, 0.0, 1.0)[order]
+
+    fig = Figure(figsize=(size / 100, size / 100), dpi=100)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes((0.0, 0.0, 1.0, 1.0))
+    ax.set_axis_off()
+    ax.set_aspect("equal")
+    if len(screen):
+        ax.add_collection(
+            PolyCollection(
+                list(screen[order]),
+                facecolors=cmap(0.15 + 0.7 * (1.0 - lambert)),
+                edgecolors="face",
+                linewidths=0.0,
+            )
+        )
+        lo = screen.reshape(-1, 2).min(axis=0)
+        hi = screen.reshape(-1, 2).max(axis=0)
+        pad = 0.05 * float((hi - lo).max() or 1.0)
+        ax.set_xlim(lo[0] - pad, hi[0] + pad)
+        ax.set_ylim(lo[1] - pad, hi[1] + pad)
+    fig.savefig(out_path, dpi=100, facecolor=background)
+    return out_path
+
+
+def _write_contact_sheet(
+    thumbnails: list[Path], out_path: Path, size: int, columns: int | None, background: str
+) -> Path:
+    from PIL import Image as _Image
+
+    columns = columns or max(1, int(_np.ceil(_np.sqrt(len(thumbnails)))))
+    rows = max(1, int(_np.ceil(len(thumbnails) / columns)))
+    sheet = _Image.new("RGB", (columns * size, rows * size), background)
+    for idx, thumb_path in enumerate(thumbnails):
+        with _Image.open(thumb_path) as thumb:
+            tile = thumb.convert("RGB").resize((size, size))
+        sheet.paste(tile, ((idx % columns) * size, (idx // columns) * size))
+    sheet.save(out_path)
+    return out_path
+
+
+def render_thumbnails(
+    paths: Sequence[str | bytes | PathLike],
+    out_dir: str | PathLike,
+    *,
+    size: int = 256,
+    jobs: int | None = 1,
+    cmap: str | Colormap = "drc_cool",
+    elev: float = 30.0,
+    azim: float = -60.0,
+    background: str = "white",
+    contact_sheet: bool = True,
+    columns: int | None = None,
+) -> dict[str, Any]:
+    """Render shaded PNG thumbnails for STL files without a display.
+
+    Triangles are projected orthographically, back faces are culled, and the
+    remainder are depth-sorted and drawn with the Agg backend. Face shading is
+    mapped through a DRC brand colormap.
+
+    Args:
+        paths: STL files to render.
+        out_dir: Directory that receives one ``<stem>.png`` per input. Repeated
+            stems get the first free ``<stem>_<n>.png`` name.
+        size: Thumbnail edge length in pixels.
+        jobs: Number of worker processes. ``None`` uses the shared
+            concurrency budget (one per usable core by default), within
+            available memory.
+        cmap: Brand colormap name, registered Matplotlib colormap name, or a
+            colormap instance.
+        elev: Camera elevation in degrees.
+        azim: Camera azimuth in degrees.
+        background: Background color for thumbnails and the contact sheet.
+        contact_sheet: Whether to also write a tiled ``contact_sheet.png``.
+        columns: Number of contact sheet columns. Defaults to a square grid.
+
+    Returns:
+        A dictionary with generated thumbnail ``files`` and the
+        ``contact_sheet`` path (or ``None``).
+
+    Raises:
+        ValueError: If ``size`` is not positive or ``cmap`` is unknown.
+    """
+    if size <= 0:
+        raise ValueError("size must be a positive integer.")
+    colormap = _resolve_colormap(cmap)
+    out_root = Path(out_dir)
+    out_root.mkdir(parents=True, exist_ok=True)
+
+    out_paths: list[Path] = []
+    seen: set[str] = set()
+    for path in paths:
+        stem = name = Path(_fsdecode(path)).stem
+        suffix = 0
+        while name in seen:
+            suffix += 1
+            name = f"{stem}_{suffix}"
+        seen.add(name)
+        out_paths.append(out_root / f"{name}.png")
+
+    count = len(out_paths)
+    files = list(
+        _map_tasks(
+            _render_thumbnail,
+            paths,
+            out_paths,
+            [size] * count,
+            [colormap] * count,
+            [elev] * count,
+            [azim] * count,
+            [background] * count,
+            jobs=jobs,
+            processes=True,
+        )
+    )
+
+    sheet_path = None
+    if contact_sheet and files:
+        sheet_path = _write_contact_sheet(
+            files, out_root / "contact_sheet.png", size, columns, background
+        )
+    return {"files": files, "contact_sheet": sheet_path}
+
+
+def _triangle_stats(vectors: _np.ndarray) -> dict[str, Any]:
+    """Compute geometric and topological statistics for a triangle array."""
+    v0, v1, v2 = vectors[:, 0], vectors[:, 1], vectors[:, 2]
+    cross = _np.cross(v1 - v0, v2 - v0)
+    areas = 0.5 * _np.linalg.norm(cross, axis=1)
+    signed = _np.einsum("ij,ij->i", v0, _np.cross(v1, v2)) / 6.0
+    signed_volume = float(signed.sum())
+
+    if abs(signed_volume) > 1e-12:
+        centroid = (signed[:, None] * (v0 + v1 + v2)).sum(axis=0) / (4.0 * signed_volume)
+    elif areas.sum() > 0:
+        centroid = (areas[:, None] * (v0 + v1 + v2)).sum(axis=0) / (3.0 * areas.sum())
+    else:
+        centroid = _np.full(3, _np.nan)
+
+    if len(vectors):
+        lo = vectors.reshape(-1, 3).min(axis=0)
+        hi = vectors.reshape(-1, 3).max(axis=0)
+        vertices, faces = _index_vertices(vectors)
+        edges = _np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        keys = edges[:, 0].astype(_np.int64) * len(vertices) + edges[:, 1]
+        _, counts = _np.unique(keys, return_counts=True)
+        n_vertices = len(vertices)
+    else:
+        lo = hi = _np.full(3, _np.nan)
+        counts = _np.empty(0, dtype=_np.int64)
+        n_vertices = 0
+
+    boundary_edges = int((counts == 1).sum())
+    non_manifold_edges = int((counts > 2).sum())
+    return {
+        "n_triangles": len(vectors),
+        "n_vertices": n_vertices,
+        "n_edges": len(counts),
+        "volume": abs(signed_volume),
+        "surface_area": float(areas.sum()),
+        "bbox_min_x": float(lo[0]),
+        "bbox_min_y": float(lo[1]),
+        "bbox_min_z": float(lo[2]),
+        "bbox_max_x": float(hi[0]),
+        "bbox_max_y": float(hi[1]),
+        "bbox_max_z": float(hi[2]),
+        "centroid_x": float(centroid[0]),
+        "centroid_y": float(centroid[1]),
+        "centroid_z": float(centroid[2]),
+        "boundary_edges": boundary_edges,
+        "non_manifold_edges": non_manifold_edges,
+        "watertight": bool(len(counts)) and boundary_edges == 0 and non_manifold_edges == 0,
+    }
+
+
+def mesh_stats(filepath: str | bytes | PathLike) -> dict[str, Any]:
+    """Compute volume, area, bounds, and topology checks for one STL file.
+
+    Volume and centroid use signed tetrahedra against the origin, so they are
+    only meaningful for closed, consistently oriented meshes. Edges are counted
+    after welding identical vertices; a mesh is watertight when every edge is
+    shared by exactly two triangles.
+
+    Args:
+        filepath: Path to the STL file.
+
+    Returns:
+        A flat dictionary of scalar statistics keyed by column name.
+    """
+    return {"path": _fsdecode(filepath), **_triangle_stats(_load_vectors(filepath))}
+
+
+def mesh_stats_many(
+    paths: Sequence[str | bytes | PathLike],
+    *,
+    jobs: int | None = 1,
+    output_filepath: str | bytes | PathLike | None = None,
+) -> _pd.DataFrame:
+    """Compute :func:`mesh_stats` for many STL files.
+
+    Args:
+        paths: STL files to analyze.
+        jobs: Number of worker processes. ``None`` uses the shared
+            concurrency budget (one per usable core by default), within
+            available memory.
+        output_filepath: Optional table path ending in ``.csv``, ``.json``,
+            ``.xml``, ``.parquet``, ``.xlsx``, ``.feather``, ``.dta``, or
+            ``.pkl``, all readable by ``drcutils.data.convert``.
+
+    Returns:
+        A DataFrame with one row per input file and one column per statistic.
+
+    Raises:
+        ValueError: If ``output_filepath`` has an unsupported extension.
+    """
+    frame = _pd.DataFrame(list(_map_tasks(mesh_stats, paths, jobs=jobs, processes=True)))
+
+    if output_filepath is not None:
+        ext = _splitext(_fsdecode(output_filepath))[1].lower()
+        if ext not in _TABLE_WRITERS:
+            raise ValueError(
+                f"Mesh statistics cannot be written to extension {ext}. "
+                f"Choose from: {', '.join(_TABLE_WRITERS)}."
+            )
+        getattr(frame, _TABLE_WRITERS[ext])(output_filepath)
+    return frame
+
+
+def _sample_triangles(
+    vectors: _np.ndarray,
+    n: int,
+    with_normals: bool,
+    rng: _np.random.Generator,
+) -> _np.ndarray:
+    """Draw area-weighted surface samples from a triangle array."""
+    v0 = vectors[:, 0]
+    edge_a = vectors[:, 1] - v0
+    edge_b = vectors[:, 2] - v0
+    cross = _np.cross(edge_a, edge_b)
+    areas = _np.linalg.norm(cross, axis=1)
+    total = areas.sum()
+    if not total > 0:
+        raise ValueError("Cannot sample points from a mesh with zero surface area.")
+
+    cdf = _np.cumsum(areas)
+    picks = _np.minimum(_np.searchsorted(cdf, rng.random(n) * cdf[-1], side="right"), len(cdf) - 1)
+    r1 = _np.sqrt(rng.random(n))
+    r2 = rng.random(n)
+    u = r1 * (1.0 - r2)
+    v = r1 * r2
+    points = v0[picks] + u[:, None] * edge_a[picks] + v[:, None] * edge_b[picks]
+    if not with_normals:
+        return points
+    normals = cross[picks] / areas[picks, None]
+    return _np.concatenate([points, normals], axis=1)
+
+
+def sample_points(
+    filepath: str | bytes | PathLike,
+    n: int,
+    *,
+    with_normals: bool = True,
+    seed: int | _np.random.SeedSequence | None = None,
+) -> _np.ndarray:
+    """Sample a point cloud uniformly over the surface of an STL mesh.
+
+    Triangles are selected with probability proportional to their area and
+    points are placed uniformly inside each selected triangle using barycentric
+    coordinates.
+
+    Args:
+        filepath: Path to the STL file.
+        n: Number of points to sample.
+        with_normals: Whether to append unit face normals to each point.
+        seed: Seed for the random generator. Identical seeds give identical
+            samples.
+
+    Returns:
+        An ``(n, 6)`` array of ``x, y, z, nx, ny, nz`` values, or ``(n, 3)``
+        when ``with_normals`` is ``False``.
+
+    Raises:
+        ValueError: If ``n`` is negative or the mesh has no surface area.
+    """
+    if n < 0:
+        raise ValueError("n must be a non-negative integer.")
+    rng = _np.random.default_rng(seed)
+    return _sample_triangles(_load_vectors(filepath), n, with_normals, rng)
+
+
+def _sample_points_task(
+    filepath: str | bytes | PathLike,
+    n: int,
+    with_normals: bool,
+    seed: _np.random.SeedSequence,
+) -> _np.ndarray:
+    return sample_points(filepath, n, with_normals=with_normals, seed=seed).astype(_np.float32)
+
+
+def sample_points_many(
+    paths: Sequence[str | bytes | PathLike],
+    output_filepath: str | bytes | PathLike,
+    n: int,
+    *,
+    with_normals: bool = True,
+    seed: int | None = None,
+    jobs: int | None = 1,
+    dataset: str = "points",
+) -> Path:
+    """Sample fixed-size point clouds for many STL files into one array file.
+
+    Each file receives its own child seed spawned from ``seed``, so outputs are
+    identical regardless of ``jobs``. Results are written row by row into a
+    ``float32`` array of shape ``(len(paths), n, 6)`` (or ``(..., 3)`` without
+    normals) as they complete.
+
+    Args:
+        paths: STL files to sample.
+        output_filepath: Destination ``.npy`` file (memory-mappable with
+            ``numpy.load(..., mmap_mode="r")``) or ``.h5``/``.hdf5`` file.
+        n: Number of points per file.
+        with_normals: Whether to store unit face normals with each point.
+        seed: Root seed for deterministic sampling.
+        jobs: Number of worker processes. ``None`` uses the shared
+            concurrency budget (one per usable core by default), within
+            available memory.
+        dataset: HDF5 dataset name. Ignored for ``.npy`` outputs.
+
+    Returns:
+        The output file path.
+
+    Raises:
+        ImportError: If an HDF5 output is requested and ``h5py`` is not installed.
+        ValueError: If the output extension is unsupported or ``n`` is negative.
+    """
+    if n < 0:
+        raise ValueError("n must be a non-negative integer.")
+    out_path = Path(_fsdecode(output_filepath))
+    ext = out_path.suffix.lower()
+    if ext not in {".npy", ".h5", ".hdf5"}:
+        raise ValueError(f"Point sets cannot be written to extension {ext}. Use .npy or .h5.")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    shape = (len(paths), n, 6 if with_normals else 3)
+    seeds = _np.random.SeedSequence(seed).spawn(len(paths))
+    args = (paths, [n] * len(paths), [with_normals] * len(paths), seeds)
+
+    if ext == ".npy":
+        h5_file = None
+        target = _np.lib.format.open_memmap(out_path, mode="w+", dtype=_np.float32, shape=shape)
+    else:
+        try:
+            import h5py as _h5py
+        except ImportError as exc:
+            raise ImportError(
+                "h5py is optional for HDF5 point-set output. Install with `pip install h5py`."
+            ) from exc
+        h5_file = _h5py.File(out_path, "w")
+        target = h5_file.create_dataset(dataset, shape=shape, dtype="float32")
+
+    try:
+        for idx, points in enumerate(
+            _map_tasks(_sample_points_task, *args, jobs=jobs, processes=True)
+        ):
+            target[idx] = points
+    finally:
+        if h5_file is not None:
+            h5_file.close()
+        else:
+            target.flush()
+    return out_path
+
+
+def _axis_ray_hits(
+    vectors: _np.ndarray,
+    axis: int,
+    origin: _np.ndarray,
+    pitch: float,
+    resolution: int,
+    chunk_size: int,
+) -> tuple[_np.ndarray, _np.ndarray, _np.ndarray]:
+    """Intersect voxel-column rays parallel to ``axis`` with every triangle.
+
+    Rays pass through the voxel centers of the two remaining axes. Candidate
+    (triangle, column) pairs are enumerated from each triangle's projected
+    bounding box in chunks of at most ``chunk_size`` pairs; a triangle whose
+    bounding box covers more columns than that is split across chunks.
+
+    Returns:
+        Column indices along the first and second remaining axes and the hit
+        coordinate along ``axis`` for every intersection.
+    """
+    a_axis, b_axis = [dim for dim in range(3) if dim != axis]
+    # A tiny irrational offset keeps rays off shared triangle edges.
+    jitter = 1e-7 * pitch * _np.array([0.6180339887, 0.4142135623])
+    a = (vectors[..., a_axis] - origin[a_axis] - jitter[0]) / pitch - 0.5
+    b = (vectors[..., b_axis] - origin[b_axis] - jitter[1]) / pitch - 0.5
+    c = vectors[..., axis]
+
+    a_lo = _np.clip(_np.ceil(a.min(axis=1)), 0, resolution).astype(_np.int64)
+    a_hi = _np.clip(_np.floor(a.max(axis=1)), -1, resolution - 1).astype(_np.int64)
+    b_lo = _np.clip(_np.ceil(b.min(axis=1)), 0, resolution).astype(_np.int64)
+    b_hi = _np.clip(_np.floor(b.max(axis=1)), -1, resolution - 1).astype(_np.int64)
+    a_span = _np.maximum(a_hi - a_lo + 1, 0)
+    b_span = _np.maximum(b_hi - b_lo + 1, 0)
+    counts = a_span * b_span
+
+    hits_a: list[_np.ndarray] = []
+    hits_b: list[_np.ndarray] = []
+    hits_c: list[_np.ndarray] = []
+    ends = _np.cumsum(counts)
+    total = int(ends[-1]) if len(ends) else 0
+    for start in range(0, total, chunk_size):
+        pair = _np.arange(start, min(start + chunk_size, total), dtype=_np.int64)
+        tri = _np.searchsorted(ends, pair, side="right")
+        local = pair - (ends[tri] - counts[tri])
+        ia = a_lo[tri] + local // b_span[tri]
+        ib = b_lo[tri] + local % b_span[tri]
+
+        (a0, a1, a2), (b0, b1, b2) = a[tri].T, b[tri].T
+        denom = (b1 - b2) * (a0 - a2) + (a2 - a1) * (b0 - b2)
+        safe = _np.where(denom == 0, 1.0, denom)
+        l0 = ((b1 - b2) * (ia - a2) + (a2 - a1) * (ib - b2)) / safe
+        l1 = ((b2 - b0) * (ia - a2) + (a0 - a2) * (ib - b2)) / safe
+        l2 = 1.0 - l0 - l1
+        inside = (denom != 0) & (l0 >= 0) & (l1 >= 0) & (l2 >= 0)
+
+        ct = c[tri[inside]]
+        hits_a.append(ia[inside])
+        hits_b.append(ib[inside])
+        hits_c.append(l0[inside] * ct[:, 0] + l1[inside] * ct[:, 1] + l2[inside] * ct[:, 2])
+
+    if not hits_c:
+        empty = _np.empty(0, dtype=_np.int64)
+        return empty, empty, _np.empty(0)
+    return _np.concatenate(hits_a), _np.concatenate(hits_b), _np.concatenate(hits_c)
+
+
+def voxelize(
+    filepath: str | bytes | PathLike,
+    resolution: int,
+    *,
+    fill: bool = True,
+    chunk_size: int = 1 << 22,
+) -> _np.ndarray:
+    """Voxelize an STL mesh into a cubic boolean occupancy grid.
+
+    The grid is anchored at the mesh bounding-box minimum with a uniform pitch
+    of ``longest extent / resolution``. Surface voxels are those crossed by rays
+    through voxel centers along each axis. With ``fill``, interior voxels are
+    added by scanline parity along ``z``, which assumes a closed mesh.
+
+    Args:
+        filepath: Path to the STL file.
+        resolution: Number of voxels along each grid edge.
+        fill: Whether to fill the interior of the mesh.
+        chunk_size: Maximum number of (triangle, ray) candidate pairs tested
+            at once. Lower values bound peak memory for large meshes.
+
+    Returns:
+        A ``(resolution, resolution, resolution)`` boolean array indexed
+        ``[x, y, z]``.
+
+    Raises:
+        ValueError: If ``resolution`` or ``chunk_size`` is not positive.
+    """
+    if resolution <= 0:
+        raise ValueError("resolution must be a positive integer.")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    grid = _np.zeros((resolution,) * 3, dtype=bool)
+    vectors = _load_vectors(filepath)
+    if not len(vectors):
+        return grid
+    origin = vectors.reshape(-1, 3).min(axis=0)
+    extent = float((vectors.reshape(-1, 3) - origin).max())
+    pitch = extent / resolution if extent > 0 else 1.0
+
+    for axis in range(3):
+        a_axis, b_axis = [dim for dim in range(3) if dim != axis]
+        ia, ib, hit = _axis_ray_hits(vectors, axis, origin, pitch, resolution, chunk_size)
+        ic = _np.clip(_np.floor((hit - origin[axis]) / pitch), 0, resolution - 1).astype(_np.int64)
+        index = [ic, ic, ic]
+        index[a_axis], index[b_axis] = ia, ib
+        grid[index[0], index[1], index[2]] = True
+
+        if fill and axis == 2:
+            # Toggle parity only on the cells rays cross, then prefix-XOR along
+            # z in place; crossings at the far face never reopen a voxel.
+            toggle = _np.ceil((hit - origin[2]) / pitch - 0.5).clip(0, resolution)
+            toggle = toggle.astype(_np.int64)
+            keep = toggle < resolution
+            parity = _np.zeros_like(grid)
+            _np.logical_xor.at(parity, (ia[keep], ib[keep], toggle[keep]), True)
+            _np.logical_xor.accumulate(parity, axis=2, out=parity)
+            grid |= parity
+    return grid
+
+
+def _voxelize_packed(
+    filepath: str | bytes | PathLike, resolution: int, fill: bool, chunk_size: int
+) -> _np.ndarray:
+    return _np.packbits(voxelize(filepath, resolution, fill=fill, chunk_size=chunk_size))
+
+
+def voxelize_many(
+    paths: Sequence[str | bytes | PathLike],
+    output_filepath: str | bytes | PathLike,
+    resolution: int,
+    *,
+    fill: bool = True,
+    jobs: int | None = 1,
+    chunk_size: int = 1 << 22,
+) -> Path:
+    """Voxelize many STL files into one packed-bit ``.npy`` occupancy array.
+
+    Each row holds ``numpy.packbits`` of one grid. Recover a grid with
+    ``numpy.unpackbits(row, count=resolution**3).reshape((resolution,) * 3)``.
+
+    Args:
+        paths: STL files to voxelize.
+        output_filepath: Destination ``.npy`` file, memory-mappable with
+            ``numpy.load(..., mmap_mode="r")``.
+        resolution: Number of voxels along each grid edge.
+        fill: Whether to fill mesh interiors.
+        jobs: Number of worker processes. ``None`` uses the shared
+            concurrency budget (one per usable core by default), within
+            available memory.
+        chunk_size: Per-process candidate pair limit passed to :func:`voxelize`.
+
+    Returns:
+        The output file path.
+
+    Raises:
+        ValueError: If the output is not a ``.npy`` file or ``resolution`` is
+            not positive.
+    """
+    if resolution <= 0:
+        raise ValueError("resolution must be a positive integer.")
+    out_path = Path(_fsdecode(output_filepath))
+    if out_path.suffix.lower() != ".npy":
+        raise ValueError("Packed occupancy grids must be written to a .npy file.")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    shape = (len(paths), (resolution**3 + 7) // 8)
+    target = _np.lib.format.open_memmap(out_path, mode="w+", dtype=_np.uint8, shape=shape)
+    count = len(paths)
+    rows = _map_tasks(
+        _voxelize_packed,
+        paths,
+        [resolution] * count,
+        [fill] * count,
+        [chunk_size] * count,
+        jobs=jobs,
+        processes=True,
+    )
+    for idx, packed in enumerate(rows):
+        target[idx] = packed
+    target.flush()
+    return out_path
@@ -0,0 +1,264 @@
+"""Aggregated density rendering for very large point sets."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from os import PathLike
+from os import fsdecode as _fsdecode
+from typing import Any
+
+import numpy as _np
+from matplotlib.axes import Axes
+from matplotlib.colors import Colormap, FuncNorm, LogNorm, Normalize
+from matplotlib.image import AxesImage
+
+from ..brand.colormaps import resolve_colormap as _resolve_colormap
+from ..runtime.resources import chunk_length as _chunk_length
+
+_NORMS = ("linear", "log", "eq_hist")
+_DEFAULT_CHUNK = 1 << 20
+# float64 x/y plus the masks, indices, and scaled copies made while binning a point.
+_POINT_BYTES = 64
+
+
+def _as_xy(chunk: Any) -> tuple[_np.ndarray, _np.ndarray]:
+    """Split an ``(x, y)`` pair or an ``(N, 2)`` array into float columns."""
+    if isinstance(chunk, tuple) and len(chunk) == 2:
+        x, y = chunk
+    else:
+        array = _np.asarray(chunk)
+        if array.ndim != 2 or array.shape[1] != 2:
+            raise ValueError("Point chunks must be (x, y) pairs or arrays of shape (N, 2).")
+        x, y = array[:, 0], array[:, 1]
+    x = _np.asarray(x, dtype=_np.float64).ravel()
+    y = _np.asarray(y, dtype=_np.float64).ravel()
+    if x.shape != y.shape:
+        raise ValueError("x and y must have the same number of points.")
+    return x, y
+
+
+def _parquet_file(filepath: str | PathLike) -> Any:
+    try:
+        import pyarrow.parquet as _pq
+    except ImportError as exc:
+        raise ImportError(
+            "pyarrow is optional for Parquet point streaming. Install with `pip install pyarrow`."
+        ) from exc
+    return _pq.ParquetFile(_fsdecode(filepath))
+
+
+def _parquet_extent(
+    parquet: Any, columns: tuple[str, str]
+) -> tuple[float, float, float, float] | None:
+    """Read the data extent from row-group statistics, if every group has them."""
+    metadata = parquet.metadata
+    names = [metadata.schema.column(idx).name for idx in range(metadata.num_columns)]
+    bounds: list[list[float]] = [[], [], [], []]
+    for group_idx in range(metadata.num_row_groups):
+        group = metadata.row_group(group_idx)
+        for axis, column in enumerate(columns):
+            stats = group.column(names.index(column)).statistics
+            if stats is None or not stats.has_min_max:
+                return None
+            bounds[2 * axis].append(float(stats.min))
+            bounds[2 * axis + 1].append(float(stats.max))
+    if not bounds[0]:
+        return None
+    return min(bounds[0]), max(bounds[1]), min(bounds[2]), max(bounds[3])
+
+
+def _iter_chunks(
+    data: Any, columns: tuple[str, str], chunk_size: int
+) -> Iterator[tuple[_np.ndarray, _np.ndarray]]:
+    """Yield ``(x, y)`` float chunks of at most ``chunk_size`` points."""
+    if isinstance(data, str | PathLike):
+        parquet = _parquet_file(data)
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=list(columns)):
+            yield (
+                batch.column(0).to_numpy(zero_copy_only=False).astype(_np.float64),
+                batch.column(1).to_numpy(zero_copy_only=False).astype(_np.float64),
+            )
+        return
+    if hasattr(data, "columns"):
+        data = (data[columns[0]].to_numpy(), data[columns[1]].to_numpy())
+    if isinstance(data, tuple | _np.ndarray):
+        data = [data]
+    for chunk in data:
+        x, y = _as_xy(chunk)
+        for start in range(0, len(x), chunk_size):
+            yield x[start : start + chunk_size], y[start : start + chunk_size]
+
+
+def _resolve_extent(
+    data: Any, columns: tuple[str, str], chunk_size: int
+) -> tuple[float, float, float, float]:
+    """Compute the finite data extent without materialising all points at once."""
+    if isinstance(data, str | PathLike):
+        extent = _parquet_extent(_parquet_file(data), columns)
+        if extent is not None:
+            return extent
+    elif not (isinstance(data, tuple | _np.ndarray) or hasattr(data, "columns")):
+        raise ValueError("extent is required when streaming points from an iterable of chunks.")
+
+    lo = _np.array([_np.inf, _np.inf])
+    hi = -lo
+    for x, y in _iter_chunks(data, columns, chunk_size):
+        finite = _np.isfinite(x) & _np.isfinite(y)
+        if finite.any():
+            lo = _np.minimum(lo, [x[finite].min(), y[finite].min()])
+            hi = _np.maximum(hi, [x[finite].max(), y[finite].max()])
+    if not _np.isfinite(lo).all():
+        raise ValueError("No finite points to bin.")
+    return float(lo[0]), float(hi[0]), float(lo[1]), float(hi[1])
+
+
+def density_grid(
+    data: Any,
+    *,
+    bins: int | tuple[int, int] = 512,
+    extent: tuple[float, float, float, float] | None = None,
+    columns: tuple[str, str] = ("x", "y"),
+    chunk_size: int | None = None,
+) -> tuple[_np.ndarray, tuple[float, float, float, float]]:
+    """Bin 2D points into a count grid in streaming chunks.
+
+    Points are mapped to flat bin indices and counted with ``numpy.bincount``,
+    so memory stays bounded by ``chunk_size`` regardless of the total number of
+    points. Non-finite points and points outside ``extent`` are dropped.
+
+    Args:
+        data: An ``(x, y)`` pair of arrays, an ``(N, 2)`` array, a DataFrame, a
+            Parquet file path, or an iterable of ``(x, y)``/``(N, 2)`` chunks.
+        bins: Number of bins, either shared or as ``(nx, ny)``.
+        extent: Binning range ``(xmin, xmax, ymin, ymax)``. Computed from the
+            data when omitted (from row-group statistics for Parquet); required
+            for iterables of chunks, which can only be read once.
+        columns: Column names for DataFrame and Parquet inputs.
+        chunk_size: Maximum number of points binned at a time. Defaults to
+            about a million, reduced when usable memory (including container
+            limits) is tight.
+
+    Returns:
+        A ``(ny, nx)`` ``int64`` count grid with row 0 at ``ymin``, and the
+        extent used.
+
+    Raises:
+        ImportError: If a Parquet path is given and ``pyarrow`` is not installed.
+        ValueError: If ``bins`` or ``chunk_size`` are not positive, the extent
+            is empty or missing for a chunk iterable, or chunks are malformed.
+    """
+    nx, ny = (bins, bins) if isinstance(bins, int) else bins
+    if nx <= 0 or ny <= 0:
+        raise ValueError("bins must be positive.")
+    if chunk_size is None:
+        chunk_size = _chunk_length(_POINT_BYTES, _DEFAULT_CHUNK)
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+    if extent is None:
+        extent = _resolve_extent(data, columns, chunk_size)
+    xmin, xmax, ymin, ymax = (float(value) for value in extent)
+    if not (xmax >= xmin and ymax >= ymin):
+        raise ValueError("extent must be ordered as (xmin, xmax, ymin, ymax).")
+    # Degenerate ranges still get one bin's width so constant data lands in bin 0.
+    x_scale = nx / (xmax - xmin) if xmax > xmin else 0.0
+    y_scale = ny / (ymax - ymin) if ymax > ymin else 0.0
+
+    counts = _np.zeros(nx * ny, dtype=_np.int64)
+    for x, y in _iter_chunks(data, columns, chunk_size):
+        keep = (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+        ix = ((x[keep] - xmin) * x_scale).astype(_np.intp)
+        iy = ((y[keep] - ymin) * y_scale).astype(_np.intp)
+        # Points on the upper edge belong to the last bin, as in numpy.histogram2d.
+        _np.minimum(ix, nx - 1, out=ix)
+        _np.minimum(iy, ny - 1, out=iy)
+        counts += _np.bincount(iy * nx + ix, minlength=nx * ny)
+    return counts.reshape(ny, nx), (xmin, xmax, ymin, ymax)
+
+
+class _Interp:
+    """Picklable piecewise-linear map from ``xp`` to ``fp``, for FuncNorm."""
+
+    def __init__(self, xp: _np.ndarray, fp: _np.ndarray) -> None:
+        """Store the sample points and values."""
+        self.xp = xp
+        self.fp = fp
+
+    def __call__(self, value: Any) -> _np.ndarray:
+        """Interpolate ``value``."""
+        return _np.interp(value, self.xp, self.fp)
+
+
+def _density_norm(counts: _np.ndarray, norm: str) -> Normalize:
+    """Build a count normalization; empty bins are masked separately."""
+    filled = counts[counts > 0]
+    vmax = float(filled.max()) if filled.size else 1.0
+    if norm == "linear":
+        return Normalize(vmin=0.0, vmax=vmax)
+    if norm == "log":
+        return LogNorm(vmin=1.0, vmax=max(vmax, 1.0 + 1e-9))
+    levels, occurrences = _np.unique(filled, return_counts=True)
+    if levels.size < 2:
+        return Normalize(vmin=0.0, vmax=vmax)
+    cdf = _np.cumsum(occurrences, dtype=_np.float64)
+    cdf = (cdf - cdf[0]) / (cdf[-1] - cdf[0])
+    levels = levels.astype(_np.float64)
+    return FuncNorm(
+        (_Interp(levels, cdf), _Interp(cdf, levels)),
+        vmin=float(levels[0]),
+        vmax=float(levels[-1]),
+    )
+
+
+def density_plot(
+    ax: Axes,
+    data: Any,
+    *,
+    bins: int | tuple[int, int] = 512,
+    extent: tuple[float, float, float, float] | None = None,
+    cmap: str | Colormap = "drc_cool",
+    norm: str = "eq_hist",
+    columns: tuple[str, str] = ("x", "y"),
+    chunk_size: int | None = None,
+) -> AxesImage:
+    """Render a large point set as one density image in a brand colormap.
+
+    The cost of drawing and exporting the result depends only on ``bins``, not
+    on the number of points, so the image works with
+    :func:`drcutils.viz.export_figure` at any data size. Empty bins are
+    transparent.
+
+    Args:
+        ax: Matplotlib axes to draw into.
+        data: Point source accepted by :func:`density_grid`.
+        bins: Number of bins, either shared or as ``(nx, ny)``.
+        extent: Binning range ``(xmin, xmax, ymin, ymax)``.
+        cmap: Brand colormap name, registered Matplotlib colormap name, or a
+            colormap instance.
+        norm: Count normalization: ``"linear"``, ``"log"``, or ``"eq_hist"``
+            (histogram equalization, so colors spread evenly over occupied bins).
+        columns: Column names for DataFrame and Parquet inputs.
+        chunk_size: Maximum number of points binned at a time, as in
+            :func:`density_grid`.
+
+    Returns:
+        The image artist; ``image.get_array()`` holds the masked count grid.
+
+    Raises:
+        ValueError: If ``norm`` or a brand colormap name is unknown, or the
+            inputs are rejected by :func:`density_grid`.
+    """
+    if norm not in _NORMS:
+        raise ValueError(f"Unsupported norm '{norm}'. Choose from: {', '.join(_NORMS)}.")
+    colormap = _resolve_colormap(cmap).with_extremes(bad=(0.0, 0.0, 0.0, 0.0))
+    counts, used_extent = density_grid(
+        data, bins=bins, extent=extent, columns=columns, chunk_size=chunk_size
+    )
+    return ax.imshow(
+        _np.ma.masked_equal(counts, 0),
+        origin="lower",
+        extent=used_extent,
+        aspect="auto",
+        interpolation="nearest",
+        cmap=colormap,
+        norm=_density_norm(counts, norm),
+    )
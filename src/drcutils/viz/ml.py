@@ -2,42 +2,364 @@
 
 from __future__ import annotations
 
+import hashlib as _hashlib
+import html as _html
+import math as _math
+import mmap as _mmap
+import os as _os
+import re as _re
+import threading as _threading
+import urllib.parse as _urlparse
+import webbrowser as _webbrowser
+from collections import Counter as _Counter
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler as _BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer as _ThreadingHTTPServer
 from os import PathLike
+from pathlib import Path
+from types import TracebackType
+from typing import Any
 
+import netron as _netron
 from IPython.display import Javascript as _Javascript
 from IPython.display import display as _display
-from netron import serve as _serve
 
 from ..runtime import is_google_colab, is_notebook
 
+_KEY_LENGTH = 16
+_HASH_CHUNK = 1 << 20
+_STATIC_TYPES = {
+    ".css": "text/css",
+    ".html": "text/html",
+    ".ico": "image/x-icon",
+    ".js": "text/javascript",
+    ".json": "application/json",
+    ".png": "image/png",
+    ".svg": "image/svg+xml",
+    ".woff2": "font/woff2",
+}
+# Content hashes keyed by (path, size, mtime), so unchanged checkpoints are read once.
+_HASHES: dict[tuple[str, int, int], str] = {}
+_SHARED: NetronServer | None = None
+_SHARED_LOCK = _threading.Lock()
+# ONNX TensorProto.DataType codes as (name, bits per element); strings have no fixed size.
+_ONNX_DTYPES: dict[int, tuple[str, int]] = {
+    1: ("float32", 32),
+    2: ("uint8", 8),
+    3: ("int8", 8),
+    4: ("uint16", 16),
+    5: ("int16", 16),
+    6: ("int32", 32),
+    7: ("int64", 64),
+    8: ("string", 0),
+    9: ("bool", 8),
+    10: ("float16", 16),
+    11: ("float64", 64),
+    12: ("uint32", 32),
+    13: ("uint64", 64),
+    14: ("complex64", 64),
+    15: ("complex128", 128),
+    16: ("bfloat16", 16),
+    17: ("float8e4m3fn", 8),
+    18: ("float8e4m3fnuz", 8),
+    19: ("float8e5m2", 8),
+    20: ("float8e5m2fnuz", 8),
+    21: ("uint4", 4),
+    22: ("int4", 4),
+    23: ("float4e2m1", 4),
+    24: ("float8e8m0", 8),
+    25: ("uint2", 2),
+    26: ("int2", 2),
+    27: ("float6e2m3", 6),
+    28: ("float6e3m2", 6),
+}
+# TensorProto fields that hold inline element data.
+_TENSOR_DATA_FIELDS = frozenset((4, 5, 6, 7, 9, 10, 11))
 
-def visualize_network(path: str | bytes | PathLike, height: int = 500, port: int = 8000) -> None:
+
+def _content_key(path: Path) -> str:
+    """Return a short SHA-256 key for a file, reusing it while the file is unchanged."""
+    stat = path.stat()
+    cache_key = (str(path), stat.st_size, stat.st_mtime_ns)
+    if cache_key not in _HASHES:
+        digest = _hashlib.sha256()
+        with path.open("rb") as handle:
+            while chunk := handle.read(_HASH_CHUNK):
+                digest.update(chunk)
+        _HASHES[cache_key] = digest.hexdigest()[:_KEY_LENGTH]
+    return _HASHES[cache_key]
+
+
+class _NetronRequestHandler(_BaseHTTPRequestHandler):
+    """Serve Netron's static app under ``/<key>/`` and model files under ``/<key>/data/``."""
+
+    server: _NetronHTTPServer
+
+    def do_HEAD(self) -> None:  # noqa: N802 - http.server naming
+        self.do_GET()
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        parts = _urlparse.unquote(_urlparse.urlparse(self.path).path).lstrip("/").split("/")
+        model = self.server.models.get(parts[0])
+        if model is not None:
+            parts = parts[1:]
+        if model is not None and len(parts) > 1 and parts[0] == "data":
+            self._send_file(
+                model.parent, "/".join(parts[1:]), "application/octet-stream", immutable=True
+            )
+        elif model is not None and parts in ([], [""], ["index.html"]):
+            self._send_bytes(self.server.index_page(model), "text/html", immutable=False)
+        else:
+            name = "/".join(parts) or "index.html"
+            content_type = _STATIC_TYPES.get(_os.path.splitext(name)[1])
+            if content_type is None:
+                self._send_bytes(None, "text/plain", immutable=False)
+            else:
+                self._send_file(self.server.static_root, name, content_type, immutable=False)
+
+    def _send_file(self, root: Path, name: str, content_type: str, *, immutable: bool) -> None:
+        # Only files below ``root`` are served, as in netron's own server.
+        target = (root / name).resolve()
+        if not target.is_file() or not target.is_relative_to(root.resolve()):
+            self._send_bytes(None, content_type, immutable=False)
+            return
+        with target.open("rb") as handle:
+            self._send_headers(200, content_type, target.stat().st_size, immutable=immutable)
+            if self.command != "HEAD":
+                self.wfile.flush()
+                self.connection.sendfile(handle)
+
+    def _send_bytes(self, content: bytes | None, content_type: str, *, immutable: bool) -> None:
+        if content is None:
+            self._send_headers(404, "text/plain", 0, immutable=False)
+            return
+        self._send_headers(200, content_type, len(content), immutable=immutable)
+        if self.command != "HEAD":
+            self.wfile.write(content)
+
+    def _send_headers(
+        self, status: int, content_type: str, length: int, *, immutable: bool
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(length))
+        # Model URLs are content-addressed, so browsers never need to refetch them.
+        self.send_header(
+            "Cache-Control", "max-age=31536000, immutable" if immutable else "no-cache"
+        )
+        self.end_headers()
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+
+class _NetronHTTPServer(_ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], models: dict[str, Path]) -> None:
+        super().__init__(address, _NetronRequestHandler)
+        self.static_root = Path(_netron.__file__).resolve().parent
+        self.models = models
+        self._index = (self.static_root / "index.html").read_text(encoding="utf-8")
+
+    def index_page(self, model: Path) -> bytes:
+        name = _html.escape(model.name, quote=True)
+        meta = (
+            '<meta name="type" content="Python">'
+            f'<meta name="file" content="/data/{_urlparse.quote(model.name)}">'
+            f'<meta name="identifier" content="{name}">'
+            f'<meta name="name" content="{name}">'
+        )
+        page = _re.sub(
+            r'(<meta name="version" content="[^"]*">)', lambda m: m.group(1) + meta, self._index
+        )
+        return page.encode("utf-8")
+
+
+class NetronServer:
+    """A long-lived local Netron server that can show many models at once.
+
+    Models are registered by content hash under ``http://host:port/<key>/``,
+    so registering the same checkpoint twice returns the same URL and the
+    browser cache stays valid. Model files are streamed from disk on request
+    rather than held in memory. Use as a context manager or call
+    :meth:`stop` when done.
+
+    Examples:
+        >>> with NetronServer() as server:  # doctest: +SKIP
+        ...     url = server.add("model.onnx")
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 0) -> None:
+        """Create a stopped server.
+
+        Args:
+            host: Interface to bind.
+            port: Preferred port. ``0`` picks a free port, and a busy port
+                falls back to a free one.
+        """
+        self.host = host
+        self._port = port
+        self._models: dict[str, Path] = {}
+        self._server: _NetronHTTPServer | None = None
+        self._thread: _threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the server is accepting requests."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def port(self) -> int:
+        """Bound port, or the preferred port before :meth:`start`."""
+        return self._server.server_address[1] if self._server is not None else self._port
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def models(self) -> dict[str, Path]:
+        """Registered models by content key."""
+        return dict(self._models)
+
+    def start(self) -> NetronServer:
+        """Start serving in a background thread if not already running.
+
+        Returns:
+            The server itself, for chaining.
+        """
+        if self.running:
+            return self
+        try:
+            self._server = _NetronHTTPServer((self.host, self._port), self._models)
+        except OSError:
+            if self._port == 0:
+                raise
+            self._server = _NetronHTTPServer((self.host, 0), self._models)
+        self._thread = _threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.25},
+            name=f"drcutils-netron-{self.port}",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def add(self, path: str | bytes | PathLike) -> str:
+        """Register a model file and return its viewer URL.
+
+        Sidecar files next to the model (such as external ONNX weights) are
+        served from the same directory. The server is started if needed.
+
+        Args:
+            path: Filepath to the saved neural network.
+
+        Returns:
+            The URL that opens the model in Netron.
+
+        Raises:
+            FileNotFoundError: If ``path`` does not exist.
+        """
+        model = Path(_os.fsdecode(path)).resolve()
+        if not model.is_file():
+            raise FileNotFoundError(f"Model file not found: {model}")
+        key = _content_key(model)
+        # Identical copies share one URL; keep the first so its sidecars stay reachable.
+        if key not in self._models or not self._models[key].is_file():
+            self._models[key] = model
+        return f"{self.start().url}/{key}/"
+
+    def stop(self) -> None:
+        """Stop serving and release the port.
+
+        Registered models are kept, so a later :meth:`start` serves them at
+        the same paths (on the same port when it is still free).
+        """
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        self._port = self._server.server_address[1]
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> NetronServer:
+        """Start the server for the duration of a ``with`` block."""
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the server when the ``with`` block exits."""
+        self.stop()
+
+
+def get_netron_server(port: int = 0) -> NetronServer:
+    """Return the shared Netron server, starting it on first use.
+
+    Args:
+        port: Preferred port when the server has to be started.
+
+    Returns:
+        The running shared server.
+    """
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = NetronServer(port=port)
+        return _SHARED.start()
+
+
+def visualize_network(
+    path: str | bytes | PathLike,
+    height: int = 500,
+    port: int = 0,
+    server: NetronServer | None = None,
+) -> str:
     """Visualize a neural network with Netron.
 
+    Every call reuses one local server, so viewing many checkpoints does not
+    start new servers or collide on ports.
+
     Args:
         path: Filepath to the saved neural network.
         height: Height of the iframe visualization in pixels.
-        port: Port on which the visualization is served.
+        port: Preferred port when the shared server has to be started.
+        server: Server to register the model with. Defaults to the shared
+            server from :func:`get_netron_server`.
 
     Returns:
-        ``None``. Opens the visualization in an iframe (notebook) or browser (terminal).
+        The model URL. Opens the visualization in an iframe (notebook) or browser (terminal).
+
+    Raises:
+        FileNotFoundError: If ``path`` does not exist.
     """
+    server = server if server is not None else get_netron_server(port)
+    url = server.add(path)
+    model_path = url[len(server.url) :]
     if is_notebook():
-        _serve(path, None, ("localhost", port), False, 0)
         if is_google_colab():
             _display(
                 _Javascript(
                     """
             (async ()=>{
+                const base = await google.colab.kernel.proxyPort(%s);
                 const fm = document.createElement('iframe');
-                fm.src = await google.colab.kernel.proxyPort(%s);
+                fm.src = base.replace(/\\/?$/, '') + '%s';
                 fm.width = '95%%';
                 fm.height = '%d';
                 fm.frameBorder = 0;
                 document.body.append(fm);
             })();
             """
-                    % (port, height)
+                    % (server.port, model_path, height)
                 )
             )
         else:
@@ -46,15 +368,290 @@ def visualize_network(path: str | bytes | PathLike, height: int = 500, port: int
                     """
             (()=>{
                 const fm = document.createElement('iframe');
-                fm.src = 'http://localhost:%s';
+                fm.src = '%s';
                 fm.width = '95%%';
                 fm.height = '%d';
                 fm.frameBorder = 0;
                 document.body.append(fm);
             })();
             """
-                    % (port, height)
+                    % (url, height)
                 )
             )
     else:
-        _serve(path, None, ("localhost", port), True, 0)
+        _webbrowser.open(url)
+    return url
+
+
+def _varint(buf: Any, pos: int) -> tuple[int, int]:
+    byte = buf[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    value, shift = byte & 0x7F, 7
+    while True:
+        pos += 1
+        byte = buf[pos]
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos + 1
+        shift += 7
+        if shift > 63:
+            raise ValueError(f"Malformed varint at byte {pos}.")
+
+
+def _signed(value: int) -> int:
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _wire_fields(buf: Any, start: int, end: int) -> Iterator[tuple[int, int, int, int]]:
+    """Yield ``(field, wire_type, a, b)`` for the protobuf message in ``buf[start:end]``.
+
+    Varints yield their value as ``a``; length-delimited fields yield the span
+    ``buf[a:b]`` without copying it, so large payloads cost nothing to skip.
+    Fixed-width fields are skipped.
+    """
+    pos = start
+    while pos < end:
+        key, pos = _varint(buf, pos)
+        field, wire = key >> 3, key & 7
+        if wire == 0:
+            value, pos = _varint(buf, pos)
+            yield field, 0, value, pos
+        elif wire == 2:
+            length, pos = _varint(buf, pos)
+            yield field, 2, pos, pos + length
+            pos += length
+        elif wire == 1:
+            pos += 8
+        elif wire == 5:
+            pos += 4
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire} at byte {pos}.")
+    if pos != end:
+        raise ValueError(f"Message ending at byte {end} is truncated.")
+
+
+def _text(buf: Any, start: int, end: int) -> str:
+    return bytes(buf[start:end]).decode("utf-8", "replace")
+
+
+def _scan_value_info(buf: Any, start: int, end: int) -> dict[str, Any]:
+    """Read a ``ValueInfoProto`` into name, dtype, and shape (symbolic dims as names)."""
+    name, dtype, shape = "", None, None
+    for field, wire, a, b in _wire_fields(buf, start, end):
+        if field == 1 and wire == 2:
+            name = _text(buf, a, b)
+        elif field == 2 and wire == 2:
+            for type_field, type_wire, ta, tb in _wire_fields(buf, a, b):
+                if type_field != 1 or type_wire != 2:
+                    continue
+                for tensor_field, tensor_wire, xa, xb in _wire_fields(buf, ta, tb):
+                    if tensor_field == 1 and tensor_wire == 0:
+                        dtype = _ONNX_DTYPES.get(xa, (f"unknown({xa})", 0))[0]
+                    elif tensor_field == 2 and tensor_wire == 2:
+                        shape = []
+                        for dims_field, _, da, db in _wire_fields(buf, xa, xb):
+                            if dims_field != 1:
+                                continue
+                            dim: int | str | None = None
+                            for dim_field, dim_wire, va, vb in _wire_fields(buf, da, db):
+                                if dim_field == 1 and dim_wire == 0:
+                                    dim = _signed(va)
+                                elif dim_field == 2 and dim_wire == 2:
+                                    dim = _text(buf, va, vb)
+                            shape.append(dim)
+    return {"name": name, "dtype": dtype, "shape": None if shape is None else tuple(shape)}
+
+
+def _scan_tensor(buf: Any, start: int, end: int) -> dict[str, Any]:
+    """Read a ``TensorProto`` header, measuring but never reading its data."""
+    name, dtype, dims, payload = "", 0, [], 0
+    external: dict[str, str] = {}
+    for field, wire, a, b in _wire_fields(buf, start, end):
+        if field == 1:
+            if wire == 0:
+                dims.append(_signed(a))
+            elif wire == 2:
+                pos = a
+                while pos < b:
+                    value, pos = _varint(buf, pos)
+                    dims.append(_signed(value))
+        elif field == 2 and wire == 0:
+            dtype = a
+        elif field == 8 and wire == 2:
+            name = _text(buf, a, b)
+        elif field in _TENSOR_DATA_FIELDS and wire == 2:
+            payload += b - a
+        elif field == 13 and wire == 2:
+            entry = {key: _text(buf, va, vb) for key, _, va, vb in _wire_fields(buf, a, b)}
+            external[entry.get(1, "")] = entry.get(2, "")
+    dtype_name, bits = _ONNX_DTYPES.get(dtype, (f"unknown({dtype})", 0))
+    elements = _math.prod(dims)
+    size = (elements * bits + 7) // 8 if bits else payload
+    reference = None
+    if external:
+        size = int(external.get("length", size))
+        reference = {
+            "location": external.get("location", ""),
+            "offset": int(external.get("offset", 0)),
+            "length": size,
+        }
+    return {
+        "name": name,
+        "dtype": dtype_name,
+        "shape": tuple(dims),
+        "elements": elements,
+        "bytes": size,
+        "external": reference,
+    }
+
+
+def _scan_sparse_tensor(buf: Any, start: int, end: int) -> dict[str, Any]:
+    """Read a ``SparseTensorProto`` header; ``elements`` counts stored values only."""
+    values: dict[str, Any] | None = None
+    indices_bytes, dims = 0, []
+    for field, wire, a, b in _wire_fields(buf, start, end):
+        if field == 1 and wire == 2:
+            values = _scan_tensor(buf, a, b)
+        elif field == 2 and wire == 2:
+            indices_bytes = _scan_tensor(buf, a, b)["bytes"]
+        elif field == 3:
+            if wire == 0:
+                dims.append(_signed(a))
+            elif wire == 2:
+                pos = a
+                while pos < b:
+                    value, pos = _varint(buf, pos)
+                    dims.append(_signed(value))
+    if values is None:
+        raise ValueError("A sparse initializer has no values tensor.")
+    return {**values, "shape": tuple(dims), "bytes": values["bytes"] + indices_bytes}
+
+
+def _scan_graph(buf: Any, start: int, end: int, scan: dict[str, Any], top: bool) -> None:
+    """Accumulate ops and initializers of a ``GraphProto`` and its subgraphs."""
+    for field, wire, a, b in _wire_fields(buf, start, end):
+        if wire != 2:
+            continue
+        if field == 1:
+            op_type, domain = "", ""
+            for node_field, node_wire, na, nb in _wire_fields(buf, a, b):
+                if node_wire != 2:
+                    continue
+                if node_field == 4:
+                    op_type = _text(buf, na, nb)
+                elif node_field == 7:
+                    domain = _text(buf, na, nb)
+                elif node_field == 5:
+                    # Control-flow bodies live in g (6) and graphs (11) attributes.
+                    for attr_field, attr_wire, ga, gb in _wire_fields(buf, na, nb):
+                        if attr_field in (6, 11) and attr_wire == 2:
+                            _scan_graph(buf, ga, gb, scan, top=False)
+            qualified = op_type if domain in ("", "ai.onnx") else f"{domain}.{op_type}"
+            scan["ops"][qualified] += 1
+        elif field == 5:
+            scan["initializers"].append(_scan_tensor(buf, a, b))
+        elif field == 15:
+            scan["initializers"].append(_scan_sparse_tensor(buf, a, b))
+        elif top and field == 2:
+            scan["graph"] = _text(buf, a, b)
+        elif top and field in (11, 12):
+            scan["inputs" if field == 11 else "outputs"].append(_scan_value_info(buf, a, b))
+
+
+def summarize_model(path: str | bytes | PathLike) -> dict[str, Any]:
+    """Summarize an ONNX model without loading its weights.
+
+    The file is memory-mapped and walked at the protobuf wire level, skipping
+    tensor payloads by length, so only graph structure and tensor headers are
+    read. This works on multi-gigabyte checkpoints without ``onnx`` installed.
+    Nodes inside control-flow subgraphs (``If``, ``Loop``, ``Scan``) are
+    counted too.
+
+    Args:
+        path: Filepath to an ``.onnx`` model.
+
+    Returns:
+        A dict with ``file``, ``bytes`` (file size), ``ir_version``,
+        ``producer``, ``opsets`` (domain to version), ``graph`` (name),
+        ``nodes``, ``ops`` (op type to count, most common first), ``inputs``
+        and ``outputs`` (name, dtype, and shape with symbolic dims as
+        strings), ``initializers`` (name, dtype, shape, elements, bytes, and
+        an ``external`` reference with location, offset, and length, or
+        ``None``), ``parameters`` and ``parameter_bytes`` (initializer
+        totals), and ``external_data`` (tensors, bytes, and whether the file
+        exists, per referenced file). Sparse initializers report their dense
+        ``shape`` but count only stored values as ``elements``; their
+        ``bytes`` include the indices.
+
+    Raises:
+        FileNotFoundError: If ``path`` does not exist.
+        ValueError: If the file is not a well-formed ONNX model.
+    """
+    model = Path(_os.fsdecode(path))
+    scan: dict[str, Any] = {
+        "graph": None,
+        "ops": _Counter(),
+        "inputs": [],
+        "outputs": [],
+        "initializers": [],
+    }
+    ir_version, producer, opsets = None, ["", ""], {}
+    with model.open("rb") as handle:
+        size = _os.fstat(handle.fileno()).st_size
+        if size == 0:
+            raise ValueError(f"{model} is not an ONNX model. The file is empty.")
+        with _mmap.mmap(handle.fileno(), 0, access=_mmap.ACCESS_READ) as buf:
+            try:
+                graph_span = None
+                for field, wire, a, b in _wire_fields(buf, 0, size):
+                    if field == 1 and wire == 0:
+                        ir_version = a
+                    elif field in (2, 3) and wire == 2:
+                        producer[field - 2] = _text(buf, a, b)
+                    elif field == 7 and wire == 2:
+                        graph_span = (a, b)
+                    elif field == 8 and wire == 2:
+                        opset = dict((f, (va, vb)) for f, _, va, vb in _wire_fields(buf, a, b))
+                        domain = _text(buf, *opset[1]) if 1 in opset else ""
+                        opsets[domain or "ai.onnx"] = opset[2][0] if 2 in opset else None
+                if graph_span is None or ir_version is None:
+                    raise ValueError("No graph or IR version found.")
+                _scan_graph(buf, *graph_span, scan, top=True)
+            except (IndexError, ValueError) as exc:
+                reason = "The file is truncated." if isinstance(exc, IndexError) else exc
+                raise ValueError(f"{model} is not an ONNX model. {reason}") from None
+
+    initializers = scan["initializers"]
+    # Before IR version 4, graph inputs also listed every initializer.
+    weight_names = {tensor["name"] for tensor in initializers}
+    external_data: dict[str, dict[str, Any]] = {}
+    for tensor in initializers:
+        reference = tensor["external"]
+        if reference is not None:
+            entry = external_data.setdefault(
+                reference["location"],
+                {
+                    "tensors": 0,
+                    "bytes": 0,
+                    "exists": (model.parent / reference["location"]).is_file(),
+                },
+            )
+            entry["tensors"] += 1
+            entry["bytes"] += reference["length"]
+    return {
+        "file": model,
+        "bytes": size,
+        "ir_version": ir_version,
+        "producer": " ".join(part for part in producer if part),
+        "opsets": opsets,
+        "graph": scan["graph"],
+        "nodes": sum(scan["ops"].values()),
+        "ops": dict(scan["ops"].most_common()),
+        "inputs": [value for value in scan["inputs"] if value["name"] not in weight_names],
+        "outputs": scan["outputs"],
+        "initializers": initializers,
+        "parameters": sum(tensor["elements"] for tensor in initializers),
+        "parameter_bytes": sum(tensor["bytes"] for tensor in initializers),
+        "external_data": external_data,
+    }
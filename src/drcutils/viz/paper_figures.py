@@ -2,12 +2,42 @@
 
 from __future__ import annotations
 
+import cProfile as _cProfile
+import hashlib as _hashlib
+import io as _io
+import json as _json
+import os as _os
+import pickle as _pickle
+import pstats as _pstats
+import re as _re
+import threading as _threading
+from collections.abc import Callable, Iterable, Iterator, Mapping
 from contextlib import contextmanager
+from datetime import UTC, datetime
 from pathlib import Path
+from time import perf_counter as _perf_counter
 from typing import Any
 
 import matplotlib as _mpl
+import matplotlib.colors as _mpc
+import numpy as _np
+from matplotlib.axis import Axis as _Axis
+from matplotlib.collections import Collection as _Collection
+from matplotlib.collections import QuadMesh as _QuadMesh
+from matplotlib.colors import Colormap as _Colormap
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D as _Line2D
+from matplotlib.patches import Patch as _Patch
+from matplotlib.path import Path as _MplPath
+from matplotlib.spines import Spine as _Spine
+from matplotlib.text import Text as _Text
+from matplotlib.transforms import BboxBase as _BboxBase
+
+from ..brand import contrast as _contrast
+from ..runtime.executor import map_tasks as _map_tasks
+from ..runtime.executor import plan_workers as _plan_workers
+from ..runtime.trace import span as _span
+from ..runtime.trace import traced as _traced
 
 _PRESETS: dict[str, dict[str, float]] = {
     "one_col": {"width": 3.4, "height": 2.2, "font_scale": 1.0},
@@ -15,6 +45,27 @@ _PRESETS: dict[str, dict[str, float]] = {
     "slide_16x9": {"width": 10.0, "height": 5.625, "font_scale": 1.25},
 }
 
+_RASTER_FORMATS = frozenset({"png", "jpg", "jpeg", "tif", "tiff"})
+_VECTOR_FORMATS = frozenset({"pdf", "svg", "svgz", "eps", "ps"})
+_AUTO_RASTERIZE_THRESHOLD = 50_000
+_HEAVY_LINE_VERTICES = 100_000
+_AGG_PATH_CHUNKSIZE = 10_000
+_PAGE_SIZE = _os.sysconf("SC_PAGE_SIZE") if hasattr(_os, "sysconf") else 4096
+# Writer metadata that ``optimize`` drops; caller-supplied metadata still wins.
+_STRIPPED_METADATA: dict[str, dict[str, Any]] = {
+    "pdf": {"Creator": None, "Producer": None, "CreationDate": None},
+    "svg": {"Creator": None, "Date": None, "Format": None, "Type": None},
+}
+_SVG_PATH_DATA = _re.compile(rb'(\sd=")([^"]*)(")')
+_SVG_POSITION = _re.compile(rb'(\s[xy]=")(-?\d+\.\d+)(")')
+_SVG_DECIMAL = _re.compile(rb"-?\d+\.\d+")
+_PDF_FONT_NAME = _re.compile(rb"/FontName\s*/([^\s/<>\[\]()]+)")
+# WCAG 2 minimum contrast for body text and for large (>= 18 pt, or 14 pt bold) text.
+_MIN_TEXT_CONTRAST = 4.5
+_MIN_LARGE_TEXT_CONTRAST = 3.0
+# CIEDE2000 difference below which same-styled lines are easy to confuse.
+_MIN_LINE_DELTA_E = 10.0
+
 
 def get_figure_preset(target: str) -> dict[str, float]:
     """Return figure preset settings for a named target.
@@ -39,9 +90,17 @@ def _style_context(
     embed_fonts: bool,
     font_family: str | None,
     base_fontsize: float | None,
+    max_compression: bool = False,
+    chunk_paths: bool = False,
 ) -> Any:
     """Apply temporary rcParams for export-time typography behavior."""
     updates: dict[str, Any] = {}
+    if max_compression:
+        updates["pdf.compression"] = 9
+    if chunk_paths:
+        # Long paths otherwise overflow Agg's cell blocks and render slowly.
+        updates["agg.path.chunksize"] = _AGG_PATH_CHUNKSIZE
+        updates["path.simplify"] = True
     if embed_fonts:
         updates["pdf.fonttype"] = 42
         updates["ps.fonttype"] = 42
@@ -50,12 +109,19 @@ def _style_context(
         updates["font.family"] = font_family
     if base_fontsize is not None:
         updates["font.size"] = base_fontsize
+    if _mpl.rcParams["svg.hashsalt"] is None:
+        # Stable SVG element ids keep repeated and parallel exports byte-identical.
+        updates["svg.hashsalt"] = "drcutils"
     with _mpl.rc_context(updates):
         yield
 
 
-def _audit_figure(fig: Figure, min_fontsize: float = 6.0) -> list[str]:
-    """Collect non-fatal quality warnings for the figure."""
+def _audit_figure(fig: Figure, min_fontsize: float = 6.0, renderer: Any = None) -> list[str]:
+    """Collect non-fatal quality warnings for the figure.
+
+    When ``renderer`` comes from a layout pass that was already run, the
+    legend-overlap check reuses it instead of drawing the figure again.
+    """
     warnings: list[str] = []
 
     text_sizes = [
@@ -73,9 +139,141 @@ def _audit_figure(fig: Figure, min_fontsize: float = 6.0) -> list[str]:
         if has_data and not ax.get_ylabel():
             warnings.append(f"Axis {idx} is missing a y-label.")
 
+    warnings.extend(_audit_legends(fig, renderer))
+    warnings.extend(_audit_colors(fig))
+    return warnings
+
+
+def _over(color: Any, under: tuple[float, ...]) -> tuple[float, ...]:
+    """Composite an RGBA color over an opaque RGB(A) background."""
+    rgba = _mpc.to_rgba(color)
+    alpha = rgba[3]
+    return tuple(alpha * c + (1 - alpha) * u for c, u in zip(rgba[:3], under[:3], strict=True))
+
+
+def _text_backgrounds(fig: Figure) -> tuple[list[_Text], dict[int, tuple[float, ...]]]:
+    """Return visible, non-empty texts and the opaque color drawn behind each."""
+    face = fig.patch.get_facecolor() if fig.patch.get_visible() else (1.0, 1.0, 1.0, 0.0)
+    figure_bg = _over(face, (1.0, 1.0, 1.0))
+    texts = [
+        text for text in fig.findobj(match=_Text) if text.get_visible() and text.get_text().strip()
+    ]
+    backgrounds = {id(text): figure_bg for text in texts}
+
+    legends = list(fig.legends)
+    for ax in fig.axes:
+        axes_bg = (
+            _over(ax.patch.get_facecolor(), figure_bg) if ax.patch.get_visible() else figure_bg
+        )
+        for text in ax.texts:
+            if id(text) in backgrounds:
+                backgrounds[id(text)] = axes_bg
+        legend = ax.get_legend()
+        if legend is not None:
+            legends.append(legend)
+            for text in [*legend.get_texts(), legend.get_title()]:
+                if id(text) in backgrounds:
+                    backgrounds[id(text)] = axes_bg
+    for legend in legends:
+        frame = legend.get_frame()
+        if not frame.get_visible():
+            continue
+        for text in [*legend.get_texts(), legend.get_title()]:
+            if id(text) in backgrounds:
+                backgrounds[id(text)] = _over(frame.get_facecolor(), backgrounds[id(text)])
+
+    for text in texts:
+        patch = text.get_bbox_patch()
+        if patch is not None and patch.get_visible():
+            backgrounds[id(text)] = _over(patch.get_facecolor(), backgrounds[id(text)])
+    return texts, backgrounds
+
+
+def _audit_colors(fig: Figure) -> list[str]:
+    """Check text contrast and whether same-styled lines can be told apart.
+
+    Colors are deduplicated and compared as whole matrices, so the cost barely
+    depends on how many tick labels or lines the figure has.
+    """
+    warnings: list[str] = []
+    texts, backgrounds = _text_backgrounds(fig)
+    if texts:
+        bg = [_mpc.to_hex(backgrounds[id(text)]) for text in texts]
+        fg = [_mpc.to_hex(_over(text.get_color(), backgrounds[id(text)])) for text in texts]
+        fg_index = {color: idx for idx, color in enumerate(dict.fromkeys(fg))}
+        bg_index = {color: idx for idx, color in enumerate(dict.fromkeys(bg))}
+        ratios = _contrast.contrast_matrix(list(fg_index), list(bg_index))
+        low: dict[tuple[str, str, float], list[tuple[float, str]]] = {}
+        for text, fg_hex, bg_hex in zip(texts, fg, bg, strict=True):
+            weight = text.get_fontweight()
+            bold = weight in ("bold", "heavy", "extra bold", "black") or (
+                isinstance(weight, int | float) and weight >= 700
+            )
+            large = text.get_fontsize() >= 18 or (bold and text.get_fontsize() >= 14)
+            threshold = _MIN_LARGE_TEXT_CONTRAST if large else _MIN_TEXT_CONTRAST
+            ratio = float(ratios[fg_index[fg_hex], bg_index[bg_hex]])
+            if ratio < threshold:
+                low.setdefault((fg_hex, bg_hex, threshold), []).append((ratio, text.get_text()))
+        for (fg_hex, bg_hex, threshold), hits in low.items():
+            ratio, label = min(hits)
+            warnings.append(
+                f"{len(hits)} text element(s) in {fg_hex} on {bg_hex} have contrast "
+                f"{ratio:.1f}:1, below {threshold:g}:1 (e.g. {label!r})."
+            )
+
+    groups: list[tuple[int, list[_Line2D]]] = []
+    for idx, ax in enumerate(fig.axes):
+        styled: dict[tuple[Any, Any], list[_Line2D]] = {}
+        for line in ax.get_lines():
+            if line.get_visible() and not str(line.get_label()).startswith("_"):
+                styled.setdefault((line.get_linestyle(), line.get_marker()), []).append(line)
+        groups.extend((idx, lines) for lines in styled.values() if len(lines) > 1)
+    if not groups:
+        return warnings
+
+    # One matrix per vision type over the figure's unique line colors.
+    color_index: dict[str, int] = {}
+    for _, lines in groups:
+        for line in lines:
+            color_index.setdefault(_mpc.to_hex(line.get_color()), len(color_index))
+    palette = list(color_index)
+    distances = {"normal vision": _contrast.delta_e_matrix(palette)}
+    for deficiency in ("protanopia", "deuteranopia", "tritanopia"):
+        distances[deficiency] = _contrast.cvd_delta_e_matrix(palette, deficiency=deficiency)
+    confusable: dict[tuple[str, str, str, float], list[int]] = {}
+    for idx, lines in groups:
+        for first in range(len(lines)):
+            for second in range(first + 1, len(lines)):
+                i = color_index[_mpc.to_hex(lines[first].get_color())]
+                j = color_index[_mpc.to_hex(lines[second].get_color())]
+                vision, distance = min(
+                    ((name, float(matrix[i, j])) for name, matrix in distances.items()),
+                    key=lambda item: item[1],
+                )
+                if distance < _MIN_LINE_DELTA_E:
+                    key = (
+                        str(lines[first].get_label()),
+                        str(lines[second].get_label()),
+                        vision,
+                        round(distance, 1),
+                    )
+                    confusable.setdefault(key, []).append(idx)
+    for (first_label, second_label, vision, distance), axes in confusable.items():
+        where = "Axis" if len(axes) == 1 else "Axes"
+        warnings.append(
+            f"{where} {', '.join(map(str, axes))} lines {first_label!r} and {second_label!r} "
+            f"are hard to tell apart under {vision} (CIEDE2000 {distance:.1f})."
+        )
+    return warnings
+
+
+def _audit_legends(fig: Figure, renderer: Any = None) -> list[str]:
+    """Check legend placement against a laid-out renderer."""
+    warnings: list[str] = []
     try:
-        fig.canvas.draw()
-        renderer = fig.canvas.get_renderer()
+        if renderer is None:
+            fig.canvas.draw()
+            renderer = fig.canvas.get_renderer()
         for idx, ax in enumerate(fig.axes):
             legend = ax.get_legend()
             if legend is None:
@@ -86,10 +284,389 @@ def _audit_figure(fig: Figure, min_fontsize: float = 6.0) -> list[str]:
                 warnings.append(f"Axis {idx} legend may overlap plot area.")
     except Exception:
         warnings.append("Figure audit skipped legend-overlap check due to renderer limitations.")
-
     return warnings
 
 
+@contextmanager
+def _count_draws(fig: Figure) -> Iterator[list[int]]:
+    """Count full figure draws (including layout-only passes) while active."""
+    counter = [0]
+
+    def _on_draw(_event: Any) -> None:
+        counter[0] += 1
+
+    cid = fig.canvas.mpl_connect("draw_event", _on_draw)
+    try:
+        yield counter
+    finally:
+        fig.canvas.mpl_disconnect(cid)
+
+
+def _layout_pass(fig: Figure) -> Any:
+    """Run one draw without rasterizing so positions and extents are resolved."""
+    try:
+        fig.draw_without_rendering()
+        return fig.canvas.get_renderer()
+    except Exception:
+        return None
+
+
+@contextmanager
+def _frozen_layout(fig: Figure) -> Iterator[None]:
+    """Keep savefig from re-running the layout engine after a layout pass."""
+    engine = fig.get_layout_engine()
+    if engine is None:
+        yield
+        return
+    fig.set_layout_engine(None)
+    if fig.get_layout_engine() is not None:
+        # rcParams re-selected an engine; a placeholder at least keeps positions fixed.
+        fig.set_layout_engine("none")
+    try:
+        yield
+    finally:
+        fig.set_layout_engine(engine)
+
+
+def _save_output(fig: Figure, out_path: Path, save_kwargs: dict[str, Any]) -> Path:
+    """Save one output for a figure that already has its target layout."""
+    with _frozen_layout(fig):
+        fig.savefig(out_path, **save_kwargs)
+    return out_path
+
+
+def _current_rss_bytes() -> int | None:
+    """Return this process's resident set size from ``/proc/self/statm``, if present."""
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+@contextmanager
+def _rss_watch(interval: float = 0.001) -> Iterator[dict[str, int]]:
+    """Sample the resident set size in a background thread while the block runs.
+
+    On exit the yielded dict holds ``peak_rss_bytes`` (the highest sample,
+    taken at least every ``interval`` seconds the GIL allows, plus one at each
+    end) and ``rss_growth_bytes`` (that peak minus the size at entry). It stays
+    empty where ``/proc/self/statm`` is unavailable.
+    """
+    report: dict[str, int] = {}
+    first = _current_rss_bytes()
+    if first is None:
+        yield report
+        return
+    highest = [first]
+    stop = _threading.Event()
+
+    def sample() -> None:
+        while not stop.wait(interval):
+            highest[0] = max(highest[0], _current_rss_bytes() or 0)
+
+    watcher = _threading.Thread(target=sample, name="drcutils-rss", daemon=True)
+    watcher.start()
+    try:
+        yield report
+    finally:
+        stop.set()
+        watcher.join()
+        peak = max(highest[0], _current_rss_bytes() or 0)
+        report.update(peak_rss_bytes=peak, rss_growth_bytes=peak - first)
+
+
+def _round_decimal(value: bytes, precision: int) -> bytes:
+    text = f"{float(value):.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return b"0" if text == "-0" else text.encode("ascii")
+
+
+def _minify_svg(out_path: Path, precision: int) -> int:
+    """Round SVG path data and positions to ``precision`` decimals; return bytes saved."""
+    original = out_path.read_bytes()
+
+    def path_data(match: _re.Match[bytes]) -> bytes:
+        data = _SVG_DECIMAL.sub(
+            lambda number: _round_decimal(number.group(0), precision), match.group(2)
+        )
+        data = _re.sub(rb"\s*([MLQCZmlqcz])\s*", rb"\1", _re.sub(rb"\s+", b" ", data))
+        return match.group(1) + data.strip() + match.group(3)
+
+    def position(match: _re.Match[bytes]) -> bytes:
+        return match.group(1) + _round_decimal(match.group(2), precision) + match.group(3)
+
+    data = _SVG_PATH_DATA.sub(path_data, original)
+    data = _SVG_POSITION.sub(position, data)
+    # Only indentation between tags is dropped, never text content.
+    data = _re.sub(rb">\n\s*<", b"><", data)
+    out_path.write_bytes(data)
+    return len(original) - len(data)
+
+
+def _pdf_fonts(out_path: Path) -> list[dict[str, Any]]:
+    """List embedded PDF fonts; subset fonts carry a six-letter ``ABCDEF+`` tag."""
+    names = dict.fromkeys(
+        name.decode("latin-1") for name in _PDF_FONT_NAME.findall(out_path.read_bytes())
+    )
+    return [
+        {"name": name.split("+", 1)[-1], "subset": _re.match(r"[A-Z]{6}\+", name) is not None}
+        for name in names
+    ]
+
+
+def _optimize_output(out_path: Path, ext: str, svg_precision: int) -> dict[str, Any]:
+    """Run the post-save size optimization for one output file.
+
+    Only SVG reports ``bytes_saved``: PDF is shrunk while saving (compression
+    level and metadata), so its savings are not measured after the fact.
+    """
+    report: dict[str, Any] = {}
+    if ext == "svg":
+        report["bytes_saved"] = _minify_svg(out_path, svg_precision)
+    elif ext == "pdf":
+        report["fonts"] = _pdf_fonts(out_path)
+    return report
+
+
+def _timed_save(
+    fig: Figure,
+    out_path: Path,
+    save_kwargs: dict[str, Any],
+    svg_precision: int | None = None,
+) -> dict[str, Any]:
+    """Save one output and split its wall time at the figure's ``draw_event``.
+
+    When ``svg_precision`` is given the output is optimized after saving and
+    the optimization time counts as encode time. Memory is the resident set
+    size sampled during the save; ``tracemalloc`` would slow saves several
+    times over and misses the Agg render buffers.
+    """
+    drawn: list[float] = []
+    cid = fig.canvas.mpl_connect("draw_event", lambda _event: drawn.append(_perf_counter()))
+    with _rss_watch() as memory:
+        start = _perf_counter()
+        try:
+            _save_output(fig, out_path, save_kwargs)
+        finally:
+            fig.canvas.mpl_disconnect(cid)
+        optimized = (
+            _optimize_output(out_path, save_kwargs["format"], svg_precision)
+            if svg_precision is not None
+            else {}
+        )
+        end = _perf_counter()
+    draw_end = drawn[-1] if drawn else end
+    return {
+        "file": out_path,
+        "seconds": end - start,
+        "draw_seconds": draw_end - start,
+        "encode_seconds": end - draw_end,
+        "draws": len(drawn),
+        "bytes": out_path.stat().st_size,
+        "peak_rss_bytes": memory.get("peak_rss_bytes"),
+        "rss_growth_bytes": memory.get("rss_growth_bytes"),
+        **optimized,
+    }
+
+
+@contextmanager
+def _source_date_epoch(value: str | None) -> Iterator[None]:
+    """Set or clear ``SOURCE_DATE_EPOCH`` for one task, then restore it.
+
+    Shared worker processes outlive one export and keep the environment they
+    started with, so the parent's value is passed with each task.
+    """
+    previous = _os.environ.pop("SOURCE_DATE_EPOCH", None)
+    if value is not None:
+        _os.environ["SOURCE_DATE_EPOCH"] = value
+    try:
+        yield
+    finally:
+        _os.environ.pop("SOURCE_DATE_EPOCH", None)
+        if previous is not None:
+            _os.environ["SOURCE_DATE_EPOCH"] = previous
+
+
+def _render_output_worker(
+    fig_bytes: bytes,
+    rc_params: dict[str, Any],
+    source_date_epoch: str,
+    style: dict[str, Any],
+    out_path: Path,
+    save_kwargs: dict[str, Any],
+    svg_precision: int | None,
+) -> dict[str, Any]:
+    """Unpickle a laid-out figure under the parent's rcParams and render one output."""
+    with (
+        _source_date_epoch(source_date_epoch),
+        _mpl.rc_context(rc_params),
+        _style_context(**style),
+    ):
+        fig = _pickle.loads(fig_bytes)
+        return _timed_save(fig, out_path, save_kwargs, svg_precision)
+
+
+def _profile_save(
+    fig: Figure, style: dict[str, Any], size: list[float], save_kwargs: dict[str, Any]
+) -> dict[str, Any]:
+    """Replay one save in memory under cProfile and summarize the hottest calls.
+
+    The layout engine stays active so the replay re-derives the target's layout.
+    """
+    profiler = _cProfile.Profile()
+    buffer = _io.BytesIO()
+    with _style_context(**style):
+        fig.set_size_inches(*size)
+        start = _perf_counter()
+        profiler.enable()
+        try:
+            fig.savefig(buffer, **save_kwargs)
+        finally:
+            profiler.disable()
+        seconds = _perf_counter() - start
+    stream = _io.StringIO()
+    _pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(30)
+    return {"profile_seconds": seconds, "stats": stream.getvalue()}
+
+
+def _pinned_metadata(
+    ext: str, metadata: dict[str, Any] | None, created: datetime
+) -> dict[str, Any] | None:
+    """Pin creation dates so repeated and parallel saves produce identical bytes."""
+    if _os.getenv("SOURCE_DATE_EPOCH"):
+        return metadata
+    if ext == "pdf":
+        return {"CreationDate": created, **(metadata or {})}
+    if ext == "svg":
+        return {"Date": created.isoformat(), **(metadata or {})}
+    return metadata
+
+
+def _resolve_rasterize_threshold(auto_rasterize: bool | int) -> int | None:
+    """Resolve the ``auto_rasterize`` policy to an element threshold."""
+    if isinstance(auto_rasterize, bool):
+        return _AUTO_RASTERIZE_THRESHOLD if auto_rasterize else None
+    if auto_rasterize <= 0:
+        raise ValueError("auto_rasterize must be a boolean or a positive element threshold.")
+    return int(auto_rasterize)
+
+
+def _artist_elements(artist: Any) -> tuple[int, int]:
+    """Return the ``(vertices, markers)`` an artist emits in vector output."""
+    if isinstance(artist, _Line2D):
+        points = len(artist.get_xydata())
+        drawn_line = artist.get_linestyle() not in {"None", "", " "}
+        drawn_markers = artist.get_marker() not in {None, "None", "none", "", " "}
+        return (points if drawn_line else 0), (points if drawn_markers else 0)
+    if isinstance(artist, _QuadMesh):
+        rows, cols = artist.get_coordinates().shape[:2]
+        return rows * cols, 0
+    paths = artist.get_paths()
+    vertices = sum(len(path.vertices) for path in paths)
+    offsets = len(artist.get_offsets())
+    return vertices, (offsets if offsets > 1 else 0)
+
+
+def _heavy_artists(fig: Figure, threshold: int) -> list[tuple[Any, dict[str, Any]]]:
+    """Find vector data artists whose vertex and marker count exceeds ``threshold``."""
+    heavy: list[tuple[Any, dict[str, Any]]] = []
+    for axes_idx, ax in enumerate(fig.axes):
+        for artist in ax.get_children():
+            if not isinstance(artist, (_Collection, _Line2D)) or artist.get_rasterized():
+                continue
+            vertices, markers = _artist_elements(artist)
+            if vertices + markers <= threshold:
+                continue
+            label = str(artist.get_label())
+            info = {
+                "axes": axes_idx,
+                "artist": type(artist).__name__,
+                "label": None if label.startswith("_") else label,
+                "vertices": vertices,
+                "markers": markers,
+            }
+            heavy.append((artist, info))
+    return heavy
+
+
+def _heavy_lines(fig: Figure) -> list[tuple[_Line2D, dict[str, Any]]]:
+    """Find lines with more than ``_HEAVY_LINE_VERTICES`` vertices."""
+    heavy: list[tuple[_Line2D, dict[str, Any]]] = []
+    for axes_idx, ax in enumerate(fig.axes):
+        for line in ax.get_lines():
+            vertices = len(line.get_xydata())
+            if vertices <= _HEAVY_LINE_VERTICES:
+                continue
+            label = str(line.get_label())
+            info = {
+                "axes": axes_idx,
+                "label": None if label.startswith("_") else label,
+                "vertices": vertices,
+                "decimated": {},
+            }
+            heavy.append((line, info))
+    return heavy
+
+
+def _minmax_keep(line: _Line2D, scale: float) -> _np.ndarray | None:
+    """Indices of the first, last, min and max sample per output pixel column.
+
+    Returns ``None`` when the line cannot be decimated without changing how it
+    looks: markers, step draw styles, non-finite samples, or x values that are
+    not monotonic on screen.
+    """
+    if line.get_marker() not in {None, "None", "none", "", " "}:
+        return None
+    if line.get_drawstyle() != "default":
+        return None
+    xy = line.get_xydata()
+    if not _np.isfinite(xy).all():
+        return None
+    columns = _np.floor(line.get_transform().transform(xy)[:, 0] * scale).astype(_np.int64)
+    steps = _np.diff(columns)
+    if not ((steps >= 0).all() or (steps <= 0).all()):
+        return None
+    # Off-axes samples collapse into one column on each side of the axes.
+    bounds = _np.floor(_np.array([line.axes.bbox.x0, line.axes.bbox.x1]) * scale).astype(_np.int64)
+    _np.clip(columns, bounds[0] - 1, bounds[1] + 1, out=columns)
+
+    y = xy[:, 1]
+    starts = _np.flatnonzero(_np.diff(columns)) + 1
+    starts = _np.concatenate(([0], starts))
+    ends = _np.concatenate((starts[1:], [len(y)])) - 1
+    segment = _np.repeat(_np.arange(len(starts)), ends - starts + 1)
+
+    def first_match(values: _np.ndarray) -> _np.ndarray:
+        hits = _np.flatnonzero(y == values[segment])
+        owner = segment[hits]
+        return hits[_np.concatenate(([True], owner[1:] != owner[:-1]))]
+
+    lowest = first_match(_np.minimum.reduceat(y, starts))
+    highest = first_match(_np.maximum.reduceat(y, starts))
+    return _np.unique(_np.concatenate((starts, ends, lowest, highest)))
+
+
+def _measure_vector_baseline(
+    fig: Figure, heavy: list[tuple[Any, dict[str, Any]]], save_kwargs: dict[str, Any]
+) -> tuple[int, float]:
+    """Render one output in memory with the heavy artists left as vectors."""
+    for artist, _ in heavy:
+        artist.set_rasterized(False)
+    buffer = _io.BytesIO()
+    try:
+        start = _perf_counter()
+        with _frozen_layout(fig):
+            fig.savefig(buffer, **save_kwargs)
+        seconds = _perf_counter() - start
+    finally:
+        for artist, _ in heavy:
+            artist.set_rasterized(True)
+    return buffer.getbuffer().nbytes, seconds
+
+
+@_traced("export_figure")
 def export_figure(
     fig: Figure,
     outpath_stem: str | Path,
@@ -103,9 +680,19 @@ def export_figure(
     base_fontsize: float | None = None,
     embed_fonts: bool = True,
     metadata: dict[str, str] | None = None,
+    jobs: int | None = 1,
+    auto_rasterize: bool | int = False,
+    hook: Callable[[dict[str, Any]], None] | None = None,
+    profile: bool = False,
+    optimize: bool = False,
+    svg_precision: int = 2,
+    decimate: bool = False,
 ) -> dict[str, Any]:
     """Export a Matplotlib figure for publication presets.
 
+    Each target is laid out once: that pass supplies the tight bounding box
+    and the legend audit, so every output format then costs a single draw.
+
     Args:
         fig: Matplotlib figure object to export.
         outpath_stem: Base output path stem.
@@ -118,57 +705,694 @@ def export_figure(
         base_fontsize: Optional base font size override.
         embed_fonts: Whether to configure embedded/export-friendly fonts.
         metadata: Optional metadata mapping passed to savefig.
+        jobs: Number of worker processes used to render (target, format) pairs.
+            Workers receive a pickled copy of the laid-out figure and the
+            current rcParams; outputs are byte-identical to the serial path.
+            ``None`` uses the shared concurrency budget (one per usable core
+            by default), within available memory.
+        auto_rasterize: Rasterize data collections and lines whose vertex plus
+            marker count exceeds a threshold in vector outputs, at ``dpi``.
+            Axes, text, and lighter artists stay vector. ``True`` uses a
+            threshold of 50,000 elements; an integer sets the threshold.
+        hook: Optional callable receiving each instrumentation event as it is
+            recorded, e.g. to forward it to build metrics.
+        profile: Whether to replay the slowest save under cProfile and attach
+            the report as ``profile``.
+        optimize: Whether to shrink vector outputs: PDF streams are compressed
+            at the highest level, writer metadata (creator, producer, dates) is
+            dropped unless given in ``metadata``, and SVG path data and
+            positions are rounded to ``svg_precision`` decimals with
+            indentation removed. Embedded fonts are already subset to the
+            glyphs used; each PDF save event lists its ``fonts`` and a warning
+            is raised for any font embedded in full.
+        svg_precision: Decimal places kept in optimized SVG coordinates, in
+            points.
+        decimate: Whether to reduce lines with more than 100,000 vertices to
+            the first, last, minimum, and maximum sample per pixel column at
+            ``dpi`` for each target, so rendering cost is bounded by the output
+            width. Lines with markers, step styles, gaps, or non-monotonic x
+            are left intact. Heavy lines are always drawn with Agg path
+            chunking and path simplification.
 
     Returns:
-        A dictionary containing generated file paths, resolved settings, and warnings.
+        A dictionary containing generated file paths, resolved settings,
+        warnings, and ``draw_count`` (total figure draws, including one layout
+        pass per target), and ``stats``: one event per target layout
+        (``stage="layout"``) and per output (``stage="save"``) with wall
+        ``seconds``, ``draw_seconds`` versus ``encode_seconds`` (split at the
+        figure's draw event), output ``bytes``, and the rendering process's
+        ``peak_rss_bytes`` during that save and its ``rss_growth_bytes`` over
+        the save's start (both ``None`` off Linux). When ``auto_rasterize`` is enabled, ``rasterized``
+        lists the rasterized ``artists`` and per-format ``savings`` for the
+        first target, measured against an in-memory all-vector render.
+        With ``profile=True``, ``profile`` holds the slowest save's target,
+        format, and a cumulative-time cProfile summary. With ``optimize=True``
+        SVG save events also report ``bytes_saved`` by post-processing.
+        When heavy lines are found, ``heavy_lines`` lists them with their
+        ``vertices`` and the per-target ``decimated`` vertex counts.
+
+    Raises:
+        ValueError: If ``auto_rasterize`` is a non-positive threshold or
+            ``svg_precision`` is negative.
     """
     targets = ["one_col"] if targets is None else targets
     formats = ["pdf", "png"] if formats is None else formats
+    threshold = _resolve_rasterize_threshold(auto_rasterize)
+    if svg_precision < 0:
+        raise ValueError("svg_precision must be a non-negative number of decimals.")
+    optimize_precision = svg_precision if optimize else None
 
     stem = Path(outpath_stem)
     stem.parent.mkdir(parents=True, exist_ok=True)
 
     output_files: list[Path] = []
     resolved_settings: dict[str, dict[str, Any]] = {}
-    warnings = _audit_figure(fig)
-
-    for target in targets:
-        preset = get_figure_preset(target)
-        width = preset["width"]
-        height = preset["height"]
-        font_scale = preset["font_scale"]
-        resolved_fontsize = (
-            base_fontsize if base_fontsize is not None else _mpl.rcParams["font.size"]
-        ) * font_scale
-
-        with _style_context(
-            embed_fonts=embed_fonts, font_family=font_family, base_fontsize=resolved_fontsize
-        ):
-            fig.set_size_inches(width, height)
-            resolved_settings[target] = {
-                "size_inches": [width, height],
-                "font_scale": font_scale,
-                "fontsize": resolved_fontsize,
-                "transparent": transparent,
-                "tight": tight,
-            }
-            for fmt in formats:
-                ext = fmt.lower()
-                out_path = stem.parent / f"{stem.name}__{target}.{ext}"
-                save_kwargs: dict[str, Any] = {
-                    "format": ext,
-                    "transparent": transparent,
-                    "metadata": metadata,
+    warnings: list[str] = []
+    created = datetime.now(UTC).replace(microsecond=0)
+    workers = _plan_workers(jobs, len(targets) * len(formats), processes=True)
+    parallel = workers > 1
+    rc_params = {key: value for key, value in _mpl.rcParams.items() if key != "backend"}
+    epoch = _os.environ.get("SOURCE_DATE_EPOCH") or str(int(created.timestamp()))
+    tasks: list[tuple[Any, ...]] = []
+    task_labels: list[dict[str, str]] = []
+    stats: list[dict[str, Any]] = []
+    replays: dict[Path, tuple[dict[str, Any], list[float], dict[str, Any]]] = {}
+    profile_report: dict[str, Any] | None = None
+
+    def record(event: dict[str, Any]) -> None:
+        stats.append(event)
+        for font in event.get("fonts", []):
+            if not font["subset"]:
+                message = f"Font '{font['name']}' is embedded in full in {event['file'].name}."
+                if message not in warnings:
+                    warnings.append(message)
+        if hook is not None:
+            hook(event)
+
+    baselines: dict[str, tuple[int, float]] = {}
+    heavy = _heavy_artists(fig, threshold) if threshold is not None else []
+    lines = _heavy_lines(fig)
+    line_data = [line.get_data(orig=True) for line, _ in lines]
+    for artist, _ in heavy:
+        artist.set_rasterized(True)
+
+    try:
+        with _count_draws(fig) as draws:
+            for target_idx, target in enumerate(targets):
+                preset = get_figure_preset(target)
+                width = preset["width"]
+                height = preset["height"]
+                font_scale = preset["font_scale"]
+                resolved_fontsize = (
+                    base_fontsize if base_fontsize is not None else _mpl.rcParams["font.size"]
+                ) * font_scale
+                style = {
+                    "embed_fonts": embed_fonts,
+                    "font_family": font_family,
+                    "base_fontsize": resolved_fontsize,
+                    "max_compression": optimize,
+                    "chunk_paths": bool(lines),
+                }
+
+                with _style_context(**style):
+                    if decimate:
+                        for (line, _), (xdata, ydata) in zip(lines, line_data, strict=True):
+                            line.set_data(xdata, ydata)
+                    fig.set_size_inches(width, height)
+                    layout_start = _perf_counter()
+                    with _span("export_figure.layout", target=target):
+                        renderer = _layout_pass(fig)
+                    with _span("export_figure.audit", target=target):
+                        audit = (
+                            _audit_figure(fig, renderer=renderer)
+                            if target_idx == 0
+                            else _audit_legends(fig, renderer)
+                        )
+                    warnings.extend(item for item in audit if item not in warnings)
+                    bbox: Any = None
+                    if tight:
+                        bbox = "tight"
+                        if renderer is not None:
+                            pad = _mpl.rcParams["savefig.pad_inches"]
+                            bbox = fig.get_tightbbox(renderer).padded(pad)
+                    if decimate:
+                        for (line, info), (xdata, ydata) in zip(lines, line_data, strict=True):
+                            keep = _minmax_keep(line, dpi / fig.dpi)
+                            if keep is not None:
+                                line.set_data(_np.asarray(xdata)[keep], _np.asarray(ydata)[keep])
+                                info["decimated"][target] = len(keep)
+                    record(
+                        {
+                            "stage": "layout",
+                            "target": target,
+                            "seconds": _perf_counter() - layout_start,
+                        }
+                    )
+
+                    resolved_settings[target] = {
+                        "size_inches": [width, height],
+                        "font_scale": font_scale,
+                        "fontsize": resolved_fontsize,
+                        "transparent": transparent,
+                        "tight": tight,
+                    }
+                    fig_bytes = b""
+                    if parallel:
+                        with _frozen_layout(fig):
+                            fig_bytes = _pickle.dumps(fig)
+                    for fmt in formats:
+                        ext = fmt.lower()
+                        out_path = stem.parent / f"{stem.name}__{target}.{ext}"
+                        save_kwargs: dict[str, Any] = {
+                            "format": ext,
+                            "transparent": transparent,
+                            "metadata": _pinned_metadata(ext, metadata, created),
+                        }
+                        if optimize and ext in _STRIPPED_METADATA:
+                            save_kwargs["metadata"] = {
+                                **_STRIPPED_METADATA[ext],
+                                **(metadata or {}),
+                            }
+                        rasterized = bool(heavy) and ext in _VECTOR_FORMATS
+                        if ext in _RASTER_FORMATS or rasterized:
+                            save_kwargs["dpi"] = dpi
+                        if bbox is not None:
+                            save_kwargs["bbox_inches"] = bbox
+                        if rasterized and target_idx == 0:
+                            baselines[ext] = _measure_vector_baseline(fig, heavy, save_kwargs)
+                        replays[out_path] = (style, [width, height], save_kwargs)
+                        if parallel:
+                            tasks.append(
+                                (
+                                    fig_bytes,
+                                    rc_params,
+                                    epoch,
+                                    style,
+                                    out_path,
+                                    save_kwargs,
+                                    optimize_precision,
+                                )
+                            )
+                            task_labels.append({"target": target, "format": ext})
+                        else:
+                            with _span("export_figure.save", target=target, format=ext):
+                                event = _timed_save(fig, out_path, save_kwargs, optimize_precision)
+                            output_files.append(out_path)
+                            record({"stage": "save", "target": target, "format": ext, **event})
+        draw_count = draws[0]
+
+        if tasks:
+            with _span("export_figure.render", outputs=len(tasks), workers=workers):
+                events = _map_tasks(
+                    _render_output_worker, *zip(*tasks, strict=True), jobs=workers, processes=True
+                )
+                for labels, event in zip(task_labels, events, strict=True):
+                    output_files.append(event["file"])
+                    draw_count += event["draws"]
+                    record({"stage": "save", **labels, **event})
+
+        if profile and output_files:
+            slowest = max(
+                (event for event in stats if event["stage"] == "save"),
+                key=lambda event: event["seconds"],
+            )
+            final_size = fig.get_size_inches()
+            with _span("export_figure.profile"):
+                profile_report = {
+                    "target": slowest["target"],
+                    "format": slowest["format"],
+                    "seconds": slowest["seconds"],
+                    **_profile_save(fig, *replays[slowest["file"]]),
                 }
-                if ext in {"png", "jpg", "jpeg", "tif", "tiff"}:
-                    save_kwargs["dpi"] = dpi
+            fig.set_size_inches(final_size)
+    finally:
+        for artist, _ in heavy:
+            artist.set_rasterized(False)
+        for (line, _), (xdata, ydata) in zip(lines, line_data, strict=True):
+            line.set_data(xdata, ydata)
+
+    result: dict[str, Any] = {
+        "files": output_files,
+        "settings": resolved_settings,
+        "warnings": warnings,
+        "draw_count": draw_count,
+        "stats": stats,
+    }
+    if profile_report is not None:
+        result["profile"] = profile_report
+    if lines:
+        result["heavy_lines"] = [info for _, info in lines]
+    if threshold is not None:
+        savings: dict[str, dict[str, Any]] = {}
+        for ext, (vector_bytes, vector_seconds) in baselines.items():
+            out_path = stem.parent / f"{stem.name}__{targets[0]}.{ext}"
+            save = next(event for event in stats if event.get("file") == out_path)
+            size, seconds = save["bytes"], save["seconds"]
+            savings[ext] = {
+                "vector_bytes": vector_bytes,
+                "bytes": size,
+                "bytes_saved": vector_bytes - size,
+                "vector_seconds": vector_seconds,
+                "seconds": seconds,
+                "seconds_saved": vector_seconds - seconds,
+            }
+        result["rasterized"] = {
+            "threshold": threshold,
+            "artists": [info for _, info in heavy],
+            "savings": savings,
+        }
+    return result
+
+
+def export_figure_book(
+    figs: Iterable[Any],
+    path: str | Path,
+    *,
+    target: str = "one_col",
+    tight: bool = True,
+    font_family: str | None = None,
+    base_fontsize: float | None = None,
+    embed_fonts: bool = True,
+    metadata: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Export many figures as the pages of one PDF.
+
+    Pages are written through Matplotlib's ``PdfPages`` as they are produced,
+    and fonts are embedded once for the whole book with a single glyph subset.
+    Figures created from factories or pickles are closed after their page is
+    written, so memory stays flat for any number of pages when ``figs`` yields
+    factories or pickled figure paths.
+
+    Args:
+        figs: Iterable of Matplotlib figures, zero-argument factories returning
+            one, or paths to pickled figures.
+        path: Output PDF path.
+        target: Preset target applied to every page.
+        tight: Whether to crop each page to its tight bounding box.
+        font_family: Optional font family override.
+        base_fontsize: Optional base font size override.
+        embed_fonts: Whether to configure embedded/export-friendly fonts.
+        metadata: Optional PDF document metadata.
+
+    Returns:
+        A dictionary containing the output ``file``, the number of ``pages``,
+        resolved ``settings``, page-prefixed ``warnings``, and output ``bytes``.
+
+    Raises:
+        ValueError: If ``target`` is unknown, ``figs`` is empty, or a figure
+            source cannot be resolved.
+    """
+    # backend_pdf pulls in fontTools; keep it off the package import path.
+    from matplotlib.backends.backend_pdf import PdfPages as _PdfPages
+
+    preset = get_figure_preset(target)
+    out_path = Path(path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    resolved_fontsize = (
+        base_fontsize if base_fontsize is not None else _mpl.rcParams["font.size"]
+    ) * preset["font_scale"]
+    created = datetime.now(UTC).replace(microsecond=0)
+    warnings: list[str] = []
+    pages = 0
+
+    with (
+        _style_context(embed_fonts, font_family, resolved_fontsize),
+        _PdfPages(out_path, metadata=_pinned_metadata("pdf", metadata, created)) as book,
+    ):
+        for pages, source in enumerate(figs, start=1):
+            fig = _load_figure(source)
+            try:
+                fig.set_size_inches(preset["width"], preset["height"])
+                renderer = _layout_pass(fig)
+                warnings.extend(
+                    f"Page {pages}: {item}" for item in _audit_figure(fig, renderer=renderer)
+                )
+                save_kwargs: dict[str, Any] = {}
                 if tight:
                     save_kwargs["bbox_inches"] = "tight"
-                fig.savefig(out_path, **save_kwargs)
-                output_files.append(out_path)
+                    if renderer is not None:
+                        pad = _mpl.rcParams["savefig.pad_inches"]
+                        save_kwargs["bbox_inches"] = fig.get_tightbbox(renderer).padded(pad)
+                with _frozen_layout(fig):
+                    book.savefig(fig, **save_kwargs)
+            finally:
+                if fig is not source:
+                    _release_figure(fig)
+    if not pages:
+        # PdfPages only creates the file once a page is written.
+        raise ValueError("export_figure_book needs at least one figure.")
 
     return {
-        "files": output_files,
-        "settings": resolved_settings,
+        "file": out_path,
+        "pages": pages,
+        "settings": {
+            "size_inches": [preset["width"], preset["height"]],
+            "font_scale": preset["font_scale"],
+            "fontsize": resolved_fontsize,
+            "tight": tight,
+        },
         "warnings": warnings,
+        "bytes": out_path.stat().st_size,
     }
+
+
+_MANIFEST_VERSION = 2
+# Instrumentation-only settings that never change the exported bytes.
+_UNHASHED_SETTINGS = frozenset({"hook", "profile"})
+
+_FINGERPRINT_GETTERS = (
+    "get_visible",
+    "get_alpha",
+    "get_zorder",
+    "get_label",
+    "get_xydata",
+    "get_offsets",
+    "get_paths",
+    "get_sizes",
+    "get_array",
+    "get_cmap",
+    "get_clim",
+    "get_facecolor",
+    "get_edgecolor",
+    "get_color",
+    "get_linewidth",
+    "get_linestyle",
+    "get_marker",
+    "get_markersize",
+    "get_hatch",
+    "get_text",
+    "get_fontsize",
+    "get_fontfamily",
+    "get_fontweight",
+    "get_rotation",
+    "get_horizontalalignment",
+    "get_verticalalignment",
+    "get_extent",
+    "get_interpolation",
+    "get_xlim",
+    "get_ylim",
+    "get_xscale",
+    "get_yscale",
+    "get_ticklocs",
+)
+
+
+def _hash_value(digest: Any, value: Any, depth: int = 0) -> None:
+    """Feed a stable byte representation of an artist property into ``digest``."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        digest.update(repr(value).encode())
+    elif _np.ma.isMaskedArray(value):
+        _hash_value(digest, _np.ma.getdata(value), depth)
+        _hash_value(digest, _np.ma.getmaskarray(value), depth)
+    elif isinstance(value, _np.ndarray):
+        array = _np.ascontiguousarray(value)
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        digest.update(array.tobytes() if array.dtype != object else repr(array.tolist()).encode())
+    elif isinstance(value, _np.generic):
+        digest.update(repr(value.item()).encode())
+    elif isinstance(value, _BboxBase):
+        _hash_value(digest, tuple(value.bounds), depth)
+    elif isinstance(value, _MplPath):
+        _hash_value(digest, value.vertices, depth)
+        _hash_value(digest, value.codes, depth)
+    elif isinstance(value, _Colormap):
+        digest.update(value.name.encode())
+    elif isinstance(value, (list, tuple)) and depth < 3:
+        digest.update(b"[")
+        for item in value:
+            _hash_value(digest, item, depth + 1)
+        digest.update(b"]")
+    else:
+        digest.update(type(value).__qualname__.encode())
+
+
+def _iter_artists(artist: Any) -> Iterator[Any]:
+    """Walk the artist tree without materializing lazily created axis ticks."""
+    yield artist
+    if isinstance(artist, _Axis):
+        children = [artist.label, artist.offsetText]
+    else:
+        children = artist.get_children()
+    for child in children:
+        yield from _iter_artists(child)
+
+
+def _axis_tick_state(axis: _Axis) -> list[Any]:
+    """Return the tick label texts an axis will draw and its tick styling.
+
+    Labels come from the formatter applied to the tick locations, so fixed
+    labels and formatter changes are seen without creating tick artists.
+    """
+    labels = [
+        ticker.formatter.format_ticks(axis.get_ticklocs(minor=minor))
+        for minor, ticker in ((False, axis.major), (True, axis.minor))
+    ]
+    styles = [
+        sorted((key, repr(value)) for key, value in axis.get_tick_params(which=which).items())
+        for which in ("major", "minor")
+    ]
+    return [labels, styles]
+
+
+def _is_data_patch(artist: Any) -> bool:
+    """Return whether a patch's geometry is user data rather than draw-time layout."""
+    if not isinstance(artist, _Patch) or isinstance(artist, _Spine) or artist.axes is None:
+        return False
+    return bool(artist.get_transform().contains_branch(artist.axes.transData))
+
+
+def _figure_fingerprint(fig: Figure) -> str:
+    """Hash the visual state of a figure's artist tree.
+
+    Only a curated set of data and style getters is read, so the hash is cheap
+    and does not depend on the figure size, dpi, object identities, or whether
+    the figure has been drawn. Axis ticks are represented by their locations,
+    label texts, and styling.
+    """
+    digest = _hashlib.sha256()
+    for artist in _iter_artists(fig):
+        digest.update(type(artist).__qualname__.encode())
+        for name in _FINGERPRINT_GETTERS:
+            getter = getattr(artist, name, None)
+            if getter is None:
+                continue
+            try:
+                value = getter()
+            except Exception:
+                continue
+            digest.update(name.encode())
+            _hash_value(digest, value)
+        if isinstance(artist, _Axis):
+            _hash_value(digest, _axis_tick_state(artist))
+        if _is_data_patch(artist):
+            _hash_value(digest, artist.get_path())
+            _hash_value(digest, artist.get_patch_transform().get_matrix())
+    return digest.hexdigest()
+
+
+def _settings_fingerprint(target: str, export_kwargs: dict[str, Any]) -> str:
+    """Hash export settings that affect the outputs of one target."""
+    payload = {
+        "target": target,
+        "preset": get_figure_preset(target),
+        "kwargs": {
+            key: value for key, value in export_kwargs.items() if key not in _UNHASHED_SETTINGS
+        },
+        "matplotlib": _mpl.__version__,
+        "manifest": _MANIFEST_VERSION,
+    }
+    return _hashlib.sha256(
+        _json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def _load_figure(source: Any) -> Figure:
+    """Resolve a figure, zero-argument factory, or pickled figure path."""
+    if isinstance(source, Figure):
+        return source
+    if isinstance(source, (str, _os.PathLike)):
+        with open(source, "rb") as handle:
+            loaded = _pickle.load(handle)
+    elif callable(source):
+        loaded = source()
+    else:
+        raise ValueError(f"Unsupported figure source: {source!r}")
+    if not isinstance(loaded, Figure):
+        raise ValueError(f"Figure source {source!r} did not produce a Matplotlib figure.")
+    return loaded
+
+
+def _release_figure(fig: Figure) -> None:
+    """Close a figure created for export, whether or not pyplot manages it."""
+    import matplotlib.pyplot as _plt
+
+    _plt.close(fig)
+
+
+def _export_figure_worker(
+    fig_bytes: bytes,
+    rc_params: dict[str, Any],
+    outpath_stem: Path,
+    targets: list[str],
+    export_kwargs: dict[str, Any],
+    source_date_epoch: str | None,
+) -> tuple[dict[str, Any], float]:
+    """Unpickle a figure under the parent's rcParams and export it serially."""
+    with _source_date_epoch(source_date_epoch), _mpl.rc_context(rc_params):
+        fig = _pickle.loads(fig_bytes)
+        start = _perf_counter()
+        result = export_figure(fig, outpath_stem, targets=targets, **export_kwargs)
+    return result, _perf_counter() - start
+
+
+def export_figures(
+    figures: Mapping[str, Any],
+    out_dir: str | Path,
+    *,
+    targets: list[str] | None = None,
+    formats: list[str] | None = None,
+    jobs: int | None = 1,
+    force: bool = False,
+    manifest_path: str | Path | None = None,
+    **export_kwargs: Any,
+) -> dict[str, Any]:
+    """Export many figures with an incremental content-hash cache.
+
+    Each figure is fingerprinted from its artist tree and combined with the
+    export settings per target. Targets whose fingerprint matches the previous
+    build manifest and whose files still exist are skipped; the remaining
+    figures are exported across a process pool. Figures from factories and
+    pickles are loaded one at a time and closed once exported (or pickled
+    for a worker), so open figures do not accumulate.
+
+    Args:
+        figures: Mapping of output name to a Matplotlib figure, a zero-argument
+            factory returning one, or a path to a pickled figure.
+        out_dir: Directory for outputs named ``<name>__<target>.<ext>``.
+        targets: Preset targets to render for every figure.
+        formats: Output formats for every figure.
+        jobs: Number of worker processes. ``None`` uses the shared
+            concurrency budget (one per usable core by default), within
+            available memory.
+        force: Whether to ignore the cache and re-export everything.
+        manifest_path: Build manifest location. Defaults to
+            ``<out_dir>/manifest.json``.
+        **export_kwargs: Additional keyword arguments for :func:`export_figure`.
+
+    Returns:
+        The build manifest. ``figures`` maps each name to its ``hash``,
+        per-target ``keys``, ``files``, and ``target_warnings``, ``seconds``,
+        ``warnings`` (the distinct warnings of all targets), and the
+        ``rendered``/``cached`` target lists.
+
+    Raises:
+        ValueError: If a figure source cannot be resolved.
+    """
+    targets = ["one_col"] if targets is None else targets
+    formats = ["pdf", "png"] if formats is None else formats
+    export_kwargs = {"formats": formats, **export_kwargs}
+    root = Path(out_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest_file = root / "manifest.json" if manifest_path is None else Path(manifest_path)
+
+    previous: dict[str, Any] = {}
+    if manifest_file.exists() and not force:
+        try:
+            loaded = _json.loads(manifest_file.read_text(encoding="utf-8"))
+            if loaded.get("version") == _MANIFEST_VERSION:
+                previous = loaded.get("figures", {})
+        except (OSError, ValueError):
+            previous = {}
+
+    entries: dict[str, dict[str, Any]] = {}
+    workers = _plan_workers(jobs, len(figures), processes=True)
+    pending: list[tuple[str, bytes, list[str]]] = []
+    for name, source in figures.items():
+        fig = _load_figure(source)
+        try:
+            fig_hash = _figure_fingerprint(fig)
+            keys = {
+                target: _hashlib.sha256(
+                    (fig_hash + _settings_fingerprint(target, export_kwargs)).encode()
+                ).hexdigest()
+                for target in targets
+            }
+            prior = previous.get(name, {})
+            prior_keys = prior.get("keys", {})
+            prior_files = prior.get("files", {})
+            prior_warnings = prior.get("target_warnings", {})
+            stale = [
+                target
+                for target in targets
+                if prior_keys.get(target) != keys[target]
+                or not prior_files.get(target)
+                or not all(Path(path).exists() for path in prior_files[target])
+            ]
+            cached = [target for target in targets if target not in stale]
+            entries[name] = {
+                "hash": fig_hash,
+                "keys": keys,
+                "files": {target: prior_files[target] for target in cached},
+                "seconds": 0.0,
+                "target_warnings": {target: prior_warnings.get(target, []) for target in cached},
+                "rendered": stale,
+                "cached": cached,
+            }
+            entries[name]["warnings"] = _union_warnings(entries[name])
+            if stale and workers == 1:
+                start = _perf_counter()
+                result = export_figure(fig, root / name, targets=stale, **export_kwargs)
+                _merge_build_result(entries[name], result, _perf_counter() - start)
+            elif stale:
+                pending.append((name, _pickle.dumps(fig), stale))
+        finally:
+            if fig is not source:
+                _release_figure(fig)
+
+    if pending:
+        rc_params = {key: value for key, value in _mpl.rcParams.items() if key != "backend"}
+        results = _map_tasks(
+            _export_figure_worker,
+            [fig_bytes for _, fig_bytes, _ in pending],
+            [rc_params] * len(pending),
+            [root / name for name, _, _ in pending],
+            [stale for _, _, stale in pending],
+            [export_kwargs] * len(pending),
+            [_os.environ.get("SOURCE_DATE_EPOCH")] * len(pending),
+            jobs=workers,
+            processes=True,
+        )
+        for (name, _, _), (result, seconds) in zip(pending, results, strict=True):
+            _merge_build_result(entries[name], result, seconds)
+
+    manifest = {"version": _MANIFEST_VERSION, "figures": entries}
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    manifest_file.write_text(_json.dumps(manifest, indent=2, sort_keys=True) + "\n", "utf-8")
+    return manifest
+
+
+def _merge_build_result(entry: dict[str, Any], result: dict[str, Any], seconds: float) -> None:
+    """Fold one export_figure result into a build manifest entry.
+
+    Warnings are kept per target, so targets served from the cache keep theirs.
+    export_figure does not attribute warnings to targets, so each rebuilt
+    target records all warnings from its rebuild.
+    """
+    for target in result["settings"]:
+        entry["files"][target] = [
+            str(path) for path in result["files"] if path.stem.rsplit("__", 1)[-1] == target
+        ]
+        entry["target_warnings"][target] = list(result["warnings"])
+    entry["seconds"] = seconds
+    entry["warnings"] = _union_warnings(entry)
+
+
+def _union_warnings(entry: dict[str, Any]) -> list[str]:
+    """Return each distinct warning of an entry's targets once, in target order."""
+    return list(
+        dict.fromkeys(
+            warning
+            for target in entry["keys"]
+            for warning in entry["target_warnings"].get(target, [])
+        )
+    )
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import matplotlib.colors as mcolors
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.colors import Normalize
+
 import drcutils.brand as brand
 import drcutils.brand.colormaps as colormaps
+from drcutils.runtime import executor
 
 
 def test_lazy_colormaps_access_via_brand_getattr() -> None:
@@ -43,7 +50,138 @@ def test_colormap_sampling_returns_rgba() -> None:
     assert all(0.0 <= value <= 1.0 for value in rgba)
 
 
+def test_colormaps_are_built_lazily_from_packaged_table() -> None:
+    import importlib.util
+
+    spec = importlib.util.find_spec("drcutils.brand.colormaps")
+    fresh = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fresh)
+
+    assert "drc_cool" not in vars(fresh)
+    assert "drc_cool" in dir(fresh)
+    cmap = fresh.drc_cool
+    assert vars(fresh)["drc_cool"] is cmap
+    assert cmap.N == 256
+
+
+def test_packaged_table_matches_segment_definitions() -> None:
+    table = colormaps._load_table()
+    assert table.dtype == np.uint8
+    np.testing.assert_array_equal(table, colormaps._build_table())
+    samples = np.linspace(0.0, 1.0, 1001)
+    for name in colormaps._GRADIENTS:
+        packaged = getattr(colormaps, name)
+        segmented = colormaps._segmented_colormap(name)
+        np.testing.assert_array_equal(packaged(samples, bytes=True), segmented(samples, bytes=True))
+        np.testing.assert_allclose(packaged(samples), segmented(samples), atol=1 / 255)
+
+
+def test_gradients_stay_linear_segmented_when_resampled() -> None:
+    for name in colormaps._GRADIENTS:
+        packaged = getattr(colormaps, name)
+        assert isinstance(packaged, mcolors.LinearSegmentedColormap)
+        coarse = packaged.resampled(5)
+        assert isinstance(coarse, mcolors.LinearSegmentedColormap)
+        assert coarse.N == 5
+        # Resampling interpolates the gradient rather than picking table rows.
+        np.testing.assert_allclose(
+            coarse(np.arange(5)),
+            colormaps._segmented_colormap(name).resampled(5)(np.arange(5)),
+            atol=2 / 255,
+        )
+    assert colormaps.drc_cool_r.resampled(5)(0) == pytest.approx(colormaps.drc_cool(1.0))
+
+
+def test_reversed_colormaps_mirror_forward_maps() -> None:
+    for name in ("drc_palette", *colormaps._GRADIENTS):
+        forward = getattr(colormaps, name)
+        reverse = getattr(colormaps, f"{name}_r")
+        indices = np.arange(forward.N)
+        np.testing.assert_array_equal(reverse(indices), forward(indices[::-1]))
+
+
+def test_register_colormaps_adds_requested_names_only() -> None:
+    import matplotlib as mpl
+
+    for name in ("drc_warm", "drc_warm_r"):
+        if name in mpl.colormaps:
+            mpl.colormaps.unregister(name)
+    try:
+        assert colormaps.register_colormaps("drc_warm") == ["drc_warm"]
+        assert "drc_warm" in mpl.colormaps
+        assert "drc_warm_r" not in mpl.colormaps
+        assert colormaps.register_colormaps("drc_warm") == ["drc_warm"]
+
+        fig, ax = plt.subplots()
+        image = ax.imshow([[0.0, 1.0]], cmap="drc_warm")
+        assert image.get_cmap().name == "drc_warm"
+        plt.close(fig)
+    finally:
+        mpl.colormaps.unregister("drc_warm")
+
+
+def test_register_colormaps_rejects_unknown_names() -> None:
+    with pytest.raises(ValueError, match="Unknown brand colormap 'viridis'. Choose from"):
+        colormaps.register_colormaps("viridis")
+
+
 def test_legacy_hamster_names_are_removed() -> None:
     assert not hasattr(colormaps, "hamster")
     assert not hasattr(colormaps, "cool_hamster")
     assert not hasattr(colormaps, "warm_hamster")
+
+
+def test_apply_colormap_matches_matplotlib_bytes() -> None:
+    data = np.random.default_rng(0).normal(size=(40, 50))
+    data[0, :3] = [np.nan, -1.0, 1.0]
+
+    expected = colormaps.drc_diverging(Normalize(-1.0, 1.0)(data), bytes=True)
+    with executor.budget(2):
+        rgba = colormaps.apply_colormap(data, "drc_diverging", -1.0, 1.0, chunk_size=97, jobs=2)
+
+    np.testing.assert_array_equal(rgba, expected)
+    flat = colormaps.apply_colormap(np.zeros(4, dtype=np.float32), colormaps.drc_cool, 2.0, 2.0)
+    np.testing.assert_array_equal(flat, colormaps.drc_cool(np.zeros(4), bytes=True))
+
+
+def test_apply_colormap_writes_rgb_into_buffer() -> None:
+    data = np.ma.array(np.linspace(0.0, 1.0, 12).reshape(3, 4), mask=np.eye(3, 4, dtype=bool))
+    out = np.zeros((3, 4, 3), dtype=np.uint8)
+
+    result = colormaps.apply_colormap(data, "viridis", out=out)
+
+    assert result is out
+    expected = plt.get_cmap("viridis")(Normalize()(data), bytes=True)[..., :3]
+    np.testing.assert_array_equal(out, expected)
+
+
+def test_resolve_colormap_accepts_brand_and_matplotlib_names() -> None:
+    viridis = plt.get_cmap("viridis")
+
+    assert colormaps.resolve_colormap("drc_cool") is colormaps.drc_cool
+    assert colormaps.resolve_colormap("viridis").name == "viridis"
+    assert colormaps.resolve_colormap(viridis) is viridis
+    with pytest.raises(ValueError, match="Unknown colormap 'BLUE'"):
+        colormaps.resolve_colormap("BLUE")
+
+
+def test_apply_colormap_rejects_bad_buffers_and_names() -> None:
+    data = np.zeros((2, 2))
+    with pytest.raises(ValueError, match="out must be"):
+        colormaps.apply_colormap(data, "drc_cool", out=np.zeros((2, 2, 4), dtype=np.float32))
+    with pytest.raises(ValueError, match="Unknown colormap"):
+        colormaps.apply_colormap(data, "not_a_map")
+
+
+def test_apply_colormap_rejects_inverted_or_collapsed_limits() -> None:
+    ramp = np.linspace(0.0, 1.0, 5)
+    with pytest.raises(ValueError, match="must not be greater than vmax"):
+        colormaps.apply_colormap(ramp, "drc_cool", 1.0, 0.0)
+    with pytest.raises(ValueError, match="not constant"):
+        colormaps.apply_colormap(ramp, "drc_cool", 0.5, 0.5)
+    with pytest.raises(ValueError, match="not constant"):
+        colormaps.apply_colormap(ramp, "drc_cool", vmin=1.0)
+
+    flat = np.ma.array([3.0, 3.0, 9.0, np.nan], mask=[False, False, True, False])
+    rgba = colormaps.apply_colormap(flat, "drc_cool")
+    np.testing.assert_array_equal(rgba[:2], colormaps.drc_cool([0.0, 0.0], bytes=True))
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from drcutils import brand
+from drcutils.brand import contrast
+
+
+def test_contrast_matrix_matches_wcag_reference_values() -> None:
+    ratios = contrast.contrast_matrix(["#000000", "#ffffff", "#777777"])
+
+    assert ratios.shape == (3, 3)
+    assert ratios[0, 1] == pytest.approx(21.0)
+    assert ratios[2, 1] == pytest.approx(4.48, abs=0.01)
+    assert np.allclose(np.diag(ratios), 1.0)
+    assert np.allclose(ratios, ratios.T)
+    assert contrast.contrast_matrix(brand.BRAND_COLORS, "white").shape == (
+        len(brand.BRAND_COLORS),
+        1,
+    )
+
+
+def test_ciede2000_matches_sharma_reference_pairs() -> None:
+    # Reference pairs from Sharma, Wu & Dalal (2005), including the hue-wrap cases.
+    lab1 = np.array(
+        [
+            [50.0, 2.6772, -79.7751],
+            [50.0, 0.0, 0.0],
+            [50.0, 2.4900, -0.0010],
+            [50.0, 2.5, 0.0],
+            [50.0, 2.5, 0.0],
+            [60.2574, -34.0099, 36.2677],
+            [90.8027, -2.0831, 1.4410],
+            [2.0776, 0.0795, -1.1350],
+        ]
+    )
+    lab2 = np.array(
+        [
+            [50.0, 0.0, -82.7485],
+            [50.0, -1.0, 2.0],
+            [50.0, -2.4900, 0.0009],
+            [56.0, -27.0, -3.0],
+            [50.0, 0.0, -2.5],
+            [60.4626, -34.1751, 39.4387],
+            [91.1528, -1.6435, 0.0447],
+            [0.9033, -0.0636, -0.5514],
+        ]
+    )
+    expected = [2.0425, 2.3669, 7.1792, 31.9030, 4.3065, 1.2644, 1.4441, 0.9082]
+
+    assert contrast._ciede2000(lab1, lab2) == pytest.approx(expected, abs=1e-4)
+    assert contrast._ciede2000(lab2, lab1) == pytest.approx(expected, abs=1e-4)
+
+
+def test_delta_e_and_cvd_matrices_accept_colormaps() -> None:
+    from drcutils.brand.colormaps import drc_cool
+
+    distances = contrast.delta_e_matrix(drc_cool, ["white", "black"])
+    simulated = contrast.cvd_delta_e_matrix(drc_cool, deficiency="protanopia")
+
+    assert distances.shape == (drc_cool.N, 2)
+    assert simulated.shape == (drc_cool.N, drc_cool.N)
+    assert np.allclose(np.diag(simulated), 0.0)
+    assert np.allclose(
+        contrast.simulate_cvd(drc_cool, severity=0.0),
+        drc_cool(np.arange(drc_cool.N))[:, :3],
+        atol=1e-9,
+    )
+
+
+def test_simulate_cvd_merges_red_green_pairs() -> None:
+    normal = contrast.delta_e_matrix(["#d62728", "#2ca02c"])[0, 1]
+    deutan = contrast.cvd_delta_e_matrix(["#d62728", "#2ca02c"], deficiency="deuteranopia")[0, 1]
+    grays = contrast.simulate_cvd(["#808080"], "tritanopia")
+
+    assert deutan < normal / 2
+    assert np.allclose(grays, 128 / 255, atol=2e-3)
+
+
+def test_contrast_rejects_bad_inputs() -> None:
+    with pytest.raises(ValueError, match="Choose from"):
+        contrast.simulate_cvd(["red"], "achromatopsia")
+    with pytest.raises(ValueError, match="severity"):
+        contrast.simulate_cvd(["red"], severity=1.5)
+    with pytest.raises(ValueError, match="Invalid color"):
+        contrast.relative_luminance(["not-a-color"])
+    with pytest.raises(ValueError, match="shape"):
+        contrast.relative_luminance(np.zeros((2, 5)))
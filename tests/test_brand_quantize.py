@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from drcutils import brand
+
+
+def _oklab_nearest(pixels: np.ndarray, palette: list[str]) -> np.ndarray:
+    palette_rgb = brand._palette_rgb(palette) / 255.0
+    pixels_lab = brand._srgb_to_oklab(pixels.reshape(-1, 3) / 255.0)
+    palette_lab = brand._srgb_to_oklab(palette_rgb)
+    distance = ((pixels_lab[:, None, :] - palette_lab[None, :, :]) ** 2).sum(axis=-1)
+    return distance.argmin(axis=1).reshape(pixels.shape[:2])
+
+
+def _sequential_floyd_steinberg(pixels: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    cube = brand._palette_cube(palette.tobytes())
+    height, width = pixels.shape[:2]
+    work = pixels.astype(np.float32)
+    colors = palette.astype(np.float32)
+    indices = np.empty((height, width), dtype=np.uint8)
+    for y in range(height):
+        for x in range(width):
+            old = np.clip(work[y, x], 0.0, 255.0)
+            index = brand._cube_lookup(cube, np.rint(old).astype(np.uint8))
+            indices[y, x] = index
+            error = old - colors[index]
+            if x + 1 < width:
+                work[y, x + 1] += error * (7 / 16)
+            if y + 1 < height:
+                if x > 0:
+                    work[y + 1, x - 1] += error * (3 / 16)
+                work[y + 1, x] += error * (5 / 16)
+                if x + 1 < width:
+                    work[y + 1, x + 1] += error * (1 / 16)
+    return indices
+
+
+def test_quantize_maps_palette_colors_to_themselves() -> None:
+    image = brand.flag(size=[[1] * len(brand.COLORS), 1])
+    quantized = brand.quantize_to_palette(image)
+
+    assert quantized.mode == "P"
+    assert np.asarray(quantized).tolist() == [list(range(len(brand.COLORS)))]
+    assert quantized.convert("RGB").tobytes() == image.tobytes()
+
+
+def test_quantize_matches_exact_oklab_nearest_up_to_ties() -> None:
+    pixels = np.random.default_rng(0).integers(0, 256, size=(64, 64, 3), dtype=np.uint8)
+    quantized = np.asarray(brand.quantize_to_palette(pixels))
+    exact = _oklab_nearest(pixels, brand.COLORS)
+
+    assert (quantized == exact).mean() > 0.97
+
+
+def test_quantize_accepts_mappings_and_float_arrays() -> None:
+    pixels = np.full((2, 3, 3), [0.92, 0.52, 0.2])
+    quantized = brand.quantize_to_palette(pixels, brand.BRAND_COLORS)
+
+    assert np.all(np.asarray(quantized) == list(brand.BRAND_COLORS).index("orange"))
+
+
+def test_ordered_dither_mixes_colors_for_in_between_tones() -> None:
+    grey = np.full((16, 16, 3), 128, dtype=np.uint8)
+    palette = ["#000000", "#FFFFFF"]
+
+    flat = np.asarray(brand.quantize_to_palette(grey, palette))
+    ordered = np.asarray(brand.quantize_to_palette(grey, palette, dither="ordered"))
+
+    assert len(np.unique(flat)) == 1
+    assert 0.3 < ordered.mean() < 0.7
+
+
+def test_floyd_steinberg_matches_sequential_reference() -> None:
+    pixels = np.random.default_rng(1).integers(0, 256, size=(23, 31, 3), dtype=np.uint8)
+    quantized = brand.quantize_to_palette(pixels, dither="floyd_steinberg")
+
+    expected = _sequential_floyd_steinberg(pixels, brand._palette_rgb(brand.COLORS))
+    np.testing.assert_array_equal(np.asarray(quantized), expected)
+
+
+def test_quantize_keeps_transparency_and_writes_low_bit_png(tmp_path) -> None:
+    rgba = np.zeros((4, 4, 4), dtype=np.uint8)
+    rgba[:2] = [234, 133, 52, 255]
+    out = tmp_path / "quantized.png"
+
+    assert brand.quantize_to_palette(Image.fromarray(rgba), output_filepath=out) is None
+
+    # IHDR bit depth: seven palette entries fit in 4 bits.
+    assert out.read_bytes()[24] == 4
+    with Image.open(out) as reloaded:
+        assert reloaded.mode == "P"
+        assert reloaded.info["transparency"] == len(brand.COLORS)
+        alpha = np.asarray(reloaded.convert("RGBA"))[..., 3]
+    assert alpha[:2].min() == 255
+    assert alpha[2:].max() == 0
+
+
+def test_quantize_validation_errors() -> None:
+    pixels = np.zeros((2, 2, 3), dtype=np.uint8)
+    with pytest.raises(ValueError, match="Unsupported dither 'random'. Choose from"):
+        brand.quantize_to_palette(pixels, dither="random")
+    with pytest.raises(ValueError, match="palette must contain 1 to 256 colors"):
+        brand.quantize_to_palette(pixels, [])
+    with pytest.raises(ValueError, match="Invalid palette color"):
+        brand.quantize_to_palette(pixels, ["not-a-color"])
+    with pytest.raises(ValueError, match="image arrays must have shape"):
+        brand.quantize_to_palette(np.zeros((2, 2, 2), dtype=np.uint8))
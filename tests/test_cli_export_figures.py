@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import pickle
+import sys
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import pytest
+
+from drcutils.cli import export_figures as cli
+
+
+def test_build_parser_contract() -> None:
+    parser = cli._build_parser()
+    assert parser.prog == "drc-export-figures"
+    assert parser.description
+    assert all(action.help for action in parser._actions)
+
+
+def test_main_exports_pickled_and_factory_figures(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [1, 0])
+    pickled = tmp_path / "pickled.pkl"
+    pickled.write_bytes(pickle.dumps(fig))
+    plt.close(fig)
+
+    (tmp_path / "paper_figs.py").write_text(
+        "import matplotlib.pyplot as plt\n\n"
+        "def trend():\n"
+        "    fig, ax = plt.subplots()\n"
+        "    ax.plot([0, 1], [0, 1])\n"
+        "    return fig\n",
+        encoding="utf-8",
+    )
+    # Mimic an installed console script: the working directory is not on sys.path.
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "path", [entry for entry in sys.path if entry not in ("", ".")])
+    monkeypatch.delitem(sys.modules, "paper_figs", raising=False)
+
+    out_dir = tmp_path / "out"
+    argv = [str(pickled), "paper_figs:trend", "--out-dir", str(out_dir), "--formats", "png"]
+    assert cli.main([*argv, "--dpi", "50"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["pickled"]["rendered"] == ["one_col"]
+    assert (out_dir / "trend__one_col.png").exists()
+
+    assert cli.main([*argv, "--dpi", "50"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["trend"]["cached"] == ["one_col"]
+    plt.close("all")
+
+
+def test_main_imports_factories_from_app_dir(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    app_dir = tmp_path / "figures"
+    app_dir.mkdir()
+    (app_dir / "app_dir_figs.py").write_text(
+        "import matplotlib.pyplot as plt\n\n"
+        "def bars():\n"
+        "    from app_dir_data import HEIGHTS\n\n"
+        "    fig, ax = plt.subplots()\n"
+        "    ax.bar([0, 1], HEIGHTS)\n"
+        "    return fig\n",
+        encoding="utf-8",
+    )
+    (app_dir / "app_dir_data.py").write_text("HEIGHTS = [2, 1]\n", encoding="utf-8")
+    saved_path = list(sys.path)
+    for module in ("app_dir_figs", "app_dir_data"):
+        monkeypatch.delitem(sys.modules, module, raising=False)
+
+    argv = ["app_dir_figs:bars", "--out-dir", str(tmp_path / "out"), "--formats", "png"]
+    assert cli.main([*argv, "--dpi", "50", "--app-dir", str(app_dir)]) == 0
+    assert json.loads(capsys.readouterr().out)["bars"]["rendered"] == ["one_col"]
+    assert sys.path == saved_path
+
+
+def test_main_reports_bad_sources(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert cli.main(["not-a-spec", "--out-dir", str(tmp_path)]) == 2
+    assert "Invalid figure source" in capsys.readouterr().err
+
+    assert cli.main([str(tmp_path / "missing.pkl"), "--out-dir", str(tmp_path)]) == 2
+    assert "not found" in capsys.readouterr().err
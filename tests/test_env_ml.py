@@ -1,45 +1,238 @@
 from __future__ import annotations
 
+import socket
+import urllib.error
+import urllib.request
 from unittest.mock import patch
 
+import pytest
+
 import drcutils.viz.ml as ml
 
 
-def test_visualize_network_colab_branch() -> None:
+def _read(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.read()
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    path = tmp_path / "model.onnx"
+    path.write_bytes(b"\x08\x07model")
+    (tmp_path / "model.onnx.data").write_bytes(b"weights")
+    return path
+
+
+def test_visualize_network_colab_branch(model_file) -> None:
     with (
-        patch("drcutils.viz.ml._serve") as serve,
+        ml.NetronServer() as server,
         patch("drcutils.viz.ml._display") as display,
         patch("drcutils.viz.ml.is_notebook", return_value=True),
         patch("drcutils.viz.ml.is_google_colab", return_value=True),
     ):
-        ml.visualize_network("model.onnx", height=400, port=8001)
+        url = ml.visualize_network(model_file, height=400, server=server)
 
-    serve.assert_called_once_with("model.onnx", None, ("localhost", 8001), False, 0)
     js = display.call_args[0][0].data
-    assert "proxyPort(8001)" in js
+    assert f"proxyPort({server.port})" in js
+    assert f"'{url[len(server.url) :]}'" in js
+    assert "'400'" in js
 
 
-def test_visualize_network_notebook_non_colab_branch() -> None:
+def test_visualize_network_notebook_non_colab_branch(model_file) -> None:
     with (
-        patch("drcutils.viz.ml._serve") as serve,
+        ml.NetronServer() as server,
         patch("drcutils.viz.ml._display") as display,
         patch("drcutils.viz.ml.is_notebook", return_value=True),
         patch("drcutils.viz.ml.is_google_colab", return_value=False),
     ):
-        ml.visualize_network("model.onnx", height=500, port=8123)
+        url = ml.visualize_network(model_file, height=500, server=server)
+        page = _read(url)
 
-    serve.assert_called_once_with("model.onnx", None, ("localhost", 8123), False, 0)
-    js = display.call_args[0][0].data
-    assert "http://localhost:8123" in js
+    assert url.startswith(server.url)
+    assert f"fm.src = '{url}'" in display.call_args[0][0].data
+    assert b'<meta name="file" content="/data/model.onnx">' in page
 
 
-def test_visualize_network_terminal_branch() -> None:
+def test_visualize_network_terminal_branch(model_file, monkeypatch) -> None:
+    monkeypatch.setattr(ml, "_SHARED", None)
     with (
-        patch("drcutils.viz.ml._serve") as serve,
+        patch("drcutils.viz.ml._webbrowser") as browser,
         patch("drcutils.viz.ml._display") as display,
         patch("drcutils.viz.ml.is_notebook", return_value=False),
     ):
-        ml.visualize_network("model.onnx", port=9000)
+        first = ml.visualize_network(model_file)
+        second = ml.visualize_network(str(model_file))
+
+    server = ml.get_netron_server()
+    try:
+        assert first == second
+        assert browser.open.call_args[0][0] == first
+        display.assert_not_called()
+        assert server is ml.get_netron_server()
+        assert len(server.models) == 1
+    finally:
+        server.stop()
+
+
+def test_netron_server_serves_several_models_and_restarts(model_file, tmp_path) -> None:
+    other = tmp_path / "other" / "net.onnx"
+    other.parent.mkdir()
+    other.write_bytes(b"other")
+    copy = tmp_path / "other" / "copy.onnx"
+    copy.write_bytes(model_file.read_bytes())
+    busy = socket.socket()
+    busy.bind(("localhost", 0))
+    busy.listen()
+
+    with busy, ml.NetronServer(port=busy.getsockname()[1]) as server:
+        assert server.port != busy.getsockname()[1]
+        first = server.add(model_file)
+        assert server.add(copy) == first
+        second = server.add(other)
+        assert second != first
+        assert _read(first + "data/model.onnx.data") == b"weights"
+        assert _read(second + "data/net.onnx") == b"other"
+        assert _read(first + "index.js")
+        with pytest.raises(urllib.error.HTTPError):
+            _read(first + "data/..%2fother%2fnet.onnx")
+        port = server.port
+
+    assert not server.running
+    server.start()
+    try:
+        assert server.port == port
+        assert _read(second + "data/net.onnx") == b"other"
+    finally:
+        server.stop()
+    with pytest.raises(FileNotFoundError):
+        server.add(tmp_path / "missing.onnx")
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    return bytes(out) + bytes([value])
+
+
+def _field(number: int, value: int | bytes | str) -> bytes:
+    if isinstance(value, int):
+        return _varint(number << 3) + _varint(value)
+    payload = value.encode() if isinstance(value, str) else value
+    return _varint(number << 3 | 2) + _varint(len(payload)) + payload
+
+
+def _onnx_bytes() -> bytes:
+    weight = _field(1, 2) + _field(1, 3) + _field(2, 1) + _field(8, "W") + _field(9, bytes(24))
+    external = (
+        _field(1, _varint(4))
+        + _field(2, 10)
+        + _field(8, "E")
+        + _field(13, _field(1, "location") + _field(2, "weights.bin"))
+        + _field(13, _field(1, "offset") + _field(2, "0"))
+        + _field(13, _field(1, "length") + _field(2, "8"))
+        + _field(14, 1)
+    )
+    branch = _field(1, _field(4, "Relu")) + _field(2, "then")
+    nodes = [
+        _field(1, "x") + _field(1, "W") + _field(2, "y") + _field(4, "Conv"),
+        _field(1, "y") + _field(2, "z") + _field(4, "Conv"),
+        _field(4, "If") + _field(5, _field(1, "then_branch") + _field(6, branch)),
+        _field(4, "FusedGemm") + _field(7, "com.microsoft"),
+    ]
+    dims = _field(1, _field(2, "batch")) + _field(1, _field(1, 3))
+    tensor_type = _field(1, _field(1, 1) + _field(2, dims))
+    graph = (
+        b"".join(_field(1, node) for node in nodes)
+        + _field(2, "net")
+        + _field(5, weight)
+        + _field(5, external)
+        + _field(11, _field(1, "x") + _field(2, tensor_type))
+        + _field(11, _field(1, "W"))
+        + _field(12, _field(1, "z"))
+    )
+    return (
+        _field(1, 7)
+        + _field(2, "drc")
+        + _field(3, "1.0")
+        + _field(8, _field(1, "") + _field(2, 17))
+        + _field(7, graph)
+    )
+
+
+def test_summarize_model_reads_structure_without_onnx(tmp_path) -> None:
+    path = tmp_path / "model.onnx"
+    path.write_bytes(_onnx_bytes())
+
+    summary = ml.summarize_model(path)
+
+    assert summary["bytes"] == path.stat().st_size
+    assert (summary["ir_version"], summary["producer"]) == (7, "drc 1.0")
+    assert summary["opsets"] == {"ai.onnx": 17}
+    assert summary["graph"] == "net"
+    assert summary["nodes"] == 5
+    assert summary["ops"] == {"Conv": 2, "Relu": 1, "If": 1, "com.microsoft.FusedGemm": 1}
+    assert summary["inputs"] == [{"name": "x", "dtype": "float32", "shape": ("batch", 3)}]
+    assert summary["outputs"] == [{"name": "z", "dtype": None, "shape": None}]
+    weight, external = summary["initializers"]
+    assert weight == {
+        "name": "W",
+        "dtype": "float32",
+        "shape": (2, 3),
+        "elements": 6,
+        "bytes": 24,
+        "external": None,
+    }
+    assert (external["dtype"], external["shape"], external["bytes"]) == ("float16", (4,), 8)
+    assert external["external"] == {"location": "weights.bin", "offset": 0, "length": 8}
+    assert (summary["parameters"], summary["parameter_bytes"]) == (10, 32)
+    assert summary["external_data"] == {"weights.bin": {"tensors": 1, "bytes": 8, "exists": False}}
+
+
+def test_summarize_model_scans_graphs_but_not_tensors_attributes(tmp_path) -> None:
+    weight = _field(1, 2) + _field(2, 1) + _field(8, "C") + _field(9, bytes(8))
+    body = _field(1, _field(4, "Sigmoid")) + _field(2, "body")
+    nodes = [
+        _field(4, "Constant") + _field(5, _field(1, "values") + _field(10, weight) + _field(20, 9)),
+        _field(4, "Scan")
+        + _field(5, _field(1, "bodies") + _field(11, body) + _field(11, body) + _field(20, 10)),
+    ]
+    graph = b"".join(_field(1, node) for node in nodes) + _field(2, "net")
+    path = tmp_path / "model.onnx"
+    path.write_bytes(_field(1, 7) + _field(8, _field(2, 17)) + _field(7, graph))
+
+    summary = ml.summarize_model(path)
+
+    assert summary["ops"] == {"Constant": 1, "Scan": 1, "Sigmoid": 2}
+    assert summary["initializers"] == []
+
+
+def test_summarize_model_counts_sparse_initializer_values(tmp_path) -> None:
+    values = _field(1, 3) + _field(2, 1) + _field(8, "S") + _field(9, bytes(12))
+    indices = _field(1, 3) + _field(2, 7) + _field(8, "S_idx") + _field(9, bytes(3))
+    sparse = _field(1, values) + _field(2, indices) + _field(3, _varint(3) + _varint(4))
+    weight = _field(1, 2) + _field(2, 1) + _field(8, "W") + _field(9, bytes(8))
+    graph = _field(1, _field(4, "Add")) + _field(5, weight) + _field(15, sparse)
+    path = tmp_path / "model.onnx"
+    path.write_bytes(_field(1, 8) + _field(8, _field(2, 17)) + _field(7, graph))
+
+    summary = ml.summarize_model(path)
+
+    assert summary["initializers"][1] == {
+        "name": "S",
+        "dtype": "float32",
+        "shape": (3, 4),
+        "elements": 3,
+        "bytes": 36,
+        "external": None,
+    }
+    assert (summary["parameters"], summary["parameter_bytes"]) == (5, 44)
+
 
-    serve.assert_called_once_with("model.onnx", None, ("localhost", 9000), True, 0)
-    display.assert_not_called()
+def test_summarize_model_rejects_malformed_files(tmp_path) -> None:
+    path = tmp_path / "model.onnx"
+    for data in (b"", b"PK\x03\x04zipped", _onnx_bytes()[:-5]):
+        path.write_bytes(data)
+        with pytest.raises(ValueError, match="is not an ONNX model"):
+            ml.summarize_model(path)
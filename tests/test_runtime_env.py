@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import pytest
+
 import drcutils.runtime.env as env
 
 
+@pytest.fixture(autouse=True)
+def _fresh_notebook_cache():
+    env.is_notebook.cache_clear()
+    yield
+    env.is_notebook.cache_clear()
+
+
 def test_is_google_colab_true_and_false(monkeypatch) -> None:
     monkeypatch.setitem(env._modules, "google.colab", object())
     assert env.is_google_colab() is True
@@ -35,13 +44,29 @@ def test_is_notebook_shell_variants(monkeypatch) -> None:
     monkeypatch.setattr(env, "_get_ipython", lambda: ZMQInteractiveShell())
     assert env.is_notebook() is True
 
+    env.is_notebook.cache_clear()
     monkeypatch.setattr(env, "_get_ipython", lambda: TerminalInteractiveShell())
     assert env.is_notebook() is False
 
+    env.is_notebook.cache_clear()
     monkeypatch.setattr(env, "_get_ipython", lambda: OtherShell())
     assert env.is_notebook() is False
 
 
+def test_is_notebook_caches_the_shell_lookup(monkeypatch) -> None:
+    monkeypatch.setattr(env, "is_google_colab", lambda: False)
+    calls: list[None] = []
+
+    def _get_ipython() -> None:
+        calls.append(None)
+        raise NameError("not defined")
+
+    monkeypatch.setattr(env, "_get_ipython", _get_ipython)
+    assert env.is_notebook() is False
+    assert env.is_notebook() is False
+    assert len(calls) == 1
+
+
 def test_is_notebook_name_error_path(monkeypatch) -> None:
     monkeypatch.setattr(env, "is_google_colab", lambda: False)
 
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+from drcutils.runtime import executor
+
+
+def _worker_state(_: int) -> tuple[str | None, int]:
+    return os.environ.get("OPENBLAS_NUM_THREADS"), executor.get_budget()
+
+
+def _nested(values: list[int]) -> list[str]:
+    return [threading.current_thread().name for _ in executor.map_tasks(abs, values, jobs=2)]
+
+
+def test_budget_scopes_and_restores(monkeypatch) -> None:
+    monkeypatch.setattr(executor, "_budget", None)
+    default = executor.get_budget()
+
+    with executor.budget(3, start_method="spawn") as workers:
+        assert workers == executor.get_budget() == 3
+        assert executor._check_start_method(None) == "spawn"
+        with executor.budget(start_method="forkserver"):
+            assert executor.get_budget() == 3
+
+    assert executor.get_budget() == default
+    with pytest.raises(ValueError, match="at least 1"), executor.budget(0):
+        pass
+    with pytest.raises(ValueError, match="Choose from"):
+        executor.map_tasks(abs, [1], processes=True, start_method="fork")
+
+
+def test_map_tasks_shares_the_budget_with_nested_calls() -> None:
+    with executor.budget(2):
+        names = list(executor.map_tasks(_nested, [[1, 2], [3, 4]], jobs=2))
+        assert list(executor.map_tasks(pow, range(10), [2] * 10, jobs=2)) == [
+            value**2 for value in range(10)
+        ]
+        assert executor.thread_pool() is executor.thread_pool()
+
+    # Both pool threads hold the budget, so the nested maps ran inline on them.
+    assert all(name.startswith("drcutils") for pair in names for name in pair)
+    assert executor._active == 0
+    with executor.budget(1):
+        assert list(executor.map_tasks(_nested, [[1]], jobs=2)) == [
+            [threading.current_thread().name]
+        ]
+
+
+def test_map_tasks_reraises_task_errors_in_order() -> None:
+    with executor.budget(2):
+        results = executor.map_tasks(int, ["1", "x", "3"], jobs=2)
+        assert next(results) == 1
+        with pytest.raises(ValueError, match="invalid literal"):
+            next(results)
+    assert executor._active == 0
+
+
+def test_map_tasks_rejects_iterables_of_different_lengths() -> None:
+    with pytest.raises(ValueError, match="same length, got 3, 2"):
+        executor.map_tasks(pow, [1, 2, 3], [2, 2])
+    assert list(executor.map_tasks(pow, iter([1, 2]), (2, 3))) == [1, 8]
+
+
+def test_process_pool_pins_blas_threads(monkeypatch) -> None:
+    monkeypatch.delenv("OPENBLAS_NUM_THREADS", raising=False)
+
+    with executor.budget(2):
+        states = list(executor.map_tasks(_worker_state, range(3), processes=True))
+        pool = executor.process_pool()
+
+    assert states == [("1", 1)] * 3
+    assert pool is executor.process_pool()
+    assert "OPENBLAS_NUM_THREADS" not in os.environ
+    executor.shutdown()
+    assert pool is not executor.process_pool()
+    executor.shutdown()
+
+
+@pytest.mark.skipif(
+    "forkserver" not in multiprocessing.get_all_start_methods(), reason="needs forkserver"
+)
+def test_forkserver_pool_keeps_its_preload_private() -> None:
+    import multiprocessing.forkserver as forkserver
+
+    shared = multiprocessing.get_context("forkserver")
+    before = list(forkserver._forkserver._preload_modules)
+
+    with executor.budget(2, start_method="forkserver"):
+        assert list(executor.map_tasks(abs, [-1, -2], processes=True)) == [1, 2]
+        pool = executor.process_pool()
+
+    assert pool._mp_context is not shared
+    assert pool._mp_context._preload == ["__main__", "drcutils"]
+    assert forkserver._forkserver._preload_modules == before
+    executor.shutdown()
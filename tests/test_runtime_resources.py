@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+
+import drcutils.runtime.resources as resources
+from drcutils import runtime
+
+GIB = 1 << 30
+
+
+@pytest.fixture
+def fake_system(tmp_path, monkeypatch):
+    proc = tmp_path / "proc"
+    proc.mkdir()
+    (proc / "meminfo").write_text("MemTotal:  8388608 kB\nMemAvailable:  4194304 kB\n")
+    root = tmp_path / "cgroup"
+    root.mkdir()
+    monkeypatch.setattr(resources, "_PROC_CGROUP", proc / "cgroup")
+    monkeypatch.setattr(resources, "_PROC_MEMINFO", proc / "meminfo")
+    monkeypatch.setattr(resources, "_CGROUP_ROOT", root)
+    monkeypatch.setattr(resources._os, "sched_getaffinity", lambda pid: {0, 1, 2, 3})
+    monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+    resources._probe.cache_clear()
+    yield proc, root
+    resources._probe.cache_clear()
+
+
+def test_profile_reads_cgroup_v2_limits(fake_system, monkeypatch) -> None:
+    proc, root = fake_system
+    (proc / "cgroup").write_text("0::/job/step\n")
+    step = root / "job" / "step"
+    step.mkdir(parents=True)
+    (root / "job" / "memory.max").write_text(f"{GIB}\n")
+    (root / "job" / "memory.current").write_text(f"{GIB // 4}\n")
+    (step / "memory.max").write_text("max\n")
+    (step / "cpu.max").write_text("250000 100000\n")
+    monkeypatch.setenv("OMP_NUM_THREADS", "1")
+
+    info = runtime.profile(refresh=True)
+
+    assert (info["cpu_affinity"], info["cpu_quota"], info["cpus"]) == (4, 2.5, 2)
+    assert info["memory_total"] == 8 * GIB
+    assert info["memory_available"] == 4 * GIB
+    assert info["memory_limit"] == GIB
+    assert info["memory_usable"] == 3 * GIB // 4
+    assert info["thread_limits"] == {"OMP_NUM_THREADS": "1"}
+    assert "matplotlib_backend" in info
+    assert resources._worker_count(None) == 2
+    assert resources._worker_count(None, tasks=10, worker_bytes=GIB // 2) == 1
+    assert resources._worker_count(8, tasks=3) == 3
+    assert resources.chunk_length(64, 1 << 20) == (3 * GIB // 4) // 16 // 64
+
+
+def test_profile_ignores_unlimited_cgroup_v1_and_is_cached(fake_system) -> None:
+    proc, root = fake_system
+    (proc / "cgroup").write_text("4:memory:/box\n1:cpu,cpuacct:/\n0::/\n")
+    (root / "memory" / "box").mkdir(parents=True)
+    (root / "memory" / "box" / "memory.limit_in_bytes").write_text("9223372036854771712\n")
+    (root / "cpu,cpuacct").mkdir()
+    (root / "cpu,cpuacct" / "cpu.cfs_quota_us").write_text("-1\n")
+    (root / "cpu,cpuacct" / "cpu.cfs_period_us").write_text("100000\n")
+
+    info = runtime.profile(refresh=True)
+    info["cpus"] = 99
+
+    assert runtime.profile()["cpus"] == 4
+    assert (info["memory_limit"], info["cpu_quota"]) == (None, None)
+    assert runtime.profile()["memory_usable"] == 4 * GIB
+    assert resources.chunk_length(64, 1 << 20) == 1 << 20
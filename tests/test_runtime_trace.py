@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from drcutils import brand
+from drcutils.data import convert
+from drcutils.runtime import trace
+from drcutils.viz import export_figure
+
+
+def test_span_is_a_shared_no_op_outside_tracing() -> None:
+    assert trace.span("idle") is trace.span("other", size=1)
+    with trace.tracing() as events:
+        pass
+    with trace.span("after"):
+        pass
+    assert events == []
+
+
+def test_tracing_records_nested_spans_and_memory_peaks(tmp_path) -> None:
+    with trace.tracing(tmp_path / "trace.json", memory=True) as events:
+        with trace.span("outer", rows=3):
+            with trace.span("outer.alloc"):
+                block = np.ones(1 << 20)
+            del block
+            with trace.tracing() as inner, trace.span("outer.inner"):
+                pass
+
+    assert [event["name"] for event in events] == ["outer.alloc", "outer.inner", "outer"]
+    assert [event["name"] for event in inner] == ["outer.inner"]
+    alloc, _, outer = events
+    assert alloc["args"]["peak_bytes"] >= 8 << 20
+    assert outer["args"]["peak_bytes"] >= alloc["args"]["peak_bytes"]
+    assert outer["args"]["rows"] == 3
+    assert outer["cat"] == "outer" and outer["ph"] == "X"
+    assert outer["ts"] <= alloc["ts"] and outer["dur"] >= alloc["dur"]
+
+    document = json.loads((tmp_path / "trace.json").read_text())
+    assert document["traceEvents"][0]["name"] == "thread_name"
+    assert document["traceEvents"][1:] == json.loads(json.dumps(events))
+    table = trace.summary(events).splitlines()
+    assert table[0].split()[:2] == ["span", "calls"] and table[0].endswith("peak MB")
+    assert table[1].split()[:2] == ["outer", "1"]
+
+
+def test_public_apis_record_their_stages(tmp_path) -> None:
+    fig, ax = plt.subplots()
+    ax.plot([0, 1, 2], [0, 1, 4])
+    with trace.tracing() as events:
+        brand.flag(tmp_path / "flag.png")
+        brand.watermark(tmp_path / "flag.png", tmp_path / "marked.png")
+        convert(tmp_path / "marked.png", tmp_path / "marked.bmp")
+        export_figure(fig, tmp_path / "figure", targets=["one_col"], formats=["png"])
+    plt.close(fig)
+
+    names = {event["name"] for event in events}
+    assert {"flag", "flag.render", "flag.encode"} <= names
+    assert {
+        "watermark",
+        "watermark.decode",
+        "watermark.logo",
+        "watermark.resize",
+        "watermark.composite",
+        "watermark.encode",
+    } <= names
+    assert {"convert", "convert.read", "convert.write"} <= names
+    assert {"export_figure", "export_figure.layout", "export_figure.save"} <= names
+    save = next(event for event in events if event["name"] == "export_figure.save")
+    assert save["args"]["target"] == "one_col" and save["args"]["format"] == "png"
+
+
+def test_environment_variable_traces_whole_run(tmp_path) -> None:
+    out = tmp_path / "run.json"
+    env = {**os.environ, "DRCUTILS_TRACE": str(out)}
+    env.pop("_DRCUTILS_TRACE_OWNER", None)
+    code = "import drcutils.brand as b, sys; b.flag(sys.argv[1])"
+    result = subprocess.run(
+        [sys.executable, "-c", code, str(tmp_path / "flag.png")],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    events = json.loads(out.read_text())["traceEvents"]
+    assert {"flag", "flag.render", "flag.encode"} <= {event["name"] for event in events}
+    assert "flag.render" in result.stderr
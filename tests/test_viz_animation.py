@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from drcutils.brand.colormaps import apply_colormap
+from drcutils.viz import export_animation
+
+
+def _stack(frames: int = 4, height: int = 24, width: int = 32) -> np.ndarray:
+    yy, xx = np.mgrid[0:height, 0:width]
+    return np.stack(
+        [np.sin(xx / 5 + t / 2) * np.cos(yy / 4 - t / 3) for t in range(frames)]
+    ).astype(np.float32)
+
+
+def _read_frames(path) -> list[np.ndarray]:
+    with Image.open(path) as image:
+        frames = []
+        for idx in range(image.n_frames):
+            image.seek(idx)
+            frames.append(np.asarray(image.convert("RGB")))
+    return frames
+
+
+@pytest.mark.parametrize("suffix", [".gif", ".png"])
+def test_export_animation_lossless_formats_match_apply_colormap(tmp_path, suffix: str) -> None:
+    stack = _stack()
+    stack[0, 0, 0] = np.nan
+
+    result = export_animation(stack, tmp_path / f"field{suffix}", cmap="drc_cool", fps=10)
+
+    assert result["frames"] == 4
+    assert (result["width"], result["height"]) == (32, 24)
+    assert result["format"] == {".gif": "gif", ".png": "apng"}[suffix]
+    lo, hi = float(np.nanmin(stack)), float(np.nanmax(stack))
+    for frame, decoded in zip(stack, _read_frames(result["file"]), strict=True):
+        np.testing.assert_array_equal(
+            decoded, apply_colormap(frame, "drc_cool", lo, hi, alpha=False)
+        )
+    with Image.open(result["file"]) as image:
+        assert image.info["duration"] == 100
+        assert image.info["loop"] == 0
+
+
+def test_export_animation_streams_webp_from_generators(tmp_path) -> None:
+    stack = _stack(frames=3)
+
+    with pytest.raises(ValueError, match="vmin and vmax are required"):
+        export_animation(iter(stack), tmp_path / "field.webp")
+    result = export_animation(
+        (frame for frame in stack), tmp_path / "field.webp", vmin=-1.0, vmax=1.0, quality=100
+    )
+
+    decoded = _read_frames(result["file"])
+    assert len(decoded) == 3
+    expected = apply_colormap(stack[2], "drc_diverging", -1.0, 1.0, alpha=False)
+    assert np.abs(decoded[2].astype(int) - expected).mean() < 10
+
+
+def test_export_animation_reads_memory_mapped_stacks(tmp_path) -> None:
+    np.save(tmp_path / "stack.npy", _stack())
+    stack = np.load(tmp_path / "stack.npy", mmap_mode="r")
+
+    result = export_animation(stack, tmp_path / "field.apng")
+
+    assert result["frames"] == 4
+    with Image.open(result["file"]) as image:
+        assert image.format == "PNG"
+        assert image.n_frames == 4
+
+
+@pytest.mark.parametrize("suffix", [".gif", ".png"])
+def test_export_animation_watermark_only_touches_logo_box(tmp_path, suffix: str) -> None:
+    stack = _stack(frames=2, height=120, width=160)
+    plain = export_animation(stack, tmp_path / f"plain{suffix}")
+    stamped = export_animation(
+        stack, tmp_path / f"stamped{suffix}", watermark=True, watermark_box=[0.5, 0.5, 0.25, None]
+    )
+
+    for before, after in zip(
+        _read_frames(plain["file"]), _read_frames(stamped["file"]), strict=True
+    ):
+        changed = np.argwhere((before != after).any(axis=-1))
+        assert len(changed)
+        assert changed.min(axis=0).tolist() >= [60, 80]
+
+
+def test_export_animation_validation_errors(tmp_path) -> None:
+    stack = _stack()
+    with pytest.raises(ValueError, match="Unsupported animation format '.mp4'. Choose from"):
+        export_animation(stack, tmp_path / "field.mp4")
+    with pytest.raises(ValueError, match="fps must be positive"):
+        export_animation(stack, tmp_path / "field.gif", fps=0)
+    with pytest.raises(ValueError, match="No frames to write"):
+        export_animation([], tmp_path / "field.gif", vmin=0.0, vmax=1.0)
+    with pytest.raises(ValueError, match=r"Frame 1 has shape \(2, 2\)"):
+        export_animation(
+            [np.zeros((3, 3)), np.zeros((2, 2))], tmp_path / "field.gif", vmin=0.0, vmax=1.0
+        )
+    with pytest.raises(ValueError, match=r"shape \(T, H, W\)"):
+        export_animation(np.zeros((3, 3)), tmp_path / "field.gif")
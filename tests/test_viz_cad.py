@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import builtins
+import shutil
 import sys
 from types import ModuleType, SimpleNamespace
 
 import numpy as np
+import pandas as pd
 import pytest
 
 import drcutils.viz.cad as cad
@@ -41,7 +43,7 @@ class _FakeStlMesh:
         )
 
 
-def test_visualize_stl_success_with_mocked_plotly(monkeypatch) -> None:
+def _install_fake_plotly(monkeypatch) -> None:
     fake_go = ModuleType("plotly.graph_objects")
     fake_go.Figure = _FakeFigure
     fake_go.Layout = _FakeLayout
@@ -52,6 +54,10 @@ def test_visualize_stl_success_with_mocked_plotly(monkeypatch) -> None:
 
     monkeypatch.setitem(sys.modules, "plotly", fake_plotly)
     monkeypatch.setitem(sys.modules, "plotly.graph_objects", fake_go)
+
+
+def test_visualize_stl_success_with_mocked_plotly(monkeypatch) -> None:
+    _install_fake_plotly(monkeypatch)
     monkeypatch.setattr(cad, "_Mesh", SimpleNamespace(from_file=lambda _: _FakeStlMesh()))
 
     fig = cad.visualize_stl("dummy.stl", color="#123456")
@@ -63,6 +69,38 @@ def test_visualize_stl_success_with_mocked_plotly(monkeypatch) -> None:
     assert "lighting" in mesh.updated
 
 
+def test_visualize_stl_compact_quantizes_positions_and_indices(monkeypatch) -> None:
+    _install_fake_plotly(monkeypatch)
+    monkeypatch.setattr(cad, "_Mesh", SimpleNamespace(from_file=lambda _: _FakeStlMesh()))
+
+    mesh = cad.visualize_stl("dummy.stl", compact=True, quantize_bits=8).data[0]
+
+    assert mesh.kwargs["x"].dtype == np.uint8
+    assert mesh.kwargs["i"].dtype == np.uint8
+    assert mesh.kwargs["meta"]["quantization"]["step"] == pytest.approx(1.0 / 255)
+    assert mesh.kwargs["z"].max() == 255
+
+    float_mesh = cad.visualize_stl("dummy.stl", compact=True, quantize_bits=None).data[0]
+    assert float_mesh.kwargs["x"].dtype == np.float32
+    assert float_mesh.kwargs["meta"] is None
+
+    with pytest.raises(ValueError, match="quantize_bits"):
+        cad.visualize_stl("dummy.stl", compact=True, quantize_bits=20)
+
+
+def test_export_stl_html_reports_compact_payload(tmp_path) -> None:
+    pytest.importorskip("plotly")
+    from drcutils.brand import LOGO_ONLY_STL
+
+    report = cad.export_stl_html(
+        LOGO_ONLY_STL, tmp_path / "logo.html", include_plotlyjs="cdn", compare=True
+    )
+
+    assert report["path"].exists()
+    assert report["bytes"] == report["path"].stat().st_size
+    assert report["payload_bytes"] < report["baseline_payload_bytes"]
+
+
 def test_visualize_stl_missing_plotly_dependency(monkeypatch) -> None:
     original_import = builtins.__import__
 
@@ -75,3 +113,195 @@ def test_visualize_stl_missing_plotly_dependency(monkeypatch) -> None:
 
     with pytest.raises(ImportError, match="pip install drcutils\\[plotly\\]"):
         cad.visualize_stl("dummy.stl")
+
+
+def test_render_thumbnails_writes_pngs_and_contact_sheet(tmp_path) -> None:
+    from PIL import Image
+
+    from drcutils.brand import LOGO_ONLY_STL
+
+    result = cad.render_thumbnails([LOGO_ONLY_STL, LOGO_ONLY_STL], tmp_path, size=64, jobs=1)
+
+    assert [path.name for path in result["files"]] == ["logo.png", "logo_1.png"]
+    with Image.open(result["files"][0]) as thumb:
+        assert thumb.size == (64, 64)
+    with Image.open(result["contact_sheet"]) as sheet:
+        assert sheet.size == (128, 64)
+
+
+def test_render_thumbnails_gives_colliding_stems_free_names(tmp_path) -> None:
+    from drcutils.brand import LOGO_ONLY_STL
+
+    inputs = [tmp_path / "a" / "logo.stl", tmp_path / "b" / "logo.stl", tmp_path / "logo_1.stl"]
+    for path in inputs:
+        path.parent.mkdir(exist_ok=True)
+        shutil.copyfile(LOGO_ONLY_STL, path)
+
+    result = cad.render_thumbnails(inputs, tmp_path / "out", size=16, jobs=1, contact_sheet=False)
+
+    names = [path.name for path in result["files"]]
+    assert names == ["logo.png", "logo_1.png", "logo_1_1.png"]
+    assert all(path.is_file() for path in result["files"])
+
+
+def test_render_thumbnails_validates_arguments(tmp_path) -> None:
+    with pytest.raises(ValueError, match="positive"):
+        cad.render_thumbnails([], tmp_path, size=0)
+    with pytest.raises(ValueError, match="Unknown colormap"):
+        cad.render_thumbnails([], tmp_path, cmap="not_a_map")
+
+
+class _FakeTetrahedron:
+    def __init__(self) -> None:
+        a, b, c, d = [0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]
+        self.vectors = np.array([[a, c, b], [a, b, d], [a, d, c], [b, c, d]], dtype=float)
+
+
+def test_mesh_stats_closed_and_open_meshes(monkeypatch) -> None:
+    monkeypatch.setattr(cad, "_Mesh", SimpleNamespace(from_file=lambda _: _FakeTetrahedron()))
+    closed = cad.mesh_stats("tetra.stl")
+
+    assert closed["n_triangles"] == 4
+    assert closed["volume"] == pytest.approx(1.0 / 6.0)
+    assert closed["surface_area"] == pytest.approx(1.5 + np.sqrt(3.0) / 2.0)
+    assert closed["centroid_x"] == pytest.approx(0.25)
+    assert closed["watertight"] is True
+    assert closed["non_manifold_edges"] == 0
+
+    monkeypatch.setattr(cad, "_Mesh", SimpleNamespace(from_file=lambda _: _FakeStlMesh()))
+    opened = cad.mesh_stats("open.stl")
+
+    assert opened["watertight"] is False
+    assert opened["boundary_edges"] == 4
+    assert opened["bbox_max_z"] == 1.0
+
+
+def test_mesh_stats_many_writes_convert_compatible_table(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(cad, "_Mesh", SimpleNamespace(from_file=lambda _: _FakeTetrahedron()))
+    out = tmp_path / "stats.csv"
+
+    frame = cad.mesh_stats_many(["a.stl", "b.stl"], output_filepath=out)
+
+    assert list(frame["path"]) == ["a.stl", "b.stl"]
+    assert out.exists()
+    cad.mesh_stats_many(["a.stl"], output_filepath=tmp_path / "stats.json")
+    assert list(pd.read_json(tmp_path / "stats.json")["path"]) == ["a.stl"]
+    for bad in ("stats.png", "stats.h5"):
+        with pytest.raises(ValueError, match="cannot be written"):
+            cad.mesh_stats_many(["a.stl"], output_filepath=tmp_path / bad)
+
+
+def test_sample_points_is_deterministic_and_on_surface(monkeypatch) -> None:
+    monkeypatch.setattr(cad, "_Mesh", SimpleNamespace(from_file=lambda _: _FakeTetrahedron()))
+
+    first = cad.sample_points("tetra.stl", 500, seed=7)
+    second = cad.sample_points("tetra.stl", 500, seed=7)
+
+    assert first.shape == (500, 6)
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_allclose(np.linalg.norm(first[:, 3:], axis=1), 1.0)
+    assert first[:, :3].min() >= -1e-12
+    assert first[:, :3].sum(axis=1).max() <= 1.0 + 1e-12
+    assert cad.sample_points("tetra.stl", 10, with_normals=False, seed=1).shape == (10, 3)
+
+
+def test_sample_points_many_writes_memmappable_npy(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(cad, "_Mesh", SimpleNamespace(from_file=lambda _: _FakeTetrahedron()))
+
+    out = cad.sample_points_many(["a.stl", "b.stl"], tmp_path / "points.npy", 64, seed=3)
+    stacked = np.load(out, mmap_mode="r")
+
+    assert stacked.shape == (2, 64, 6)
+    assert stacked.dtype == np.float32
+    assert not np.array_equal(stacked[0], stacked[1])
+    with pytest.raises(ValueError, match="cannot be written"):
+        cad.sample_points_many(["a.stl"], tmp_path / "points.csv", 8)
+
+
+class _FakeCube:
+    def __init__(self) -> None:
+        corners = np.array(
+            [[x, y, z] for x in (0.0, 1.0) for y in (0.0, 1.0) for z in (0.0, 1.0)], dtype=float
+        )
+        faces = [
+            [0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5], [0, 4, 5], [0, 5, 1],
+            [2, 3, 7], [2, 7, 6], [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3],
+        ]  # fmt: skip
+        self.vectors = corners[np.array(faces)]
+
+
+def test_voxelize_cube_fill_and_shell(monkeypatch) -> None:
+    monkeypatch.setattr(cad, "_Mesh", SimpleNamespace(from_file=lambda _: _FakeCube()))
+
+    filled = cad.voxelize("cube.stl", 4)
+    shell = cad.voxelize("cube.stl", 4, fill=False)
+
+    assert filled.shape == (4, 4, 4)
+    assert filled.all()
+    assert shell.sum() == 4**3 - 2**3
+    assert not shell[1:3, 1:3, 1:3].any()
+    np.testing.assert_array_equal(cad.voxelize("cube.stl", 4, chunk_size=3), filled)
+    np.testing.assert_array_equal(cad.voxelize("cube.stl", 4, chunk_size=1), filled)
+    with pytest.raises(ValueError, match="resolution"):
+        cad.voxelize("cube.stl", 0)
+
+
+def test_axis_ray_hits_splits_large_triangles_across_chunks() -> None:
+    triangle = np.array([[[0.0, 0.0, 1.0], [8.0, 0.0, 2.0], [0.0, 8.0, 3.0]]])
+    origin = np.zeros(3)
+
+    whole = cad._axis_ray_hits(triangle, 2, origin, 1.0, 8, 1 << 22)
+    split = cad._axis_ray_hits(triangle, 2, origin, 1.0, 8, 5)
+
+    assert len(whole[2]) == 28
+    for expected, actual in zip(whole, split, strict=True):
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_voxelize_many_writes_packed_bits(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(cad, "_Mesh", SimpleNamespace(from_file=lambda _: _FakeCube()))
+
+    out = cad.voxelize_many(["a.stl", "b.stl"], tmp_path / "voxels.npy", 4, fill=False)
+    packed = np.load(out, mmap_mode="r")
+
+    assert packed.shape == (2, 8)
+    grid = np.unpackbits(packed[0], count=64).reshape(4, 4, 4).astype(bool)
+    np.testing.assert_array_equal(grid, cad.voxelize("cube.stl", 4, fill=False))
+    with pytest.raises(ValueError, match=".npy"):
+        cad.voxelize_many(["a.stl"], tmp_path / "voxels.h5", 4)
+
+
+def test_visualize_assembly_dedupes_files_and_merges_by_color(monkeypatch) -> None:
+    _install_fake_plotly(monkeypatch)
+    loads: list[str] = []
+
+    def _from_file(path: str) -> _FakeTetrahedron:
+        loads.append(path)
+        return _FakeTetrahedron()
+
+    monkeypatch.setattr(cad, "_Mesh", SimpleNamespace(from_file=_from_file))
+    shifted = np.eye(4)
+    shifted[:3, 3] = [10.0, 0.0, 0.0]
+
+    fig, report = cad.visualize_assembly(
+        [
+            "bolt.stl",
+            ("bolt.stl", shifted, "#ff0000"),
+            ("bolt.stl", np.eye(3) * 2.0, "#ff0000"),
+            ("bracket.stl", None, "#ff0000"),
+        ],
+        return_report=True,
+    )
+
+    assert loads == ["bolt.stl", "bracket.stl"]
+    assert report["parts"] == 4
+    assert report["unique_files"] == 2
+    assert report["traces"] == 2
+    assert report["saved_bytes"] == report["naive_bytes"] - report["parsed_bytes"] > 0
+
+    red = next(t for t in fig.data if t.kwargs["colorscale"][0][1] == "#ff0000")
+    assert len(red.kwargs["i"]) == 12
+    assert red.kwargs["x"].max() == pytest.approx(11.0)
+    assert red.kwargs["i"].max() == 11
+    with pytest.raises(ValueError, match="4x4"):
+        cad.visualize_assembly([("bolt.stl", np.eye(2))])
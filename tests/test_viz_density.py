@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import pickle
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.colors import FuncNorm, LogNorm
+
+from drcutils.runtime import executor
+from drcutils.viz import density_grid, density_plot, export_figure
+
+
+def test_density_grid_matches_histogram2d_across_chunks() -> None:
+    rng = np.random.default_rng(0)
+    points = rng.normal(size=(5_000, 2))
+    extent = (-2.0, 2.0, -1.5, 3.0)
+
+    counts, used = density_grid(points, bins=(16, 8), extent=extent, chunk_size=777)
+    expected, _, _ = np.histogram2d(
+        points[:, 1], points[:, 0], bins=(8, 16), range=[extent[2:], extent[:2]]
+    )
+
+    assert used == extent
+    assert counts.shape == (8, 16)
+    np.testing.assert_array_equal(counts, expected)
+
+
+def test_density_grid_streams_chunk_iterables_with_explicit_extent() -> None:
+    chunks = [(np.array([0.0, 1.0, np.nan]), np.array([0.0, 1.0, 0.5])), np.array([[0.5, 0.5]])]
+
+    counts, _ = density_grid(iter(chunks), bins=2, extent=(0.0, 1.0, 0.0, 1.0))
+
+    np.testing.assert_array_equal(counts, [[1, 0], [0, 2]])
+    with pytest.raises(ValueError, match="extent is required"):
+        density_grid(iter(chunks), bins=2)
+
+
+def test_density_plot_masks_empty_bins_and_uses_requested_norm() -> None:
+    rng = np.random.default_rng(1)
+    x, y = rng.normal(size=(2, 2_000))
+    fig, ax = plt.subplots()
+
+    image = density_plot(ax, (x, y), bins=32, norm="eq_hist")
+    counts = image.get_array()
+    assert isinstance(image.norm, FuncNorm)
+    assert counts.sum() == 2_000
+    assert np.ma.count_masked(counts) == int((counts.data == 0).sum())
+    assert isinstance(density_plot(ax, (x, y), bins=32, norm="log").norm, LogNorm)
+
+    with pytest.raises(ValueError, match="Choose from"):
+        density_plot(ax, (x, y), norm="sqrt")
+    plt.close(fig)
+
+
+def test_density_plot_figures_pickle_for_parallel_export(tmp_path) -> None:
+    rng = np.random.default_rng(2)
+    fig, ax = plt.subplots()
+    image = density_plot(ax, rng.normal(size=(500, 2)), bins=16, norm="eq_hist")
+
+    clone = pickle.loads(pickle.dumps(fig))
+    values = np.linspace(image.norm.vmin, image.norm.vmax, 7)
+    np.testing.assert_allclose(clone.axes[0].images[0].norm(values), image.norm(values))
+    with executor.budget(2):
+        result = export_figure(fig, tmp_path / "density", formats=["png", "svg"], jobs=2)
+    assert len(result["files"]) == 2 * len(result["settings"])
+    plt.close(clone)
+    plt.close(fig)
+
+
+def test_density_grid_parquet_requires_pyarrow(tmp_path, monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        density_grid(tmp_path / "points.parquet")
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import os
+import re
+import time
+
 import matplotlib.pyplot as plt
+import numpy as np
+import pytest
 
+from drcutils.runtime import executor
 from drcutils.viz import export_figure, get_figure_preset
 
 
@@ -32,3 +39,348 @@ def test_export_figure_multi_target_multi_format(tmp_path) -> None:
         assert out.stat().st_size > 0
 
     plt.close(fig)
+
+
+def test_export_figure_parallel_matches_serial_bytes(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "0")
+    fig, ax = plt.subplots()
+    ax.plot([0, 1, 2], [0, 1, 4], label="curve")
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    ax.legend()
+    kwargs = {"targets": ["one_col", "two_col"], "formats": ["pdf", "png", "svg"], "dpi": 80}
+
+    serial = export_figure(fig, tmp_path / "serial" / "figure", **kwargs)
+    with executor.budget(2):
+        parallel = export_figure(fig, tmp_path / "parallel" / "figure", jobs=2, **kwargs)
+
+    assert [p.name for p in parallel["files"]] == [p.name for p in serial["files"]]
+    for left, right in zip(serial["files"], parallel["files"], strict=True):
+        assert left.read_bytes() == right.read_bytes()
+    assert parallel["settings"] == serial["settings"]
+    assert parallel["warnings"] == serial["warnings"]
+
+    plt.close(fig)
+
+
+def test_export_figure_draws_once_per_target_and_format(tmp_path) -> None:
+    fig, ax = plt.subplots(layout="constrained")
+    ax.plot([0, 1, 2], [0, 1, 4], label="curve")
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    ax.legend()
+
+    result = export_figure(
+        fig,
+        tmp_path / "figure",
+        targets=["one_col", "two_col"],
+        formats=["pdf", "png", "svg"],
+        dpi=80,
+    )
+
+    # One layout pass per target plus one render per output file.
+    assert result["draw_count"] == 2 + 6
+    assert result["warnings"].count("Axis 0 legend may overlap plot area.") == 1
+    assert fig.get_layout_engine() is not None
+
+    plt.close(fig)
+
+
+def _line_figure(scale: float = 1.0):
+    fig, ax = plt.subplots()
+    ax.plot([0, 1, 2], [0, scale, 4 * scale])
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    return fig
+
+
+def test_export_figures_skips_current_targets(tmp_path) -> None:
+    from drcutils.viz.paper_figures import export_figures
+
+    plt.close("all")
+    figures = {"a": _line_figure, "b": lambda: _line_figure(2.0)}
+    first = export_figures(figures, tmp_path, formats=["png"], dpi=60)
+    assert first["figures"]["a"]["rendered"] == ["one_col"]
+    assert plt.get_fignums() == []
+    assert (tmp_path / "manifest.json").exists()
+
+    figures["b"] = lambda: _line_figure(3.0)
+    second = export_figures(
+        figures, tmp_path, targets=["one_col", "two_col"], formats=["png"], dpi=60
+    )
+
+    assert second["figures"]["a"]["cached"] == ["one_col"]
+    assert second["figures"]["a"]["rendered"] == ["two_col"]
+    assert second["figures"]["b"]["rendered"] == ["one_col", "two_col"]
+    assert sorted(second["figures"]["a"]["files"]) == ["one_col", "two_col"]
+    assert second["figures"]["a"]["hash"] == first["figures"]["a"]["hash"]
+    assert plt.get_fignums() == []
+
+
+def test_export_figures_keeps_warnings_of_cached_targets(tmp_path, monkeypatch) -> None:
+    from drcutils.viz import paper_figures
+
+    monkeypatch.setattr(
+        paper_figures,
+        "_audit_figure",
+        lambda fig, renderer=None: [f"width {fig.get_figwidth():.1f}"],
+    )
+    kwargs = {"formats": ["png"], "dpi": 40}
+    first = paper_figures.export_figures({"a": _line_figure}, tmp_path, **kwargs)
+    second = paper_figures.export_figures(
+        {"a": _line_figure}, tmp_path, targets=["one_col", "slide_16x9"], **kwargs
+    )
+
+    assert first["figures"]["a"]["warnings"] == ["width 3.4"]
+    entry = second["figures"]["a"]
+    assert entry["cached"] == ["one_col"]
+    assert entry["target_warnings"] == {"one_col": ["width 3.4"], "slide_16x9": ["width 10.0"]}
+    assert entry["warnings"] == ["width 3.4", "width 10.0"]
+
+
+def test_figure_fingerprint_ignores_draw_state_and_size() -> None:
+    from drcutils.viz.paper_figures import _figure_fingerprint
+
+    fresh = _line_figure()
+    drawn = _line_figure()
+    drawn.canvas.draw()
+    drawn.set_size_inches(9, 9)
+
+    assert _figure_fingerprint(fresh) == _figure_fingerprint(drawn)
+    assert _figure_fingerprint(fresh) != _figure_fingerprint(_line_figure(2.0))
+    plt.close("all")
+
+
+def test_figure_fingerprint_sees_tick_labels_and_formatters() -> None:
+    from matplotlib.ticker import FuncFormatter
+
+    from drcutils.viz.paper_figures import _figure_fingerprint
+
+    fig = _line_figure()
+    ax = fig.axes[0]
+    ax.set_xticks([0, 1, 2])
+    hashes = [_figure_fingerprint(fig)]
+    ax.set_xticklabels(["low", "mid", "high"])
+    hashes.append(_figure_fingerprint(fig))
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda value, _: f"{value:.1f} mm"))
+    hashes.append(_figure_fingerprint(fig))
+    ax.tick_params(labelsize=5)
+    hashes.append(_figure_fingerprint(fig))
+    fig.canvas.draw()
+
+    assert len(set(hashes)) == 4
+    assert _figure_fingerprint(fig) == hashes[-1]
+    plt.close(fig)
+
+
+def test_figure_fingerprint_hashes_masked_integer_arrays() -> None:
+    from drcutils.viz.paper_figures import _figure_fingerprint
+
+    def image(mask_below: int):
+        fig, ax = plt.subplots()
+        ax.imshow(np.ma.masked_less(np.arange(12).reshape(3, 4), mask_below))
+        return fig
+
+    assert _figure_fingerprint(image(3)) == _figure_fingerprint(image(3))
+    assert _figure_fingerprint(image(3)) != _figure_fingerprint(image(4))
+    plt.close("all")
+
+
+def test_export_figure_auto_rasterizes_heavy_collections(tmp_path) -> None:
+    rng = np.random.default_rng(0)
+    fig, ax = plt.subplots()
+    points = ax.scatter(*rng.normal(size=(2, 2_000)), s=1, label="trials")
+    (line,) = ax.plot([0, 1], [0, 1])
+    ax.set_xlabel("x")
+
+    result = export_figure(
+        fig, tmp_path / "dense", formats=["pdf", "png"], dpi=72, auto_rasterize=500
+    )
+
+    report = result["rasterized"]
+    assert report["threshold"] == 500
+    assert [(item["label"], item["markers"]) for item in report["artists"]] == [("trials", 2_000)]
+    assert list(report["savings"]) == ["pdf"]
+    assert report["savings"]["pdf"]["bytes_saved"] > 0
+    assert not points.get_rasterized() and not line.get_rasterized()
+    assert "rasterized" not in export_figure(fig, tmp_path / "plain", formats=["png"])
+
+    with pytest.raises(ValueError, match="auto_rasterize"):
+        export_figure(fig, tmp_path / "bad", auto_rasterize=0)
+    plt.close(fig)
+
+
+def test_export_figure_reports_stage_stats_to_hook_and_profiles_slowest(tmp_path) -> None:
+    fig, ax = plt.subplots()
+    ax.plot([0, 1, 2], [0, 1, 4])
+    ax.set_xlabel("x")
+    events: list[dict] = []
+
+    result = export_figure(
+        fig,
+        tmp_path / "stats",
+        targets=["one_col", "two_col"],
+        formats=["pdf", "png"],
+        dpi=72,
+        hook=events.append,
+        profile=True,
+    )
+
+    assert events == result["stats"]
+    assert [event["stage"] for event in events] == ["layout", "save", "save"] * 2
+    saves = [event for event in events if event["stage"] == "save"]
+    for event in saves:
+        assert event["bytes"] == event["file"].stat().st_size
+        assert event["seconds"] == pytest.approx(event["draw_seconds"] + event["encode_seconds"])
+        assert event["draws"] == 1
+        if event["peak_rss_bytes"] is not None:
+            assert event["peak_rss_bytes"] >= event["rss_growth_bytes"] >= 0
+    slowest = max(saves, key=lambda event: event["seconds"])
+    assert (result["profile"]["target"], result["profile"]["format"]) == (
+        slowest["target"],
+        slowest["format"],
+    )
+    assert "cumulative" in result["profile"]["stats"]
+    assert "profile" not in export_figure(fig, tmp_path / "plain", formats=["png"])
+    plt.close(fig)
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc/self/statm")
+def test_rss_watch_sees_transient_peaks_below_the_lifetime_high_water() -> None:
+    from drcutils.viz.paper_figures import _rss_watch
+
+    def allocate_and_free(n_bytes: int) -> dict[str, int]:
+        with _rss_watch() as memory:
+            block = np.ones(n_bytes // 8)
+            time.sleep(0.05)
+            del block
+        return memory
+
+    large = allocate_and_free(256 << 20)
+    small = allocate_and_free(64 << 20)
+
+    # The smaller block never raises the process high-water mark set by the
+    # larger one, but its own peak is still reported.
+    assert large["rss_growth_bytes"] >= 200 << 20
+    assert 48 << 20 <= small["rss_growth_bytes"] < large["rss_growth_bytes"]
+    assert small["peak_rss_bytes"] >= small["rss_growth_bytes"]
+
+
+def test_export_figure_optimize_minifies_svg_and_reports_pdf_fonts(tmp_path) -> None:
+    import xml.etree.ElementTree as ET
+
+    fig, ax = plt.subplots()
+    ax.plot(np.linspace(0, 1, 500) ** 2)
+    ax.set_title("Design")
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+
+    plain = export_figure(fig, tmp_path / "plain", formats=["pdf", "svg"])
+    optimized = export_figure(fig, tmp_path / "small", formats=["pdf", "svg"], optimize=True)
+
+    sizes = {event["format"]: event["bytes"] for event in plain["stats"] if "format" in event}
+    saves = {event["format"]: event for event in optimized["stats"] if "format" in event}
+    assert saves["svg"]["bytes_saved"] > 0
+    assert saves["svg"]["bytes"] < sizes["svg"]
+    svg_text = saves["svg"]["file"].read_text(encoding="utf-8")
+    ET.fromstring(svg_text)
+    assert "<metadata>" not in svg_text
+    assert not re.search(r'd="[^"]*\d\.\d{3}', svg_text)
+    assert b"/Producer" not in saves["pdf"]["file"].read_bytes()
+    assert "bytes_saved" not in saves["pdf"]
+    assert saves["pdf"]["bytes"] < sizes["pdf"]
+    assert saves["pdf"]["fonts"] and all(font["subset"] for font in saves["pdf"]["fonts"])
+
+    with pytest.raises(ValueError, match="svg_precision"):
+        export_figure(fig, tmp_path / "bad", optimize=True, svg_precision=-1)
+    plt.close(fig)
+
+
+def test_export_figure_book_streams_pages_with_shared_fonts(tmp_path) -> None:
+    from drcutils.viz.paper_figures import export_figure_book
+
+    kept = _line_figure()
+    before = set(plt.get_fignums())
+
+    result = export_figure_book(
+        [kept, _line_figure, lambda: _line_figure(2.0)], tmp_path / "book.pdf", target="two_col"
+    )
+
+    data = result["file"].read_bytes()
+    assert result["pages"] == 3
+    assert result["bytes"] == len(data)
+    assert len(re.findall(rb"/Type /Page\b", data)) == 3
+    assert len(re.findall(rb"/FontName", data)) == 1
+    assert set(plt.get_fignums()) == before
+    assert result["warnings"] == []
+    plt.close("all")
+
+
+def test_export_figure_book_rejects_empty_input(tmp_path) -> None:
+    from drcutils.viz.paper_figures import export_figure_book
+
+    with pytest.raises(ValueError, match="at least one figure"):
+        export_figure_book(iter([]), tmp_path / "empty.pdf")
+    assert not (tmp_path / "empty.pdf").exists()
+
+
+def test_export_figure_chunks_and_decimates_heavy_lines(tmp_path) -> None:
+    import matplotlib as mpl
+
+    from drcutils.viz.paper_figures import _style_context
+
+    samples = 150_000
+    t = np.linspace(0, 10, samples)
+    fig, ax = plt.subplots()
+    (trace,) = ax.plot(t, np.sin(t) + np.random.default_rng(0).normal(0, 0.2, samples))
+    (dots,) = ax.plot(t, np.cos(t), "o", markersize=1)
+    ax.set_xlabel("t")
+    ax.set_ylabel("y")
+
+    result = export_figure(
+        fig,
+        tmp_path / "trace",
+        targets=["one_col", "two_col"],
+        formats=["png"],
+        dpi=100,
+        decimate=True,
+    )
+
+    trace_info, dots_info = result["heavy_lines"]
+    assert trace_info["vertices"] == dots_info["vertices"] == samples
+    assert dots_info["decimated"] == {}
+    one_col, two_col = trace_info["decimated"]["one_col"], trace_info["decimated"]["two_col"]
+    assert one_col < two_col <= 4 * 7.0 * 100 + 8
+    assert len(trace.get_xdata()) == len(dots.get_xdata()) == samples
+    with _style_context(True, None, None, chunk_paths=True):
+        assert mpl.rcParams["agg.path.chunksize"] > 0
+        assert mpl.rcParams["path.simplify"]
+    plt.close(fig)
+
+
+def test_audit_flags_low_contrast_text_and_confusable_lines() -> None:
+    from drcutils.brand import BLUE, ORANGE, RED
+    from drcutils.viz.paper_figures import _audit_figure
+
+    fig, axes = plt.subplots(1, 2)
+    for ax in axes:
+        ax.plot([0, 1], [0, 1], color=ORANGE, label="orange")
+        ax.plot([0, 1], [1, 0], color=RED, label="red")
+        ax.plot([0, 1], [0.5, 0.5], color=RED, linestyle="--", label="dashed")
+        ax.set_xlabel("x")
+        ax.set_ylabel("y")
+    axes[0].set_title("light", color=BLUE)
+    axes[1].set_title("large", color="#808080", fontsize=20)
+    axes[1].text(0.5, 0.5, "boxed", color="white", bbox={"facecolor": "black"})
+
+    warnings = _audit_figure(fig)
+
+    assert [w for w in warnings if "contrast" in w] == [
+        "1 text element(s) in #57b7ba on #ffffff have contrast 2.4:1, below 4.5:1 (e.g. 'light')."
+    ]
+    assert [w for w in warnings if "tell apart" in w] == [
+        "Axes 0, 1 lines 'orange' and 'red' are hard to tell apart under deuteranopia "
+        "(CIEDE2000 8.8)."
+    ]
+    assert not [w for w in _audit_figure(_line_figure()) if "contrast" in w or "apart" in w]
+    plt.close("all")